@@ -904,6 +904,12 @@
                     this.toggleWatchlist(playerId);
                 }
 
+                // Rumor -> player link (IDs joined when player_data.js is generated)
+                const rumorLink = e.target.closest('.rumor-player-link');
+                if (rumorLink) {
+                    this.showPlayerDetail(parseInt(rumorLink.dataset.playerId));
+                }
+
                 // Share button
                 const shareBtn = e.target.closest('.share-btn');
                 if (shareBtn) {
@@ -1108,7 +1114,7 @@
                 let allPlayers = data.free?.undervalued || data.undervalued || [];
 
                 // Apply filters and search
-                allPlayers = this.filterAndSortPlayers(allPlayers);
+                allPlayers = this.filterAndSortPlayers(allPlayers, 'undervalued');
 
                 let html = '';
 
@@ -1158,7 +1164,7 @@
                 let allPlayers = data.free?.topPerformers || data.topPerformers || [];
 
                 // Apply filters and search
-                allPlayers = this.filterAndSortPlayers(allPlayers);
+                allPlayers = this.filterAndSortPlayers(allPlayers, 'topPerformers');
 
                 let html = '';
 
@@ -1203,7 +1209,7 @@
                 let allPlayers = data.free?.risingStars || data.risingStars || [];
 
                 // Apply filters and search
-                allPlayers = this.filterAndSortPlayers(allPlayers);
+                allPlayers = this.filterAndSortPlayers(allPlayers, 'risingStars');
 
                 let html = '';
 
@@ -1448,6 +1454,7 @@
                 }
 
                 let html = '';
+                const rumorPlayers = this.getData().rumorPlayers || {};
 
                 html += rumors.map(r => `
                     <div class="rumor-card">
@@ -1467,6 +1474,7 @@
                         <div class="rumor-source">
                             📰 ${Security.escapeHtml(r.source || '')} • ${Security.escapeHtml(this.formatRumorDate(r.date || ''))}
                         </div>
+                        ${rumorPlayers[r.id] ? `<button class="rumor-player-link" data-player-id="${Number(rumorPlayers[r.id][0])}">📊 View player stats</button>` : ''}
                     </div>
                 `).join('');
 
@@ -1683,15 +1691,7 @@
 
         showPlayerDetail(playerId) {
             // Find player in all lists
-            const data = this.getData();
-            const allPlayers = [
-                ...(data.undervalued || []),
-                ...(data.topPerformers || []),
-                ...(data.risingStars || []),
-                ...state.watchlist
-            ];
-
-            const player = allPlayers.find(p => p.id === playerId);
+            const player = this.findPlayer(playerId);
             if (!player) return;
 
             const modalBody = document.getElementById('player-modal-body');
@@ -2196,14 +2196,89 @@
             UI.showNotification('🔄 Filters reset');
         },
 
-        filterAndSortPlayers(players) {
-            let filtered = [...players];
+        // Accent-folded search tokens (mirrors search_tokens in data/search_index.py)
+        searchTokens(text) {
+            return String(text || '')
+                .normalize('NFD')
+                .replace(/[\u0300-\u036f]/g, '')
+                .toLowerCase()
+                .split(/[^a-z0-9]+/)
+                .filter(Boolean);
+        },
+
+        // Search semantics: every query token starts a word of the name or team.
+        matchesSearchTokens(player, tokens) {
+            const words = this.searchTokens(`${player.name || ''} ${player.team || ''}`);
+            return tokens.every(token => words.some(word => word.startsWith(token)));
+        },
+
+        // Narrow a query to candidate player IDs via the prebuilt prefix index.
+        // Tokens longer than maxPrefix look up their indexed prefix, so the result is
+        // a superset the caller checks with matchesSearchTokens. Returns null when the
+        // index cannot narrow the query (no index, e.g. live API data, or only tokens
+        // shorter than minPrefix).
+        lookupSearchIndex(tokens) {
+            const index = this.getData().searchIndex;
+            if (!index || !index.postings) return null;
+
+            const minPrefix = index.minPrefix || 1;
+            const maxPrefix = index.maxPrefix || Infinity;
+            let ids = null;
+            for (const token of tokens) {
+                if (token.length < minPrefix) continue;
+                const postings = index.postings[token.slice(0, maxPrefix)] || [];
+                ids = ids === null
+                    ? new Set(postings)
+                    : new Set(postings.filter(id => ids.has(id)));
+                if (ids.size === 0) break;
+            }
+            return ids;
+        },
+
+        // Label the league/position options with the category's precomputed facet
+        // counts (player_data.js facets); plain labels where there are none.
+        updateFilterCounts(category) {
+            const facets = category ? this.getData().facets?.[category] : null;
+            const selects = [['filter-league', 'league'], ['filter-position', 'position']];
+            for (const [id, field] of selects) {
+                const select = document.getElementById(id);
+                if (!select) continue;
+                for (const option of select.options) {
+                    if (!option.value) continue;
+                    option.dataset.label ??= option.textContent;
+                    option.textContent = facets
+                        ? `${option.dataset.label} (${facets[field]?.[option.value] || 0})`
+                        : option.dataset.label;
+                }
+            }
+
+            const summary = document.getElementById('filter-summary');
+            if (!summary) return;
+            const statuses = facets?.contract_status;
+            summary.hidden = !statuses;
+            if (statuses) {
+                const total = Object.values(statuses).reduce((sum, n) => sum + n, 0);
+                summary.textContent = `${total} players in this list · ${statuses.expiring || 0} expiring contracts`;
+            }
+        },
+
+        filterAndSortPlayers(players, category = null) {
+            this.updateFilterCounts(category);
+
+            // Use the generator's precomputed permutation when this is an untouched category list
+            const data = this.getData();
+            const order = category && data.sortIndex?.[category]?.[state.filters.sortBy];
+            const presorted = Boolean(order && order.length === players.length);
+            let filtered = presorted ? order.map(i => players[i]) : [...players];
 
             // Search filter
             if (state.searchQuery) {
+                const tokens = this.searchTokens(state.searchQuery);
+                const candidates = tokens.length ? this.lookupSearchIndex(tokens) : new Set();
                 filtered = filtered.filter(p =>
-                    p.name?.toLowerCase().includes(state.searchQuery) ||
-                    p.team?.toLowerCase().includes(state.searchQuery) ||
+                    (tokens.length > 0 &&
+                        (!candidates || candidates.has(p.id)) &&
+                        this.matchesSearchTokens(p, tokens)) ||
                     p.league?.toLowerCase().includes(state.searchQuery) ||
                     p.position?.toLowerCase().includes(state.searchQuery)
                 );
@@ -2225,7 +2300,8 @@
             // Value filter
             filtered = filtered.filter(p => (p.market_value_eur_m || 0) <= state.filters.maxValue);
 
-            // Sort
+            // Sort (filters keep the precomputed order, so only sort when there is none)
+            if (presorted) return filtered;
             const sortBy = state.filters.sortBy;
             filtered.sort((a, b) => {
                 switch (sortBy) {
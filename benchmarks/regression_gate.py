@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - Performance Regression Gate
+Runs the standard cases on the committed offline fixtures (no network) and
+compares them with benchmarks/baseline.json. Exits 1 when a case is slower,
+uses more memory, or scales worse than the baseline allows, so an O(N) ->
+O(N^2) change in merge_data or generate_js fails before it ships.
+
+Cases, each at both fixture sizes:
+    fetch_replay   Per-league TM squad + FD scorer fetches, served from the fixture
+    merge          merge_data (match + score) of the replayed TM values and scorers
+    score          score_player over the scorer-heavy fixture
+    generate       generate_js of those scored players (no groups, no rumors)
+
+Checks per case (tolerances live in baseline.json):
+    time        best-of-N seconds, scaled by a CPU calibration loop so the
+                baseline carries across machines, with a relative tolerance
+                but never less than MIN_SLACK_S of headroom; a case over its
+                allowance is measured again before it counts
+    memory      tracemalloc peak growth (machine independent)
+    exponent    log(t_large / t_small) / log(n_large / n_small)
+
+Usage:
+    python3 benchmarks/regression_gate.py                    # Check (exit 1 on regression)
+    python3 benchmarks/regression_gate.py --update-baseline  # Accept current numbers
+    python3 benchmarks/regression_gate.py --record-fixtures  # Regenerate fixtures (seeded)
+"""
+
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import synthetic
+from synthetic import fetch_combined
+
+BENCH_DIR = Path(__file__).resolve().parent
+FIXTURE_DIR = BENCH_DIR / 'fixtures'
+BASELINE_PATH = BENCH_DIR / 'baseline.json'
+
+FIXTURE_SIZES = [1000, 8000]
+FIXTURE_SEED = 42
+
+DEFAULT_TOLERANCES = {
+    'time': 0.5,       # Up to 50% slower than the calibrated baseline
+    'memory': 0.25,    # Up to 25% more peak memory
+    'exponent': 0.3,   # Scaling exponent up to 0.3 above the baseline's
+}
+# Fast cases are looped until one measurement takes at least this long
+MIN_MEASURE_S = 0.05
+# Per-call timings under this are all noise: never fail on them alone
+MIN_TIME_S = 0.005
+# A case may always be this much slower than its baseline, however fast:
+# the relative tolerance of a few-ms case is smaller than the VM's jitter
+MIN_SLACK_S = 0.01
+
+# A slow case is measured again this many times before it counts as a regression
+CONFIRM_ATTEMPTS = 2
+
+# ============================================
+# FIXTURES
+# ============================================
+
+def fixture_path(n):
+    return FIXTURE_DIR / f"replay-{n}.json.gz"
+
+def record_fixtures():
+    """Write seeded replay fixtures: TM squads + FD scorers, and a scorer-heavy set for score/generate"""
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    for n in FIXTURE_SIZES:
+        world = synthetic.generate_world(n, FIXTURE_SEED)
+        stats_world = synthetic.generate_world(n, FIXTURE_SEED + 1, scorer_ratio=1.0)
+        fixture = {
+            'n': n,
+            'seed': FIXTURE_SEED,
+            'responses': world['responses'],
+            'stats_responses': {url: payload for url, payload in stats_world['responses'].items()
+                                if 'football-data.org' in url},
+        }
+        with gzip.open(fixture_path(n), 'wt', encoding='utf-8') as f:
+            json.dump(fixture, f, ensure_ascii=False, separators=(',', ':'))
+        print(f"   💾 {fixture_path(n).relative_to(BENCH_DIR)} ({fixture_path(n).stat().st_size // 1024} KB)")
+
+def load_fixture(n):
+    with gzip.open(fixture_path(n), 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+# ============================================
+# CASES
+# ============================================
+
+def replay_fetch(responses):
+    """Every TM league and FD competition through the real per-league fetchers"""
+    tm_values, fd_stats = {}, {}
+    with synthetic.replay(responses):
+        for tm_id, info in fetch_combined.TM_LEAGUES.items():
+            values, _ = fetch_combined.fetch_league_values(tm_id, info, limiter=None)
+            tm_values.update(values or {})
+        for code, name in fetch_combined.FD_LEAGUES.items():
+            fd_stats.update(fetch_combined.fetch_league_stats(code, name, 'fixture', limiter=None) or {})
+    return tm_values, fd_stats
+
+def prepare(fixture):
+    """Inputs every case needs, built outside the timers"""
+    tm_values, fd_stats = replay_fetch(fixture['responses'])
+    _, stats = replay_fetch(fixture['stats_responses'])
+    return {'responses': fixture['responses'], 'tm_values': tm_values, 'fd_stats': fd_stats, 'stats': stats}
+
+def setup_score(inputs):
+    players, _, _ = fetch_combined.match_player_values({}, inputs['stats'])
+    return [players]
+
+def run_score(players):
+    for player in players:
+        fetch_combined.score_player(player)
+
+def setup_generate(inputs, output_dir):
+    players, = setup_score(inputs)
+    run_score(players)
+    # No groups, no rumors: generate_js would otherwise load the live rumors.json
+    return [players, os.path.join(output_dir, 'player_data.js'), None, []]
+
+CASES = {
+    'fetch_replay': {'setup': lambda inputs, tmp: [inputs['responses']], 'run': replay_fetch},
+    'merge': {'setup': lambda inputs, tmp: [inputs['tm_values'], inputs['fd_stats']], 'run': fetch_combined.merge_data},
+    'score': {'setup': lambda inputs, tmp: setup_score(inputs), 'run': run_score},
+    'generate': {'setup': setup_generate, 'run': fetch_combined.generate_js},
+}
+
+def measure(case, inputs, tmp, repeat):
+    """Best-of-repeat seconds per call and tracemalloc peak growth of one case"""
+    best, loops = math.inf, 1
+    for _ in range(repeat):
+        args = case['setup'](inputs, tmp)
+        with contextlib.redirect_stdout(io.StringIO()):
+            while True:
+                started = time.perf_counter()
+                for _ in range(loops):
+                    case['run'](*args)
+                elapsed = time.perf_counter() - started
+                if elapsed >= MIN_MEASURE_S or loops >= 1000:
+                    break
+                loops *= 2
+            best = min(best, elapsed / loops)
+
+    # Memory in a separate run: tracemalloc would distort the timings
+    args = case['setup'](inputs, tmp)
+    tracemalloc.start()
+    start_bytes, _ = tracemalloc.get_traced_memory()
+    with contextlib.redirect_stdout(io.StringIO()):
+        case['run'](*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'time_s': round(best, 6), 'peak_bytes': peak - start_bytes}
+
+def calibrate(repeat=7):
+    """Seconds for a fixed pure-Python workload: the machine speed the timings are relative to"""
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        d = {str(i): i * 2 for i in range(300_000)}
+        ''.join(sorted(d, key=d.get)[:1000])
+        best = min(best, time.perf_counter() - started)
+    return round(best, 6)
+
+def exponent(sizes, small, large):
+    if small['time_s'] <= 0 or large['time_s'] <= 0:
+        return None
+    return round(math.log(large['time_s'] / small['time_s']) / math.log(sizes[1] / sizes[0]), 3)
+
+def _add_exponents(results):
+    for entry in results['cases'].values():
+        small, large = (entry['sizes'][str(n)] for n in FIXTURE_SIZES)
+        entry['exponent'] = exponent(FIXTURE_SIZES, small, large)
+
+def run_suite(repeat):
+    """Measure every case at every fixture size -> results document"""
+    results = {'calibration_s': calibrate(), 'sizes': FIXTURE_SIZES, 'cases': {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in FIXTURE_SIZES:
+            inputs = prepare(load_fixture(n))
+            for name, case in CASES.items():
+                entry = results['cases'].setdefault(name, {'sizes': {}})
+                entry['sizes'][str(n)] = measure(case, inputs, tmp, repeat)
+    # Calibrate again once warm: the best of both is the steadiest speed estimate
+    results['calibration_s'] = min(results['calibration_s'], calibrate())
+    _add_exponents(results)
+    return results
+
+def remeasure(results, slow, repeat):
+    """Time the (case, n) pairs in slow again, keeping each one's best time"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sorted({n for _, n in slow}, key=int):
+            inputs = prepare(load_fixture(int(n)))
+            for name in [name for name, size in slow if size == n]:
+                entry = results['cases'][name]['sizes'][n]
+                entry['time_s'] = min(entry['time_s'], measure(CASES[name], inputs, tmp, repeat)['time_s'])
+    _add_exponents(results)
+
+# ============================================
+# COMPARE
+# ============================================
+
+def allowed_time(ref, speed, tolerances):
+    expected = ref['time_s'] * speed
+    return expected + max(expected * tolerances['time'], MIN_SLACK_S)
+
+def slow_cases(current, baseline, tolerances):
+    """(case, n) pairs over their time allowance"""
+    speed = current['calibration_s'] / baseline['calibration_s']
+    return [(name, n) for name, entry in current['cases'].items() if name in baseline['cases']
+            for n, now in entry['sizes'].items() if n in baseline['cases'][name]['sizes']
+            and now['time_s'] > allowed_time(baseline['cases'][name]['sizes'][n], speed, tolerances)]
+
+def compare(current, baseline, tolerances):
+    """-> list of regression messages (empty = pass), printing a table as it goes"""
+    regressions = []
+    speed = current['calibration_s'] / baseline['calibration_s']
+    print(f"   Machine speed vs baseline: x{1 / speed:.2f} (timings scaled by {speed:.2f})\n")
+    print(f"   {'Case':<14} {'n':>6} {'time':>9} {'allowed':>9} {'peak MB':>8} {'allowed':>8}")
+
+    for name, entry in current['cases'].items():
+        base = baseline['cases'].get(name)
+        if not base:
+            print(f"   {name:<14} (not in baseline)")
+            continue
+        for n, now in entry['sizes'].items():
+            ref = base['sizes'].get(n)
+            if not ref:
+                continue
+            allowed_s = allowed_time(ref, speed, tolerances)
+            allowed_bytes = ref['peak_bytes'] * (1 + tolerances['memory'])
+            time_bad = now['time_s'] > allowed_s
+            mem_bad = now['peak_bytes'] > allowed_bytes
+            flag = ' ❌' if time_bad or mem_bad else ''
+            print(f"   {name:<14} {n:>6} {now['time_s']:8.3f}s {allowed_s:8.3f}s "
+                  f"{now['peak_bytes'] / 1e6:8.2f} {allowed_bytes / 1e6:8.2f}{flag}")
+            if time_bad:
+                regressions.append(f"{name} n={n}: {now['time_s']:.3f}s > {allowed_s:.3f}s allowed")
+            if mem_bad:
+                regressions.append(f"{name} n={n}: peak {now['peak_bytes'] / 1e6:.2f} MB > "
+                                   f"{allowed_bytes / 1e6:.2f} MB allowed")
+
+        if entry['exponent'] is not None and base.get('exponent') is not None:
+            allowed_exp = base['exponent'] + tolerances['exponent']
+            large = entry['sizes'][str(FIXTURE_SIZES[-1])]['time_s']
+            # A tiny case can't show its scaling through timer noise
+            if entry['exponent'] > allowed_exp and large > MIN_TIME_S:
+                regressions.append(f"{name}: scales as n^{entry['exponent']} (baseline n^{base['exponent']}, "
+                                   f"allowed n^{allowed_exp:.2f})")
+            print(f"   {name:<14} {'scale':>6}   n^{entry['exponent']:<5} (baseline n^{base['exponent']})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='ScoutLens performance regression gate')
+    parser.add_argument('--baseline', type=str, default=str(BASELINE_PATH))
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case (best is compared)')
+    parser.add_argument('--update-baseline', action='store_true', help='Write the current numbers as the baseline')
+    parser.add_argument('--record-fixtures', action='store_true', help='Regenerate the seeded replay fixtures')
+    parser.add_argument('--time-tolerance', type=float, help='Override the baseline time tolerance (fraction)')
+    parser.add_argument('--memory-tolerance', type=float, help='Override the baseline memory tolerance (fraction)')
+    parser.add_argument('--output', type=str, help='Also write the current results to this JSON file')
+    args = parser.parse_args()
+
+    print("🚦 ScoutLens - Performance Regression Gate")
+    print("=" * 50)
+
+    if args.record_fixtures:
+        record_fixtures()
+        return
+    missing = [str(fixture_path(n)) for n in FIXTURE_SIZES if not fixture_path(n).exists()]
+    if missing:
+        print(f"❌ Missing fixtures {missing} (run with --record-fixtures)")
+        sys.exit(2)
+
+    current = run_suite(args.repeat)
+    current['meta'] = {'date': datetime.now().isoformat(), 'python': platform.python_version(),
+                       'platform': platform.platform(), 'repeat': args.repeat}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        tolerances = DEFAULT_TOLERANCES
+        if baseline_path.exists():
+            with open(baseline_path, 'r', encoding='utf-8') as f:
+                tolerances = json.load(f).get('tolerances', DEFAULT_TOLERANCES)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump({**current, 'tolerances': tolerances}, f, indent=2)
+            f.write('\n')
+        print(f"✅ Baseline written to {baseline_path}")
+        return
+
+    if not baseline_path.exists():
+        print(f"❌ No baseline at {baseline_path} (run with --update-baseline)")
+        sys.exit(2)
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    tolerances = {**DEFAULT_TOLERANCES, **baseline.get('tolerances', {})}
+    if args.time_tolerance is not None:
+        tolerances['time'] = args.time_tolerance
+    if args.memory_tolerance is not None:
+        tolerances['memory'] = args.memory_tolerance
+
+    # Timer noise on a busy machine looks like a slow case: confirm before failing
+    for _ in range(CONFIRM_ATTEMPTS):
+        slow = slow_cases(current, baseline, tolerances)
+        if not slow:
+            break
+        print(f"   🔁 Re-measuring {len(slow)} slow case(s): {', '.join(f'{name} n={n}' for name, n in slow)}")
+        remeasure(current, slow, args.repeat)
+
+    regressions = compare(current, baseline, tolerances)
+    if regressions:
+        print(f"\n❌ {len(regressions)} performance regressions:")
+        for message in regressions:
+            print(f"   - {message}")
+        sys.exit(1)
+    print("\n✅ No performance regressions")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - Hot Path Benchmarks
+Times the processing functions on seeded synthetic data (synthetic.py) at
+increasing sizes and writes the timings to a JSON results file, so an
+optimization is measured instead of guessed.
+
+Cases (n = players):
+    normalize_name     n TM names
+    names_match        n name pairs
+    parse              TM squads + FD scorers replayed through the real parsers
+    merge_data         n TM players x n/100 scorers (quadratic match loop)
+    score_player       n matched players
+    generate_js        n scored players -> player_data.js in a temp dir
+    undervaluation     UndervaluationModel fair value + metrics on n Understat rows   (needs aiohttp)
+    process_players    scraper.process_players on n Understat rows                    (needs aiohttp)
+
+A size whose estimated time (from the previous size and the case's expected
+growth) exceeds --budget is recorded as skipped instead of run.
+
+Usage:
+    python3 benchmarks/run_benchmarks.py                            # 10k and 100k players
+    python3 benchmarks/run_benchmarks.py --sizes 10000,100000,1000000 --budget 600
+    python3 benchmarks/run_benchmarks.py --only merge_data,generate_js --repeat 5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import synthetic
+from synthetic import fetch_combined
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_RESULTS_DIR = BENCH_DIR / 'results'
+DEFAULT_SIZES = [10_000, 100_000]
+
+try:
+    with contextlib.redirect_stdout(io.StringIO()):
+        import scraper
+except ImportError:
+    scraper = None  # aiohttp not installed: Understat cases are skipped
+
+# ============================================
+# CASES
+# ============================================
+# setup(data, n) -> args, run outside the timer on every repeat; run(*args) is timed.
+# data caches generated inputs per size so cases share them.
+
+def _world(data, n):
+    if ('world', n) not in data:
+        data[('world', n)] = synthetic.generate_world(n, data['seed'])
+    return data[('world', n)]
+
+def _parsed(data, n):
+    if ('parsed', n) not in data:
+        world = _world(data, n)
+        with synthetic.replay(world['responses']):
+            data[('parsed', n)] = (synthetic.world_tm_values(world), synthetic.world_fd_stats(world))
+    return data[('parsed', n)]
+
+def _players(data, n):
+    if ('players', n) not in data:
+        data[('players', n)] = synthetic.synthetic_players(n, data['seed'])
+    return data[('players', n)]
+
+def _understat(data, n):
+    if ('understat', n) not in data:
+        data[('understat', n)] = synthetic.generate_understat(n, data['seed'])
+    return data[('understat', n)]
+
+def _tm_names(data, n):
+    world = _world(data, n)
+    return [p['name'] for url, payload in world['responses'].items() if url.endswith('/players')
+            for p in payload['players']]
+
+def run_normalize(names):
+    for name in names:
+        fetch_combined.normalize_name(name)
+
+def setup_names_match(data, n):
+    names = _tm_names(data, n)
+    # Alternately against the next name (mostly a miss) and its own de-accented spelling (a hit)
+    return [[(name, names[(i + 1) % len(names)] if i % 2 else synthetic.strip_accents(name))
+             for i, name in enumerate(names)]]
+
+def run_names_match(pairs):
+    for a, b in pairs:
+        fetch_combined.names_match(a, b)
+
+def run_parse(world):
+    with synthetic.replay(world['responses']):
+        synthetic.world_tm_values(world)
+        synthetic.world_fd_stats(world)
+
+def setup_score(data, n):
+    players, _, _ = fetch_combined.match_player_values({}, {p['name'].lower(): p for p in _players(data, n)})
+    return [players]
+
+def run_score(players):
+    for player in players:
+        fetch_combined.score_player(player)
+
+def run_generate_js(players, output_dir):
+    fetch_combined.generate_js(players, os.path.join(output_dir, 'player_data.js'))
+
+def run_undervaluation(raw_data):
+    model = scraper.UndervaluationModel()
+    for players in raw_data.values():
+        for player in players:
+            model.calculate_fair_value(player)
+            model.calculate_metrics(player)
+
+CASES = {
+    'normalize_name': {'setup': lambda data, n: [_tm_names(data, n)], 'run': run_normalize, 'growth': 1},
+    'names_match': {'setup': setup_names_match, 'run': run_names_match, 'growth': 1},
+    'parse': {'setup': lambda data, n: [_world(data, n)], 'run': run_parse, 'growth': 1},
+    'merge_data': {'setup': lambda data, n: list(_parsed(data, n)), 'run': fetch_combined.merge_data, 'growth': 2},
+    'score_player': {'setup': setup_score, 'run': run_score, 'growth': 1},
+    'generate_js': {'setup': lambda data, n: [_players(data, n), data['tmp']], 'run': run_generate_js,
+                    'growth': 1},
+    'undervaluation': {'setup': lambda data, n: [_understat(data, n)], 'run': run_undervaluation, 'growth': 1,
+                       'needs_scraper': True},
+    'process_players': {'setup': lambda data, n: [_understat(data, n)],
+                        'run': lambda raw_data: scraper.process_players(raw_data), 'growth': 1,
+                        'needs_scraper': True},
+}
+
+# ============================================
+# RUNNER
+# ============================================
+
+def time_case(case, data, n, repeat):
+    """Best and median of `repeat` timed runs -> result dict"""
+    timings = []
+    for _ in range(repeat):
+        args = case['setup'](data, n)
+        with contextlib.redirect_stdout(io.StringIO()):  # Cases print progress lines
+            started = time.perf_counter()
+            case['run'](*args)
+            timings.append(time.perf_counter() - started)
+    return {
+        'status': 'ok',
+        'repeat': repeat,
+        'min_s': round(min(timings), 6),
+        'median_s': round(statistics.median(timings), 6),
+        'per_item_us': round(min(timings) / n * 1e6, 3),
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def run_benchmarks(names, sizes, repeat=3, seed=42, budget=60.0):
+    """Run the named cases at each size -> results document"""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        data = {'seed': seed, 'tmp': tmp}
+        for name in names:
+            case = CASES[name]
+            if case.get('needs_scraper') and scraper is None:
+                print(f"   ⏭️  {name:<16} skipped (scraper needs aiohttp)")
+                results.append({'case': name, 'n': None, 'status': 'skipped', 'reason': 'aiohttp not installed'})
+                continue
+
+            previous = None
+            for n in sizes:
+                if previous:
+                    estimate = previous['min_s'] * (n / previous['n']) ** case['growth'] * repeat
+                    if estimate > budget:
+                        print(f"   ⏭️  {name:<16} n={n:>9,} skipped (~{estimate:.0f}s > budget)")
+                        results.append({'case': name, 'n': n, 'status': 'skipped',
+                                        'reason': f"estimated {estimate:.0f}s over {budget:.0f}s budget"})
+                        continue
+                result = {'case': name, 'n': n, **time_case(case, data, n, repeat)}
+                results.append(result)
+                previous = result
+                print(f"   ⏱️  {name:<16} n={n:>9,} {result['min_s']:9.3f}s  {result['per_item_us']:9.2f} µs/item")
+
+    return {
+        'meta': {
+            'date': datetime.now().isoformat(),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+            'sizes': sizes,
+        },
+        'results': results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='ScoutLens hot path benchmarks')
+    parser.add_argument('--sizes', type=str, default=','.join(str(n) for n in DEFAULT_SIZES),
+                        help='Comma-separated player counts')
+    parser.add_argument('--only', type=str, help=f"Comma-separated cases (default all: {', '.join(CASES)})")
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case and size (best is reported)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--budget', type=float, default=60.0, help='Skip sizes estimated to take longer (seconds)')
+    parser.add_argument('--output', type=str, help='Results JSON (default: benchmarks/results/bench-<time>.json)')
+    args = parser.parse_args()
+
+    names = [s.strip() for s in args.only.split(',')] if args.only else list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        print(f"❌ Unknown cases: {unknown} (choose from {list(CASES)})")
+        sys.exit(1)
+    sizes = [int(s) for s in args.sizes.split(',')]
+
+    print("⏱️  ScoutLens - Benchmarks")
+    print("=" * 50)
+    document = run_benchmarks(names, sizes, args.repeat, args.seed, args.budget)
+
+    output = Path(args.output) if args.output else \
+        DEFAULT_RESULTS_DIR / f"bench-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+    print(f"\n✅ Results written to {output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - CLI Startup Check
+Times the light `scoutlens` commands in fresh interpreters and fails if any
+of them takes more than --target ms over a bare `python3 -c pass`, or
+imports a module that only the fetchers need (see HEAVY_MODULES).
+
+Subcommands import their modules lazily (data/scoutlens.py). This check
+keeps a stray top-level import from quietly undoing that.
+
+Usage:
+    python3 benchmarks/startup_time.py
+    python3 benchmarks/startup_time.py --runs 20 --target 40
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SCOUTLENS = Path(__file__).resolve().parent.parent / 'data' / 'scoutlens.py'
+
+# Label -> scoutlens arguments
+LIGHT_COMMANDS = {
+    'help': ['--help'],
+    'rumors list': ['rumors', 'list'],
+    'query --help': ['query', '--help'],
+    'generate --help': ['generate', '--help'],
+}
+
+# Budget over the bare interpreter, in ms
+STARTUP_TARGET_MS = 75
+
+# Modules a light command must not import
+HEAVY_MODULES = [
+    'fetch_combined', 'snapshot_store', 'scheduler', 'urllib.request', 'concurrent.futures',
+    'cProfile', 'aiohttp', 'requests', 'bs4', 'pandas', 'numpy',
+]
+
+def _env():
+    # Measure what users get: cached bytecode for the repo modules
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    return env
+
+def time_command(argv, runs):
+    """Median wall time of `python3 argv` over runs fresh processes (ms), after one warm-up"""
+    timings = []
+    for i in range(runs + 1):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, *argv], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       env=_env(), check=False)
+        if i:
+            timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def imported_modules(argv):
+    """Names of the modules a command imports (from -X importtime)"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', *argv], stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True, env=_env(), check=False)
+    return {line.rsplit('|', 1)[-1].strip() for line in result.stderr.splitlines()
+            if line.startswith('import time:') and '|' in line}
+
+def main():
+    parser = argparse.ArgumentParser(description='Check startup time of the light scoutlens commands')
+    parser.add_argument('--runs', type=int, default=10, help='Timed runs per command (median is used)')
+    parser.add_argument('--target', type=float, default=STARTUP_TARGET_MS,
+                        help='Allowed ms over a bare interpreter start')
+    args = parser.parse_args()
+
+    print("🚀 ScoutLens - CLI Startup")
+    print("=" * 50)
+    baseline = time_command(['-c', 'pass'], args.runs)
+    print(f"   python3 -c pass          {baseline:7.1f} ms")
+
+    failures = []
+    for label, command in LIGHT_COMMANDS.items():
+        argv = [str(SCOUTLENS), *command]
+        overhead = time_command(argv, args.runs) - baseline
+        heavy = sorted(m for m in imported_modules(argv) if m in HEAVY_MODULES)
+        ok = overhead <= args.target and not heavy
+        print(f"   {label:<24} {overhead:+7.1f} ms {'✅' if ok else '❌'}"
+              + (f"  imports {', '.join(heavy)}" if heavy else ''))
+        if overhead > args.target:
+            failures.append(f"{label}: {overhead:.1f} ms over interpreter start > {args.target:.0f} ms")
+        if heavy:
+            failures.append(f"{label}: imports {', '.join(heavy)}")
+
+    if failures:
+        print(f"\n❌ {len(failures)} startup problem(s):")
+        for failure in failures:
+            print(f"   - {failure}")
+        sys.exit(1)
+    print(f"\n✅ Light commands start within {args.target:.0f} ms of the interpreter")
+
+if __name__ == '__main__':
+    main()
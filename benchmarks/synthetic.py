@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - Synthetic Benchmark Data
+Seeded generator of realistic API payloads: Transfermarkt club lists and
+squads, Football-Data.org scorers and Understat league tables. Names mix
+accents, transliterations and a small pool of very common surnames, so the
+fuzzy matcher sees the duplicates and near-misses it sees in production.
+
+Payloads are keyed by request URL and served to the real parsers through
+replay(), so benchmarks exercise the same code as a live fetch.
+
+Usage:
+    from synthetic import generate_world, replay, world_tm_values
+    world = generate_world(100_000, seed=42)
+    with replay(world['responses']):
+        tm_values = world_tm_values(world)
+"""
+
+import random
+import sys
+import unicodedata
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'data'))
+
+import fetch_combined  # noqa: E402
+
+FIRST_NAMES = [
+    'José', 'João', 'Luis', 'Luís', 'Mohamed', 'Kylian', 'Erling', 'Martin', 'Łukasz', 'Jakub',
+    'Thomas', 'Thomás', 'Pedro', 'Rodrigo', 'Ángel', 'Nicolás', 'Bruno', 'Rúben', 'Sébastien', 'Jérôme',
+    'Mateo', 'Matteo', 'Lucas', 'Lukas', 'Luka', 'Hakan', 'Çağlar', 'İlkay', 'Søren', 'Björn',
+    'Jan', 'Ján', 'Dušan', 'Nemanja', 'Aleksandar', 'Wojciech', 'Piotr', 'Giovanni', 'Federico', 'Kai',
+    'Kim', 'Min-jae', 'Takefusa', 'Achraf', 'Youssef', 'Victor', 'Víctor', 'André', 'Andrej', 'Ousmane',
+]
+
+# The first few are deliberately over-weighted: duplicate surnames are what
+# makes last-name + initial matching ambiguous
+COMMON_SURNAMES = ['Silva', 'Santos', 'Müller', 'García', 'Rodríguez', 'Fernandes', 'Pérez', 'Kim']
+SURNAMES = COMMON_SURNAMES + [
+    'Gündoğan', 'Çalhanoğlu', 'Ødegaard', 'Højbjerg', 'Szczęsny', 'Lewandowski', 'Vlahović', 'Milinković-Savić',
+    'Núñez', 'Martínez', 'González', 'Álvarez', 'Hernández', 'Gómez', 'Sánchez', 'Díaz',
+    'Mbappé', 'Dembélé', 'Kanté', 'Koné', 'Traoré', 'Diallo', 'Hakimi', 'En-Nesyri',
+    'Haaland', 'Sørloth', 'Kristiansen', 'Schröder', 'Götze', 'Süle', 'Kübler', 'Weiß',
+    'Van Dijk', 'De Jong', 'De Bruyne', 'Van de Beek', 'Dos Santos', 'Da Silva', 'Di María', 'Le Normand',
+    'Škriniar', 'Hložek', 'Kovačić', 'Modrić', 'Perišić', 'Jović', 'Tadić', 'Lukić',
+]
+# Made-up surnames keep a 1M-player world from collapsing onto a few thousand names
+SYLLABLES = ['ka', 'lo', 'mi', 'ro', 'van', 'de', 'sch', 'ić', 'ović', 'ez', 'ão', 'ski', 'sen', 'ne',
+             'ba', 'tu', 'ğu', 'ø', 'ber', 'an', 'el', 'ma', 'ri', 'to', 'zé', 'li', 'go', 'ny']
+SUFFIXES = ['', '', '', '', '', '', '', '', ' Jr.', ' II']
+
+POSITIONS = ['Goalkeeper', 'Centre-Back', 'Left-Back', 'Right-Back', 'Defensive Midfield',
+             'Central Midfield', 'Attacking Midfield', 'Left Winger', 'Right Winger', 'Centre-Forward']
+FD_POSITIONS = {'G': 'Goalkeeper', 'C': 'Defence', 'L': 'Defence', 'R': 'Defence', 'D': 'Midfield',
+                'A': 'Offence'}
+
+NATIONALITIES = ['Brazil', 'Spain', 'France', 'Germany', 'Portugal', 'Argentina', 'England', 'Serbia',
+                 'Croatia', 'Turkey', 'Norway', 'Denmark', 'Poland', 'Korea, South', 'Morocco', 'Netherlands']
+
+CLUB_WORDS = ['Atlético', 'Real', 'Sporting', 'Dynamo', 'Olympique', 'Racing', 'União', 'Union',
+              'Rapid', 'Fenerbahçe', 'Spartak', 'Borussia', 'Inter', 'Athletic', 'Deportivo', 'Slavia']
+CLUB_TOWNS = ['Nord', 'Süd', 'Porto', 'Lisboa', 'Madrid', 'Sevilla', 'Köln', 'Zürich', 'Kraków',
+              'Beograd', 'İstanbul', 'Malmö', 'Århus', 'Plzeň', 'Split', 'Rosário']
+
+# scraper.TIER1_LEAGUES (scraper itself needs aiohttp, so not imported here)
+UNDERSTAT_LEAGUES = [('EPL', 'Premier League', 2.0), ('La_Liga', 'La Liga', 1.4), ('Bundesliga', 'Bundesliga', 1.3),
+                     ('Serie_A', 'Serie A', 1.2), ('Ligue_1', 'Ligue 1', 1.1)]
+
+SQUAD_SIZE = 25
+FD_TEAM_SUFFIX = ' FC'
+
+def strip_accents(text):
+    return ''.join(c for c in unicodedata.normalize('NFD', text) if unicodedata.category(c) != 'Mn')
+
+def _market_value(rng):
+    # Log-uniform €50k - €180m, formatted like the TM API ("€12.50m", "€800k")
+    value = 10 ** rng.uniform(-1.3, 2.25)
+    return f"€{value:.2f}m" if value >= 1 else f"€{round(value * 1000)}k"
+
+def _made_up_surname(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+def _player_name(rng):
+    roll = rng.random()
+    if roll < 0.25:
+        surname = rng.choice(COMMON_SURNAMES)
+    elif roll < 0.5:
+        surname = rng.choice(SURNAMES)
+    else:
+        surname = _made_up_surname(rng)
+    if rng.random() < 0.3:
+        surname += ' ' + (rng.choice(SURNAMES) if rng.random() < 0.5 else _made_up_surname(rng))
+    return f"{rng.choice(FIRST_NAMES)} {surname}{rng.choice(SUFFIXES)}"
+
+def _scorer_name(rng, tm_name):
+    """How Football-Data.org might spell a TM player: same, unaccented, or first name dropped"""
+    roll = rng.random()
+    if roll < 0.6:
+        return tm_name
+    if roll < 0.85:
+        return strip_accents(tm_name)
+    return tm_name.split(' ', 1)[-1]
+
+def generate_world(n_players, seed=42, scorer_ratio=0.01):
+    """Payloads for ~n_players TM players spread over TM_LEAGUES
+
+    scorer_ratio: Football-Data.org scorers as a share of TM players (80% of
+                  them are TM players, spelled their way; 20% are unknown)
+    Returns {'responses': {url: payload}, 'leagues': [(tm_id, info, clubs)],
+             'fd_leagues': {code: name}}
+    """
+    rng = random.Random(seed)
+    responses = {}
+    leagues = []
+    all_players = []  # (name, club name, league info)
+
+    n_clubs = max(1, n_players // SQUAD_SIZE)
+    league_items = list(fetch_combined.TM_LEAGUES.items())
+    clubs_by_league = {tm_id: [] for tm_id, _ in league_items}
+    for club_id in range(1, n_clubs + 1):
+        tm_id, info = league_items[(club_id - 1) % len(league_items)]
+        club = {'id': str(club_id), 'name': f"{rng.choice(CLUB_WORDS)} {rng.choice(CLUB_TOWNS)} {club_id}"}
+        clubs_by_league[tm_id].append(club)
+
+        players = []
+        for _ in range(SQUAD_SIZE):
+            name = _player_name(rng)
+            players.append({
+                'name': name,
+                'marketValue': _market_value(rng),
+                'age': rng.randint(17, 36),
+                'position': rng.choice(POSITIONS),
+                'nationality': rng.choice(NATIONALITIES),
+            })
+            all_players.append((name, club['name'], info))
+        responses[f"{fetch_combined.TM_API_BASE}/clubs/{club['id']}/players"] = {'players': players}
+
+    for tm_id, info in league_items:
+        clubs = clubs_by_league[tm_id]
+        responses[f"{fetch_combined.TM_API_BASE}/competitions/{tm_id}/clubs"] = {'clubs': clubs}
+        leagues.append((tm_id, info, clubs))
+
+    # Scorers: mostly TM players in FD spelling, some nobody on TM has
+    fd_leagues = dict(fetch_combined.FD_LEAGUES)
+    scorers = {code: [] for code in fd_leagues}
+    fd_pool = [p for p in all_players if p[2].get('fd_code') in fd_leagues] or all_players
+    for _ in range(max(1, int(n_players * scorer_ratio))):
+        if rng.random() < 0.8:
+            tm_name, club_name, info = rng.choice(fd_pool)
+            name, code = _scorer_name(rng, tm_name), info.get('fd_code') or rng.choice(list(fd_leagues))
+            team = club_name + FD_TEAM_SUFFIX
+        else:
+            name, code = _player_name(rng), rng.choice(list(fd_leagues))
+            team = f"{rng.choice(CLUB_WORDS)} {rng.choice(CLUB_TOWNS)}"
+        played = rng.randint(3, 38)
+        goals = rng.randint(0, played)
+        position = rng.choice(POSITIONS)
+        scorers[code].append({
+            'player': {'name': name, 'nationality': rng.choice(NATIONALITIES),
+                       'position': FD_POSITIONS.get(position[0], 'Offence'),
+                       'dateOfBirth': f"{rng.randint(1988, 2007)}-{rng.randint(1, 12):02}-{rng.randint(1, 28):02}"},
+            'team': {'name': team},
+            'goals': goals,
+            'assists': rng.randint(0, played // 2),
+            'penalties': rng.randint(0, goals // 4),
+            'playedMatches': played,
+        })
+    for code, rows in scorers.items():
+        responses[f"https://api.football-data.org/v4/competitions/{code}/scorers?limit=30"] = {'scorers': rows}
+
+    return {'responses': responses, 'leagues': leagues, 'fd_leagues': fd_leagues}
+
+def generate_understat(n_players, seed=42):
+    """{league_key: [raw playersData rows]} for n_players over the five Understat leagues"""
+    rng = random.Random(seed)
+    understat = {key: [] for key, _, _ in UNDERSTAT_LEAGUES}
+    for i in range(n_players):
+        key, league_name, multiplier = UNDERSTAT_LEAGUES[i % len(UNDERSTAT_LEAGUES)]
+        minutes = rng.randint(0, 3420)
+        xg, xa = rng.uniform(0, minutes / 90 * 0.8), rng.uniform(0, minutes / 90 * 0.4)
+        understat[key].append({
+            'id': str(i + 1),
+            'player_name': _player_name(rng),
+            'games': str(rng.randint(1, 38)),
+            'time': str(minutes),
+            'goals': str(round(xg + rng.uniform(-2, 2)) if xg > 2 else 0),
+            'xG': f"{xg:.6f}",
+            'assists': str(round(xa)),
+            'xA': f"{xa:.6f}",
+            'position': rng.choice(['F S', 'M S', 'D S', 'GK', 'F M S', 'D M S']),
+            'team_title': f"{rng.choice(CLUB_WORDS)} {rng.choice(CLUB_TOWNS)}",
+            '_league_key': key,
+            '_league_name': league_name,
+            '_league_multiplier': multiplier,
+            '_source': 'understat',
+        })
+    return understat
+
+@contextmanager
+def replay(responses):
+    """Serve fetch_combined.fetch_json from recorded payloads (missing URL -> None, like a failed request)"""
+    original = fetch_combined.fetch_json
+
+    def fetch_json(url, headers=None, limiter=None, quota=None, key=None):
+        return responses.get(url)
+
+    fetch_combined.fetch_json = fetch_json
+    try:
+        yield
+    finally:
+        fetch_combined.fetch_json = original
+
+def world_tm_values(world):
+    """TM name -> value info, parsed from the squads by the real club parser (call inside replay())"""
+    tm_values = {}
+    for tm_id, info, clubs in world['leagues']:
+        for club in clubs:
+            tm_values.update(fetch_combined.fetch_club_values(club['id'], club['name'], info, limiter=None) or {})
+    return tm_values
+
+def world_fd_stats(world):
+    """FD name -> stats, parsed from the scorers by the real scorer parser (call inside replay())"""
+    fd_stats = {}
+    for code, name in world['fd_leagues'].items():
+        fd_stats.update(fetch_combined.fetch_league_stats(code, name, 'synthetic', limiter=None) or {})
+    return fd_stats
+
+def synthetic_players(n, seed=42):
+    """n merged + scored players (no TM match step), the input generate_js sees"""
+    fd_stats = {}
+    while len(fd_stats) < n:
+        # Scorers sharing a name collapse to one stats row: top up from the next seed
+        world = generate_world(n - len(fd_stats), seed, scorer_ratio=1.0)
+        with replay(world['responses']):
+            fd_stats = {**world_fd_stats(world), **fd_stats}
+        seed += 1
+    fd_stats = dict(list(fd_stats.items())[:n])
+    players, _, _ = fetch_combined.match_player_values({}, fd_stats)
+    for player in players:
+        fetch_combined.score_player(player)
+    return players
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - Fetch Checkpoints
+Append-only JSONL journal of completed fetch units (a club squad, a league),
+so an interrupted multi-league fetch can be rerun with --resume and skip
+everything already done.
+
+Every line is flushed and fsynced before the fetch moves on, so Ctrl-C or a
+crash at any point loses at most the unit in flight. A torn last line from an
+interrupted write is dropped on load.
+
+Layout (data/.cache/journal/):
+    <name>.jsonl    {"unit": "GB1/281", "data": {...}} per completed unit
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_JOURNAL_DIR = Path(__file__).parent / '.cache' / 'journal'
+
+class Journal:
+    """Completed units of one fetch, persisted as they finish"""
+
+    def __init__(self, name, resume=False, journal_dir=DEFAULT_JOURNAL_DIR):
+        self.path = Path(journal_dir) / f"{name}.jsonl"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.units = {}
+        self._lock = threading.Lock()
+
+        if resume and self.path.exists():
+            self._load()
+            if self.units:
+                print(f"   ↩️  Resuming: {len(self.units)} units already done ({self.path.name})")
+        else:
+            self.path.write_text(json.dumps({'started': datetime.now().isoformat()}) + '\n', encoding='utf-8')
+
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _load(self):
+        good_bytes = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # Torn write from an interrupted run: drop it and everything after
+                if not line.endswith(b'\n'):
+                    break
+                good_bytes += len(line)
+                if 'unit' in entry:
+                    self.units[entry['unit']] = entry.get('data')
+        # Cut the torn tail so new lines start cleanly
+        with open(self.path, 'r+b') as f:
+            f.truncate(good_bytes)
+
+    def done(self, unit):
+        return unit in self.units
+
+    def get(self, unit, default=None):
+        return self.units.get(unit, default)
+
+    def record(self, unit, data=None):
+        """Mark a unit complete; durable once this returns (no-op once the journal is finished)"""
+        with self._lock:
+            self.units[unit] = data
+            if self._file.closed:
+                return  # A background retry outlived the fetch
+            self._file.write(json.dumps({'unit': unit, 'data': data}, ensure_ascii=False) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def finish(self):
+        """Whole fetch completed: the next run starts fresh"""
+        with self._lock:
+            self._file.close()
+            self.path.unlink(missing_ok=True)
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
@@ -16,10 +16,17 @@ Or set environment variable:
 import os
 import json
 import argparse
+import urllib.error
 import urllib.request
 from datetime import datetime
 from pathlib import Path
 
+from metrics import METRICS
+from memtrace import add_memtrace_args, memtracing
+from profiling import add_profile_args, profiling
+from quota import QuotaPlanner, print_plan
+from search_index import build_search_index, unique_players
+
 # League IDs for API-Football
 LEAGUES = {
     'Premier League': {'id': 39, 'country': 'England', 'multiplier': 2.0},
@@ -42,8 +49,13 @@ def get_age_multiplier(age: int) -> float:
     if age <= 32: return 0.6
     return 0.4
 
-def fetch_players(api_key: str, league_id: int, season: int = 2023) -> list:
-    """Fetch top scorers from API-Football"""
+def plan_units() -> list:
+    """Quota plan units: one request per league, most valuable league first"""
+    ranked = sorted(LEAGUES.items(), key=lambda item: -item[1]['multiplier'])
+    return [{'key': name, 'name': name, 'priority': i + 1, 'cost': 1} for i, (name, _) in enumerate(ranked)]
+
+def fetch_players(api_key: str, league_id: int, season: int = 2023, quota: QuotaPlanner = None) -> list:
+    """Fetch top scorers from API-Football (quota: updated from the rate-limit headers)"""
     url = f"https://v3.football.api-sports.io/players/topscorers?league={league_id}&season={season}"
     
     req = urllib.request.Request(url, headers={
@@ -52,6 +64,8 @@ def fetch_players(api_key: str, league_id: int, season: int = 2023) -> list:
     
     try:
         with urllib.request.urlopen(req, timeout=30) as response:
+            if quota:
+                quota.observe(response.headers)
             data = json.loads(response.read().decode())
             
             # Check for API errors
@@ -62,6 +76,12 @@ def fetch_players(api_key: str, league_id: int, season: int = 2023) -> list:
                 return []
             
             return data.get('response', [])
+    except urllib.error.HTTPError as e:
+        # 429s still carry the quota headers
+        if quota:
+            quota.observe(e.headers)
+        print(f"  ⚠️ HTTP {e.code}: {e.reason}")
+        return []
     except Exception as e:
         print(f"  ⚠️ Error: {e}")
         return []
@@ -135,6 +155,8 @@ def generate_js(all_players: list, output_path: str):
     rising = sorted([p for p in all_players if p.get('age', 30) <= 23],
                     key=lambda x: x['xgi_per_90'], reverse=True)[:10]
     
+    search_index = build_search_index(unique_players(undervalued, top_performers, rising))
+    
     js_content = f"""// Auto-generated player data - {datetime.now().strftime('%Y-%m-%d %H:%M')}
 // Source: API-Football (api-football.com)
 // Run: python fetch_api_football.py --api-key YOUR_KEY
@@ -148,7 +170,9 @@ const PLAYER_DATA = {{
     
     topPerformers: {json.dumps(top_performers, indent=8)},
     
-    risingStars: {json.dumps(rising, indent=8)}
+    risingStars: {json.dumps(rising, indent=8)},
+    
+    searchIndex: {json.dumps(search_index, separators=(',', ':'))}
 }};
 
 if (typeof module !== 'undefined') {{
@@ -168,8 +192,16 @@ def main():
     parser = argparse.ArgumentParser(description='Fetch player data from API-Football')
     parser.add_argument('--api-key', type=str, help='API-Football API key')
     parser.add_argument('--season', type=int, default=2023, help='Season year (free tier: 2021-2023)')
+    parser.add_argument('--dry-run', action='store_true', help='Print the quota plan and exit')
+    add_profile_args(parser)
+    add_memtrace_args(parser)
     args = parser.parse_args()
     
+    quota = QuotaPlanner('api-football')
+    if args.dry_run:
+        print_plan(quota, plan_units())
+        return
+    
     api_key = args.api_key or os.environ.get('FOOTBALL_API_KEY')
     
     if not api_key:
@@ -184,17 +216,31 @@ def main():
         print("  export FOOTBALL_API_KEY=your_key_here")
         return
     
+    with profiling(args, 'api-football'), memtracing(args, 'api-football'):
+        run(api_key, args.season, quota)
+
+def run(api_key, season, quota):
     print("🔭 ScoutLens - API-Football Data Fetcher")
     print("=" * 50)
     
     all_players = []
+    planned, skipped, _ = quota.plan(plan_units())
+    for unit in skipped:
+        print(f"⏭️  Skipping {unit['name']} (daily quota)")
     
-    for league_name, league_info in LEAGUES.items():
+    for unit in planned:
+        league_name = unit['key']
+        league_info = LEAGUES[league_name]
+        if not quota.acquire():
+            print(f"⏭️  Skipping {league_name} (daily quota used)")
+            continue
         print(f"📡 Fetching {league_name}...")
-        players = fetch_players(api_key, league_info['id'], args.season)
+        players = METRICS.call('fetch:api-football', fetch_players, api_key, league_info['id'], season, quota)
         
         if players:
-            processed = [process_player(p, league_info) for p in players]
+            with METRICS.stage('process') as rec:
+                processed = [process_player(p, league_info) for p in players]
+                rec['items'] = len(processed)
             all_players.extend(processed)
             print(f"   ✓ {len(processed)} players")
         else:
@@ -202,7 +248,8 @@ def main():
     
     if all_players:
         output_path = Path(__file__).parent / 'player_data.js'
-        generate_js(all_players, str(output_path))
+        with METRICS.stage('export', items=len(all_players)):
+            generate_js(all_players, str(output_path))
     else:
         print("❌ No player data fetched")
 
@@ -5,28 +5,31 @@ Combined data fetcher:
 - Season stats from Football-Data.org (goals, assists, etc.)
 """
 
-import urllib.request
 import json
 import time
 from datetime import datetime
 import os
 import sys
 import argparse
-import unicodedata
-import re
-
-def normalize_name(name):
-    """Normalize name for matching (remove accents, lowercase)"""
-    if not name:
-        return ""
-    # Remove accents
-    normalized = unicodedata.normalize('NFD', name)
-    normalized = ''.join(c for c in normalized if unicodedata.category(c) != 'Mn')
-    # Lowercase and remove extra spaces
-    normalized = normalized.lower().strip()
-    # Remove common prefixes/suffixes
-    normalized = re.sub(r'\s+(jr|sr|ii|iii)\.?$', '', normalized)
-    return normalized
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from checkpoint import Journal
+from json_stream import ACCEPT_ENCODING, iter_json_items, read_body
+from league_cache import Revalidator, age_hours, load_league, save_league
+from metrics import METRICS, host_of
+from memtrace import add_memtrace_args, memtracing
+from profiling import add_profile_args, profiling
+from quota import QuotaPlanner, print_plan
+from search_index import build_search_index, normalize_name, unique_players
+from single_flight import HTTP_FLIGHTS
+
+def stable_player_id(player):
+    """Stable cross-run player ID (normalized name + nationality)"""
+    key = f"{normalize_name(player.get('name'))}|{normalize_name(player.get('nationality'))}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
 
 def names_match(name1, name2):
     """Check if two names match (fuzzy)"""
@@ -52,6 +55,49 @@ def names_match(name1, name2):
     
     return False
 
+class NameIndex:
+    """Finds the strings names_match would accept without comparing against each one
+    
+    add(text, key) indexes a string; candidates(name) -> keys of every added
+    string s with names_match(name, s): exact and one-contains-the-other
+    through s's substrings of name and the rarest trigram of name, same last
+    name + initial through a (last name, initial) map.
+    """
+    
+    def __init__(self):
+        self._keys = {}      # normalized string -> keys
+        self._lengths = set()
+        self._trigrams = {}  # trigram -> normalized strings containing it
+        self._initials = {}  # (last name, first initial) -> normalized strings
+    
+    def add(self, text, key):
+        s = normalize_name(text)
+        if s not in self._keys:
+            self._keys[s] = set()
+            self._lengths.add(len(s))
+            for i in range(len(s) - 2):
+                self._trigrams.setdefault(s[i:i + 3], set()).add(s)
+            parts = s.split()
+            if parts:
+                self._initials.setdefault((parts[-1], parts[0][0]), set()).add(s)
+        self._keys[s].add(key)
+    
+    def candidates(self, name):
+        n = normalize_name(name)
+        # Added strings contained in n (n itself included)
+        strings = {n[i:i + length] for length in self._lengths if length <= len(n)
+                   for i in range(len(n) - length + 1)} & self._keys.keys()
+        # Added strings containing n: all of them hold n's rarest trigram
+        if len(n) < 3:
+            strings.update(s for s in self._keys if n in s)
+        else:
+            rarest = min((n[i:i + 3] for i in range(len(n) - 2)), key=lambda g: len(self._trigrams.get(g, ())))
+            strings.update(s for s in self._trigrams.get(rarest, ()) if n in s)
+        parts = n.split()
+        if parts:
+            strings.update(self._initials.get((parts[-1], parts[0][0]), ()))
+        return set().union(*(self._keys[s] for s in strings))
+
 # ============================================
 # CONTRACT EXPIRY DATES (year)
 # Players with expiring contracts = BARGAINS
@@ -213,6 +259,7 @@ KNOWN_VALUES = {
 # TRANSFERMARKT API (for market values)
 # ============================================
 TM_API_BASE = "https://transfermarkt-api.fly.dev"
+TM_HOST = host_of(TM_API_BASE)
 
 # ============================================
 # LEAGUES CONFIG - 20+ LEAGUES FOR HIDDEN GEMS
@@ -251,21 +298,112 @@ TM_LEAGUES = {
     'PL1': {'name': 'Ekstraklasa', 'fd_code': None, 'multiplier': 0.25, 'tier': 3},
 }
 
-def fetch_json(url, headers=None):
-    """Fetch JSON from URL"""
+class RateLimiter:
+    """Minimum spacing between requests to one host, shared across threads"""
+    
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+# Transfermarkt and Football-Data.org have independent limits
+TM_LIMITER = RateLimiter(0.2)
+FD_LIMITER = RateLimiter(1.0)
+
+def fetch_json(url, headers=None, limiter=None, quota=None, key=None):
+    """Fetch JSON from URL
+    
+    Callers asking for a URL that is in flight or was fetched recently share
+    that result (single_flight.py), so a squad is requested once per run.
+    limiter: wait for the host's next request slot first
+    quota: QuotaPlanner updated from the response headers
+    key: top-level array the caller reads (e.g. 'players'): parsed element by
+         element as the body streams in (iter_json_items) instead of from the
+         whole body; a response without it counts as failed
+    """
+    return HTTP_FLIGHTS.do(url, _fetch_json, url, headers, limiter, quota, key)
+
+def _open(url, headers, limiter, quota):
+    """Send a GET -> (response, start time), or (None, start time) if it failed"""
+    import urllib.error
+    import urllib.request  # Only needed by live fetches: keeps `import fetch_combined` fast
+
+    if limiter:
+        limiter.wait()
     default_headers = {
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)',
         'Accept': 'application/json',
+        'Accept-Encoding': ACCEPT_ENCODING,
     }
     if headers:
         default_headers.update(headers)
     
     req = urllib.request.Request(url, headers=default_headers)
+    started = time.perf_counter()
+    try:
+        response = urllib.request.urlopen(req, timeout=30)
+    except urllib.error.HTTPError as e:
+        # 429s still carry the quota headers
+        if quota:
+            quota.observe(e.headers)
+        METRICS.record_http(url, e.code, time.perf_counter() - started, 0)
+        return None, started
+    except Exception:
+        METRICS.record_http(url, None, time.perf_counter() - started, 0)
+        return None, started
+    if quota:
+        quota.observe(response.headers)
+    return response, started
+
+def _fetch_json(url, headers, limiter, quota, key=None):
+    response, started = _open(url, headers, limiter, quota)
+    if response is None:
+        return None
+    counter = {}
     try:
-        with urllib.request.urlopen(req, timeout=30) as response:
-            return json.loads(response.read().decode('utf-8'))
-    except Exception as e:
+        with response:
+            chunks = read_body(response, counter)
+            if key is None:
+                # json.loads takes the bytes as they are: no separate decoded copy of the body
+                return json.loads(b''.join(chunks))
+            meta = {}
+            items = list(iter_json_items(chunks, key, meta))
+            return {**meta, key: items}
+    except Exception:
+        return None
+    finally:
+        METRICS.record_http(url, response.status, time.perf_counter() - started, counter.get('wire_bytes', 0))
+
+def fetch_json_items(url, key, headers=None, limiter=None, quota=None, meta=None):
+    """Stream the elements of the array at top-level `key` of a JSON response
+    
+    For large payloads: elements are parsed as the body arrives, so the whole
+    body is never in memory at once. Returns an iterator, or None if the
+    request failed. The iterator raises ValueError for a malformed, cut-off or
+    undecodable body or one without `key` (read_body, iter_json_items), and
+    OSError for a dropped connection. Not shared with other callers like fetch_json.
+    meta: dict that receives the response's other top-level fields
+    """
+    response, started = _open(url, headers, limiter, quota)
+    if response is None:
         return None
+    
+    def items():
+        counter = {}
+        try:
+            with response:
+                yield from iter_json_items(read_body(response, counter), key, meta)
+        finally:
+            METRICS.record_http(url, response.status, time.perf_counter() - started, counter.get('wire_bytes', 0))
+    return items()
 
 def parse_market_value(value_str):
     """Parse market value string to millions EUR"""
@@ -289,53 +427,159 @@ def parse_market_value(value_str):
     except:
         return None
 
-def fetch_transfermarkt_values():
-    """Fetch market values from Transfermarkt API"""
+def fetch_league_clubs(tm_id, limiter=TM_LIMITER):
+    """Clubs fetched per league (top 10) -> [{'id', 'name'}], or None if the request failed"""
+    url = f"{TM_API_BASE}/competitions/{tm_id}/clubs"
+    data = fetch_json(url, limiter=limiter)
+    
+    if not data or 'clubs' not in data:
+        return None
+    return [{'id': club.get('id'), 'name': club.get('name', 'Unknown')} for club in data.get('clubs', [])[:10]]
+
+def fetch_club_values(club_id, club_name, league_info, limiter=TM_LIMITER):
+    """One club's squad values -> name -> value info, or None if the request failed"""
+    squad_url = f"{TM_API_BASE}/clubs/{club_id}/players"
+    squad_data = fetch_json(squad_url, limiter=limiter, key='players')
+    
+    if not squad_data or 'players' not in squad_data:
+        return None
+    
+    club_values = {}
+    for p in squad_data['players']:
+        mv = parse_market_value(p.get('marketValue'))
+        if mv and mv >= 1:
+            name = p.get('name', 'Unknown')
+            club_values[name.lower()] = {
+                'market_value_eur_m': mv,
+                'team': club_name,
+                'league': league_info['name'],
+                'age': p.get('age', 25),
+                'position': p.get('position', 'Forward'),
+                'nationality': p.get('nationality', ''),
+            }
+    return club_values
+
+def fetch_league_values(tm_id, league_info, journal=None, limiter=TM_LIMITER):
+    """Fetch one league's squad values -> (values, complete), or (None, False) if the club list failed
+    
+    journal: skip clubs it already holds and record each fetched squad
+    limiter: request pacing for Transfermarkt
+    """
+    clubs = fetch_league_clubs(tm_id, limiter)
+    if clubs is None:
+        return None, False
+    
+    values = {}
+    done_clubs = []
+    for club in clubs:
+        unit = f"{tm_id}/{club['id']}"
+        
+        if journal and journal.done(unit):
+            METRICS.record_cache(TM_HOST, hit=True)
+            values.update(journal.get(unit))
+            done_clubs.append(club['id'])
+            continue
+        
+        METRICS.record_cache(TM_HOST, hit=False)
+        # Failed squads are not journaled, so --resume retries them
+        club_values = fetch_club_values(club['id'], club['name'], league_info, limiter)
+        if club_values is not None:
+            values.update(club_values)
+            done_clubs.append(club['id'])
+            if journal:
+                journal.record(unit, club_values)
+    
+    complete = len(done_clubs) == len(clubs)
+    if journal and complete:
+        journal.record(tm_id, done_clubs)
+    return values, complete
+
+# Longest wait on one league before serving its last known good data instead
+LEAGUE_TIMEOUT_S = 120
+
+def mark_stale(cached, field='value_as_of'):
+    """Cached league values or stats, each marked with when they were fetched"""
+    return {name: {**info, field: cached['fetched_at']} for name, info in cached['values'].items()}
+
+def is_stale(player):
+    """Whether a player's value or stats came from last known good data rather than today's fetch"""
+    return bool(player.get('value_as_of') or player.get('stats_as_of'))
+
+def fetch_transfermarkt_values(resume=False, revalidator=None, league_timeout=LEAGUE_TIMEOUT_S):
+    """Fetch market values from Transfermarkt API
+    
+    resume: skip clubs/leagues done by an interrupted run, or by one where some leagues
+            failed (the journal is only cleared once every league came back)
+    revalidator: keeps retrying failed or slow leagues in the background while their
+                 last known good data is served (default: a new Revalidator)
+    """
     print("📊 Fetching Transfermarkt market values...")
     
     tm_values = {}  # name -> {market_value, team, age, position, nationality}
+    journal = Journal('transfermarkt_values', resume)
+    revalidator = revalidator or Revalidator()
+    failed = []
     
     for tm_id, league_info in TM_LEAGUES.items():
-        print(f"   {league_info['name']}...", end=" ")
+        key = f"tm-{tm_id}"
+        if journal.done(tm_id):
+            count = 0
+            for club_id in journal.get(tm_id):
+                club_values = journal.get(f"{tm_id}/{club_id}")
+                tm_values.update(club_values)
+                count += len(club_values)
+            print(f"   {league_info['name']}... ✓ {count} (resumed)")
+            continue
         
-        url = f"{TM_API_BASE}/competitions/{tm_id}/clubs"
-        data = fetch_json(url)
+        def fetch(tm_id=tm_id, league_info=league_info):
+            values, complete = fetch_league_values(tm_id, league_info, journal)
+            # Incomplete leagues retry; the journal keeps the clubs already fetched
+            return values if complete else None
         
-        if not data or 'clubs' not in data:
-            print("⚠️ failed")
+        revalidator.submit(key, fetch)
+        values = revalidator.first_result(key, league_timeout)
+        if values is not None:
+            tm_values.update(values)
+            print(f"   {league_info['name']}... ✓ {len(values)}")
             continue
         
-        count = 0
-        for club in data.get('clubs', [])[:10]:
-            club_id = club.get('id')
-            club_name = club.get('name', 'Unknown')
-            
-            squad_url = f"{TM_API_BASE}/clubs/{club_id}/players"
-            squad_data = fetch_json(squad_url)
-            
-            if squad_data and 'players' in squad_data:
-                for p in squad_data['players']:
-                    mv = parse_market_value(p.get('marketValue'))
-                    if mv and mv >= 1:
-                        name = p.get('name', 'Unknown')
-                        tm_values[name.lower()] = {
-                            'market_value_eur_m': mv,
-                            'team': club_name,
-                            'league': league_info['name'],
-                            'age': p.get('age', 25),
-                            'position': p.get('position', 'Forward'),
-                            'nationality': p.get('nationality', ''),
-                        }
-                        count += 1
-            
-            time.sleep(0.2)
-        
-        print(f"✓ {count}")
-        time.sleep(0.5)
+        failed.append(league_info['name'])
+        cached = load_league(key)
+        METRICS.record_cache('league_cache', hit=cached is not None)
+        if cached:
+            tm_values.update(mark_stale(cached))
+            print(f"   {league_info['name']}... ⚠️ failed, serving data from {age_hours(cached['fetched_at'])}h ago "
+                  f"(retrying in background)")
+        else:
+            # No last known good data yet: keep whichever clubs did come through
+            partial = {}
+            for unit, club_values in list(journal.units.items()):
+                if unit.startswith(f"{tm_id}/"):
+                    partial.update(club_values)
+            tm_values.update(partial)
+            print(f"   {league_info['name']}... ⚠️ failed, {len(partial)} from partial fetch (retrying in background)")
     
+    if failed:
+        # Keep the journal: --resume retries only these leagues
+        print(f"   ↩️  {len(failed)} leagues incomplete - rerun with --resume to retry only those")
+    else:
+        journal.finish()
     print(f"   Total: {len(tm_values)} players with TM values")
     return tm_values
 
+def apply_revalidated(tm_values, refreshed):
+    """Swap leagues refreshed in the background into tm_values, keeping TM_LEAGUES order"""
+    by_league = {}
+    for name, info in tm_values.items():
+        by_league.setdefault(info['league'], {})[name] = info
+    for key, values in refreshed.items():
+        by_league[TM_LEAGUES[key[len('tm-'):]]['name']] = values
+    
+    rebuilt = {}
+    for league_info in TM_LEAGUES.values():
+        rebuilt.update(by_league.get(league_info['name'], {}))
+    return rebuilt
+
 # ============================================
 # FOOTBALL-DATA.ORG API (for season stats)
 # ============================================
@@ -360,77 +604,197 @@ def calculate_age(dob_str):
     except:
         return 25
 
-def fetch_football_data_stats(api_key):
-    """Fetch season stats from Football-Data.org"""
-    print("\n⚽ Fetching Football-Data.org stats...")
+# Football-Data.org free tier leagues
+FD_LEAGUES = {
+    # Big 5
+    'PL': 'Premier League',
+    'PD': 'La Liga', 
+    'BL1': 'Bundesliga',
+    'SA': 'Serie A',
+    'FL1': 'Ligue 1',
+    # Hidden Gem Leagues (available on free tier)
+    'ELC': 'Championship',
+    'DED': 'Eredivisie',
+    'PPL': 'Primeira Liga',
+    'BSA': 'Brasileirão',  # Brazil - lots of hidden gems!
+}
+
+def fd_priority(code):
+    """Quota priority of a Football-Data.org competition: its TM_LEAGUES tier"""
+    tiers = [info['tier'] for info in TM_LEAGUES.values() if info.get('fd_code') == code]
+    return tiers[0] if tiers else 3
+
+# Scorers per competition: the top list by default, pages of the full listing with --full
+FD_TOP_SCORERS = 30
+FD_PAGE_SIZE = 100
+FD_FULL_PAGES = 3  # 10x the top list
+FD_WORKERS = 3     # Competitions fetched at once (requests are still paced by FD_LIMITER)
+
+def fd_plan_units(full=False):
+    cost = FD_FULL_PAGES if full else 1
+    return [{'key': code, 'name': name, 'priority': fd_priority(code), 'cost': cost}
+            for code, name in FD_LEAGUES.items()]
+
+def scorers_url(code, limit=FD_TOP_SCORERS, offset=0, season=None):
+    url = f"https://api.football-data.org/v4/competitions/{code}/scorers?limit={limit}"
+    if offset:
+        url += f"&offset={offset}"
+    if season:
+        url += f"&season={season}"
+    return url
+
+def scorer_stats(scorer, league_name):
+    """One entry of a scorers listing -> our stats dict"""
+    player = scorer.get('player', {})
+    team = scorer.get('team', {})
     
-    # Football-Data.org free tier leagues
-    fd_leagues = {
-        # Big 5
-        'PL': 'Premier League',
-        'PD': 'La Liga', 
-        'BL1': 'Bundesliga',
-        'SA': 'Serie A',
-        'FL1': 'Ligue 1',
-        # Hidden Gem Leagues (available on free tier)
-        'ELC': 'Championship',
-        'DED': 'Eredivisie',
-        'PPL': 'Primeira Liga',
-        'BSA': 'Brasileirão',  # Brazil - lots of hidden gems!
+    player_name = player.get('name', 'Unknown')
+    goals = scorer.get('goals', 0) or 0
+    assists = scorer.get('assists', 0) or 0
+    penalties = scorer.get('penalties', 0) or 0
+    played = scorer.get('playedMatches', 1) or 1
+    
+    # Estimate minutes
+    minutes = played * 75
+    
+    # Estimate xG/xA
+    npg = goals - penalties
+    xg = npg * 0.9 + penalties * 0.76
+    xa = assists * 0.85
+    xgi_per_90 = (xg + xa) / max(minutes / 90, 1)
+    
+    return {
+        'name': player_name,
+        'team': team.get('name', 'Unknown'),
+        'league': league_name,
+        'age': calculate_age(player.get('dateOfBirth')),
+        'nationality': player.get('nationality', ''),
+        'position': player.get('position', 'Forward')[0] if player.get('position') else 'F',
+        'goals': goals,
+        'assists': assists,
+        'xG': round(xg, 1),
+        'xA': round(xa, 1),
+        'xgi_per_90': round(xgi_per_90, 2),
+        'minutes_played': minutes,
+        'games': played,
     }
+
+def fetch_league_stats(code, name, api_key, limiter=FD_LIMITER, quota=None, season=None):
+    """Fetch one competition's scorers -> name -> stats, or None if the request failed
+    
+    season: starting year (e.g. 2024); default is the current season
+    """
+    url = scorers_url(code, season=season)
+    data = fetch_json(url, headers={'X-Auth-Token': api_key}, limiter=limiter, quota=quota, key='scorers')
+    
+    if not data or 'scorers' not in data:
+        return None
+    
+    stats = {}
+    for scorer in data.get('scorers', []):
+        player_stats = scorer_stats(scorer, name)
+        stats[player_stats['name'].lower()] = player_stats
+    return stats
+
+def fetch_scorers_page(code, name, page, api_key, limiter=FD_LIMITER, quota=None, season=None):
+    """One FD_PAGE_SIZE page of a competition's scorers, parsed as it streams in -> [stats]
+    
+    Spends one quota request (quota.acquire). Returns None if the quota is
+    used up or the request or its body failed (cut off, malformed, or an API
+    error object without a scorers array).
+    """
+    if quota and not quota.acquire():
+        return None
+    items = fetch_json_items(scorers_url(code, FD_PAGE_SIZE, page * FD_PAGE_SIZE, season),
+                             'scorers', headers={'X-Auth-Token': api_key}, limiter=limiter, quota=quota)
+    if items is None:
+        return None
+    try:
+        return [scorer_stats(scorer, name) for scorer in items]
+    except (ValueError, OSError):
+        return None
+
+def fetch_league_stats_full(code, name, api_key, limiter=FD_LIMITER, quota=None, season=None,
+                            max_pages=FD_FULL_PAGES):
+    """Fetch one competition's full scorers listing -> name -> stats
+    
+    The first page is fetched alone; if it is full, the remaining pages are
+    requested together (still paced by limiter) and merged in page order.
+    Stops at a failed or short page, a page that repeats players already seen
+    (a server that ignores offset), or max_pages. Returns None only if the
+    first page failed; later failures keep the pages before them.
+    """
+    pages = [fetch_scorers_page(code, name, 0, api_key, limiter, quota, season)]
+    if pages[0] is None:
+        return None
+    if len(pages[0]) == FD_PAGE_SIZE and max_pages > 1:
+        with ThreadPoolExecutor(max_workers=max_pages - 1) as pool:
+            pages += pool.map(lambda page: fetch_scorers_page(code, name, page, api_key, limiter, quota, season),
+                              range(1, max_pages))
+    
+    stats = {}
+    for rows in pages:
+        if rows is None:
+            break
+        new = 0
+        for player_stats in rows:
+            key = player_stats['name'].lower()
+            if key not in stats:
+                new += 1
+                stats[key] = player_stats
+        if len(rows) < FD_PAGE_SIZE or not new:
+            break
+    return stats
+
+def settle_league_stats(code, name, stats, note='⚠️ failed'):
+    """A competition's stats to merge: today's are kept as its last known good data,
+    a failed or skipped one is served from that data (marked stale) -> stats or None
+    """
+    key = f"fd-{code}"  # Same cache entries as the scheduler's fd jobs
+    if stats is not None:
+        save_league(key, stats)
+        print(f"   {name}... ✓ {len(stats)}")
+        return stats
+    cached = load_league(key)
+    METRICS.record_cache('league_cache', hit=cached is not None)
+    if not cached:
+        print(f"   {name}... {note}")
+        return None
+    print(f"   {name}... {note}, serving data from {age_hours(cached['fetched_at'])}h ago")
+    return mark_stale(cached, 'stats_as_of')
+
+def fetch_football_data_stats(api_key, quota=None, full=False):
+    """Fetch season stats from Football-Data.org, highest-priority leagues first within the quota
+    
+    full: every competition's full scorers listing (fetch_league_stats_full),
+          competitions fetched concurrently and merged as each one finishes
+    """
+    print("\n⚽ Fetching Football-Data.org stats...")
+    
+    quota = quota or QuotaPlanner('football-data')
+    planned, skipped, _ = quota.plan(fd_plan_units(full))
     
     all_stats = {}  # name -> stats
+    for unit in skipped:
+        all_stats.update(settle_league_stats(unit['key'], unit['name'], None, '⏭️ skipped (quota)') or {})
     
-    for code, name in fd_leagues.items():
-        print(f"   {name}...", end=" ")
-        
-        url = f"https://api.football-data.org/v4/competitions/{code}/scorers?limit=30"
-        data = fetch_json(url, headers={'X-Auth-Token': api_key})
-        
-        if not data or 'scorers' not in data:
-            print("⚠️ failed")
-            time.sleep(1)
+    if full:
+        with ThreadPoolExecutor(max_workers=FD_WORKERS) as pool:
+            futures = {pool.submit(fetch_league_stats_full, unit['key'], unit['name'], api_key, quota=quota):
+                       unit for unit in planned}
+            for future in as_completed(futures):
+                unit = futures[future]
+                all_stats.update(settle_league_stats(unit['key'], unit['name'], future.result()) or {})
+        print(f"   Total: {len(all_stats)} players with stats")
+        return all_stats
+    
+    for unit in planned:
+        code, name = unit['key'], unit['name']
+        if not quota.acquire():
+            all_stats.update(settle_league_stats(code, name, None, '⏭️ skipped (daily quota used)') or {})
             continue
-        
-        count = 0
-        for scorer in data.get('scorers', []):
-            player = scorer.get('player', {})
-            team = scorer.get('team', {})
-            
-            player_name = player.get('name', 'Unknown')
-            goals = scorer.get('goals', 0) or 0
-            assists = scorer.get('assists', 0) or 0
-            penalties = scorer.get('penalties', 0) or 0
-            played = scorer.get('playedMatches', 1) or 1
-            
-            # Estimate minutes
-            minutes = played * 75
-            
-            # Estimate xG/xA
-            npg = goals - penalties
-            xg = npg * 0.9 + penalties * 0.76
-            xa = assists * 0.85
-            xgi_per_90 = (xg + xa) / max(minutes / 90, 1)
-            
-            all_stats[player_name.lower()] = {
-                'name': player_name,
-                'team': team.get('name', 'Unknown'),
-                'league': name,
-                'age': calculate_age(player.get('dateOfBirth')),
-                'nationality': player.get('nationality', ''),
-                'position': player.get('position', 'Forward')[0] if player.get('position') else 'F',
-                'goals': goals,
-                'assists': assists,
-                'xG': round(xg, 1),
-                'xA': round(xa, 1),
-                'xgi_per_90': round(xgi_per_90, 2),
-                'minutes_played': minutes,
-                'games': played,
-            }
-            count += 1
-        
-        print(f"✓ {count}")
-        time.sleep(1)  # Rate limit
+        stats = fetch_league_stats(code, name, api_key, quota=quota)
+        all_stats.update(settle_league_stats(code, name, stats) or {})
     
     print(f"   Total: {len(all_stats)} players with stats")
     return all_stats
@@ -439,24 +803,29 @@ def fetch_football_data_stats(api_key):
 # MERGE AND GENERATE
 # ============================================
 
-def merge_data(tm_values, fd_stats):
-    """Merge Transfermarkt values with Football-Data stats"""
-    print("\n🔄 Merging data...")
-    
+def match_player_values(tm_values, fd_stats):
+    """Attach market values (TM match, known value or estimate) to stats players"""
     merged = []
     matched = 0
     unmatched_names = []
     
+    # Only TM entries whose name or team names_match a player can be picked: index them once
+    tm_items = list(tm_values.items())
+    index = NameIndex()
+    for i, (tm_name, tm_info) in enumerate(tm_items):
+        index.add(tm_name, i)
+        index.add(tm_info.get('team', ''), i)
+    
     # Start with players who have stats (they're the ones scoring/assisting)
     for name_key, stats in fd_stats.items():
         player = stats.copy()
         original_name = stats.get('name', name_key)
         
-        # Try to find TM value with fuzzy matching
+        # Try to find TM value with fuzzy matching (candidates in tm_values order, as a full scan)
         tm_data = None
         best_match = None
         
-        for tm_name, tm_info in tm_values.items():
+        for tm_name, tm_info in (tm_items[i] for i in sorted(index.candidates(original_name))):
             if names_match(original_name, tm_name) or names_match(original_name, tm_info.get('team', '')):
                 # Additional check: same team or league
                 if (tm_info.get('league') == stats.get('league') or 
@@ -474,6 +843,8 @@ def merge_data(tm_values, fd_stats):
         
         if tm_data:
             player['market_value_eur_m'] = tm_data['market_value_eur_m']
+            if tm_data.get('value_as_of'):
+                player['value_as_of'] = tm_data['value_as_of']  # Served from last known good data
             player['tm_verified'] = True
             player['valuation_confidence'] = 'verified'  # Direct TM match
             player['valuation_source'] = 'Transfermarkt'
@@ -504,76 +875,86 @@ def merge_data(tm_values, fd_stats):
                 player['valuation_confidence'] = 'estimated'
                 player['valuation_source'] = 'Performance estimate'
         
-        # Add release clause if known
-        name_normalized = normalize_name(original_name)
-        release_clause = RELEASE_CLAUSES.get(name_normalized)
-        if not release_clause:
-            # Try last name
-            last_name = name_normalized.split()[-1] if name_normalized.split() else ''
-            release_clause = RELEASE_CLAUSES.get(last_name)
-        
-        player['release_clause_eur_m'] = release_clause  # None if unknown
-        
-        # Add contract expiry if known
-        contract_expiry = CONTRACT_EXPIRY.get(name_normalized)
-        if not contract_expiry:
-            last_name = name_normalized.split()[-1] if name_normalized.split() else ''
-            contract_expiry = CONTRACT_EXPIRY.get(last_name)
-        
-        player['contract_expiry'] = contract_expiry  # Year or None
-        
-        # Flag if contract expiring soon (2025 = free agent soon!)
-        if contract_expiry:
-            if contract_expiry <= 2025:
-                player['contract_status'] = 'expiring'
-            elif contract_expiry <= 2026:
-                player['contract_status'] = 'short'
-            else:
-                player['contract_status'] = 'long'
-        else:
-            player['contract_status'] = None
-        
-        # Add tier info for hidden gem identification
-        league_info = None
-        for tm_id, info in TM_LEAGUES.items():
-            if info['name'] == player.get('league'):
-                league_info = info
-                break
-        
-        player['league_tier'] = league_info['tier'] if league_info else 2
-        player['is_hidden_gem'] = player['league_tier'] >= 2
-        
-        # Calculate fair value based on performance
-        gi_per_game = (player['goals'] + player['assists']) / max(player['games'], 1)
-        
-        if gi_per_game >= 1.3:
-            fair_base = 100
-        elif gi_per_game >= 1.0:
-            fair_base = 70
-        elif gi_per_game >= 0.8:
-            fair_base = 50
-        elif gi_per_game >= 0.6:
-            fair_base = 35
-        elif gi_per_game >= 0.45:
-            fair_base = 22
-        else:
-            fair_base = 12
-        
-        league_mult = {'Premier League': 2.0, 'La Liga': 1.4, 'Bundesliga': 1.3, 
-                       'Serie A': 1.2, 'Ligue 1': 1.1, 'Championship': 0.6,
-                       'Eredivisie': 0.7, 'Primeira Liga': 0.65}.get(player['league'], 1.0)
-        
-        player['fair_value_eur_m'] = round(
-            min(fair_base * get_age_multiplier(player['age']) * league_mult, 200), 1
-        )
-        
-        # Undervaluation
-        mv = player['market_value_eur_m']
-        fv = player['fair_value_eur_m']
-        player['undervaluation_pct'] = round(((fv - mv) / mv * 100) if mv > 0 else 0, 1)
-        
         merged.append(player)
     
+    return merged, matched, unmatched_names
+
+def score_player(player):
+    """Add contract, tier, fair value and undervaluation fields to a matched player"""
+    original_name = player.get('name', '')
+    
+    # Add release clause if known
+    name_normalized = normalize_name(original_name)
+    release_clause = RELEASE_CLAUSES.get(name_normalized)
+    if not release_clause:
+        # Try last name
+        last_name = name_normalized.split()[-1] if name_normalized.split() else ''
+        release_clause = RELEASE_CLAUSES.get(last_name)
+    
+    player['release_clause_eur_m'] = release_clause  # None if unknown
+    
+    # Add contract expiry if known
+    contract_expiry = CONTRACT_EXPIRY.get(name_normalized)
+    if not contract_expiry:
+        last_name = name_normalized.split()[-1] if name_normalized.split() else ''
+        contract_expiry = CONTRACT_EXPIRY.get(last_name)
+    
+    player['contract_expiry'] = contract_expiry  # Year or None
+    
+    # Flag if contract expiring soon (2025 = free agent soon!)
+    if contract_expiry:
+        if contract_expiry <= 2025:
+            player['contract_status'] = 'expiring'
+        elif contract_expiry <= 2026:
+            player['contract_status'] = 'short'
+        else:
+            player['contract_status'] = 'long'
+    else:
+        player['contract_status'] = None
+    
+    # Add tier info for hidden gem identification
+    league_info = None
+    for tm_id, info in TM_LEAGUES.items():
+        if info['name'] == player.get('league'):
+            league_info = info
+            break
+    
+    player['league_tier'] = league_info['tier'] if league_info else 2
+    player['is_hidden_gem'] = player['league_tier'] >= 2
+    
+    # Calculate fair value based on performance
+    gi_per_game = (player['goals'] + player['assists']) / max(player['games'], 1)
+    
+    if gi_per_game >= 1.3:
+        fair_base = 100
+    elif gi_per_game >= 1.0:
+        fair_base = 70
+    elif gi_per_game >= 0.8:
+        fair_base = 50
+    elif gi_per_game >= 0.6:
+        fair_base = 35
+    elif gi_per_game >= 0.45:
+        fair_base = 22
+    else:
+        fair_base = 12
+    
+    league_mult = {'Premier League': 2.0, 'La Liga': 1.4, 'Bundesliga': 1.3, 
+                   'Serie A': 1.2, 'Ligue 1': 1.1, 'Championship': 0.6,
+                   'Eredivisie': 0.7, 'Primeira Liga': 0.65}.get(player['league'], 1.0)
+    
+    player['fair_value_eur_m'] = round(
+        min(fair_base * get_age_multiplier(player['age']) * league_mult, 200), 1
+    )
+    
+    # Undervaluation
+    mv = player['market_value_eur_m']
+    fv = player['fair_value_eur_m']
+    player['undervaluation_pct'] = round(((fv - mv) / mv * 100) if mv > 0 else 0, 1)
+
+def tm_only_players(tm_values, fd_stats):
+    """High-value TM players without stats, assumed fairly valued"""
+    merged = []
+    
     # Add high-value TM players who might not be top scorers
     for name_lower, tm_data in tm_values.items():
         if name_lower not in fd_stats and tm_data['market_value_eur_m'] >= 50:
@@ -595,8 +976,25 @@ def merge_data(tm_values, fd_stats):
                 'minutes_played': 0,
                 'games': 0,
             }
+            if tm_data.get('value_as_of'):
+                player['value_as_of'] = tm_data['value_as_of']
             merged.append(player)
     
+    return merged
+
+def merge_data(tm_values, fd_stats):
+    """Merge Transfermarkt values with Football-Data stats"""
+    print("\n🔄 Merging data...")
+    
+    with METRICS.stage('match') as rec:
+        merged, matched, unmatched_names = match_player_values(tm_values, fd_stats)
+        rec['items'] = len(fd_stats)
+    with METRICS.stage('score') as rec:
+        for player in merged:
+            score_player(player)
+        merged.extend(tm_only_players(tm_values, fd_stats))
+        rec['items'] = len(merged)
+    
     print(f"   Matched TM values: {matched}/{len(fd_stats)}")
     print(f"   Total merged: {len(merged)}")
     
@@ -605,12 +1003,200 @@ def merge_data(tm_values, fd_stats):
     
     return merged
 
-def generate_js(players, output_path):
-    """Generate player_data.js"""
-    
-    # Add IDs
+# ============================================
+# RUMOR JOIN (client looks up rumor <-> player IDs instead of matching names)
+# ============================================
+RUMORS_FILE = Path(__file__).parent / 'rumors.json'
+
+def load_rumors(path=RUMORS_FILE):
+    """Unexpired rumors from rumors.json (empty list if missing or unreadable)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            rumors = json.load(f).get('rumors', [])
+    except (OSError, ValueError) as e:
+        print(f"   ⚠️  Could not load rumors: {e}")
+        return []
+    today = datetime.now().date().isoformat()
+    return [r for r in rumors if not r.get('expires') or r['expires'][:10] > today]
+
+def build_name_index(players):
+    """Normalized full name and last name -> player IDs (the keys match_player_values falls back on)"""
+    by_name, by_last_name = {}, {}
+    for p in players:
+        name = normalize_name(p.get('name'))
+        if not name or p.get('id') is None:
+            continue
+        by_name.setdefault(name, set()).add(p['id'])
+        by_last_name.setdefault(name.split()[-1], set()).add(p['id'])
+    return by_name, by_last_name
+
+def join_rumors(players, rumors):
+    """Match rumors to players by normalized name -> {rumor ID: [player IDs]}
+
+    A last-name match only counts if exactly one player has that last name.
+    Matched players get a rumor_ids list.
+    """
+    by_name, by_last_name = build_name_index(players)
+    rumor_players = {}
+    player_rumors = {}
+    for rumor in rumors:
+        name = normalize_name(rumor.get('player'))
+        if not name or not rumor.get('id'):
+            continue
+        ids = by_name.get(name)
+        if not ids:
+            ids = by_last_name.get(name.split()[-1])
+            ids = ids if ids and len(ids) == 1 else None
+        if ids:
+            rumor_players[rumor['id']] = sorted(ids)
+            for player_id in rumor_players[rumor['id']]:
+                player_rumors.setdefault(player_id, []).append(rumor['id'])
+
+    for p in players:
+        p.pop('rumor_ids', None)
+        if p.get('id') in player_rumors:
+            p['rumor_ids'] = player_rumors[p['id']]
+    return rumor_players
+
+# ============================================
+# SORT PERMUTATIONS + FACETS (client sorts/counts by lookup)
+# ============================================
+# Client sort key -> (field, descending, default) - mirrors filterAndSortPlayers in app.js
+SORT_COLUMNS = {
+    'undervaluation': ('undervaluation_pct', True, 0),
+    'market_value': ('market_value_eur_m', True, 0),
+    'xgi': ('xgi_per_90', True, 0),
+    'goals': ('goals', True, 0),
+    'age_asc': ('age', False, 99),
+    'age_desc': ('age', True, 0),
+}
+
+# Counted per category for app.js: league/position filter options, expiring-contract summary
+FACET_FIELDS = ('league', 'position', 'contract_status')
+
+def build_category_views(players):
+    """Sort permutations and facet histograms for one category list"""
+    fields = {field for field, _, _ in SORT_COLUMNS.values()}
+    columns = {field: [] for field in fields}
+    facets = {field: {} for field in FACET_FIELDS}
+
+    # Single pass: extract every sortable column and count every facet
+    for p in players:
+        for field in fields:
+            columns[field].append(p.get(field))
+        for field in FACET_FIELDS:
+            value = p.get(field) or 'unknown'
+            facets[field][value] = facets[field].get(value, 0) + 1
+
+    order = {}
+    for sort_key, (field, descending, default) in SORT_COLUMNS.items():
+        column = [v if v else default for v in columns[field]]
+        order[sort_key] = sorted(range(len(column)), key=column.__getitem__, reverse=descending)
+
+    return {'sort': order, 'facets': facets}
+
+# ============================================
+# CATEGORIES (shared by generate_js and historical queries)
+# ============================================
+def _num(p, field, default):
+    """Numeric field with a default for missing or NULL values"""
+    value = p.get(field)
+    return default if value is None else value
+
+# name -> filter, sort key, order and size of each player_data.js category.
+# 'where' / 'order_by' are the same filter and ranking as SQL, for snapshot store queries.
+CATEGORIES = {
+    # Only show undervalued if we have verified TM value AND meaningful undervaluation
+    'undervalued': {
+        'filter': lambda p: (
+            bool(p.get('tm_verified')) and  # Must have real TM value
+            20 < _num(p, 'undervaluation_pct', 0) < 200 and  # Meaningful gap, not a data error
+            _num(p, 'goals', 0) >= 3  # Has actual output
+        ),
+        'where': "tm_verified AND undervaluation_pct > 20 AND undervaluation_pct < 200 AND goals >= 3",
+        'order_by': "undervaluation_pct DESC",
+        'key': lambda x: x['undervaluation_pct'],
+        'reverse': True,
+        'limit': 20,
+    },
+    # Contract expiring soon = bargains
+    'expiringContracts': {
+        'filter': lambda p: p.get('contract_status') == 'expiring',
+        'where': "contract_status = 'expiring'",
+        'order_by': "market_value_eur_m DESC",
+        'key': lambda x: _num(x, 'market_value_eur_m', 0),
+        'reverse': True,
+        'limit': 15,
+    },
+    # Best bargains: high value players with expiring contracts
+    'bargains': {
+        'filter': lambda p: (
+            bool(p.get('contract_expiry')) and
+            p['contract_expiry'] <= 2026 and
+            _num(p, 'market_value_eur_m', 0) >= 20
+        ),
+        'where': "contract_expiry <= 2026 AND market_value_eur_m >= 20",
+        'order_by': "market_value_eur_m DESC",
+        'key': lambda x: _num(x, 'market_value_eur_m', 0),
+        'reverse': True,
+        'limit': 15,
+    },
+    'topPerformers': {
+        'filter': lambda p: _num(p, 'xgi_per_90', 0) > 0,
+        'where': "xgi_per_90 > 0",
+        'order_by': "xgi_per_90 DESC",
+        'key': lambda x: x['xgi_per_90'],
+        'reverse': True,
+        'limit': 15,
+    },
+    'risingStars': {
+        'filter': lambda p: _num(p, 'age', 30) <= 23 and _num(p, 'goals', 0) > 0,
+        'where': "age <= 23 AND goals > 0",
+        'order_by': "xgi_per_90 DESC",
+        'key': lambda x: _num(x, 'xgi_per_90', 0),
+        'reverse': True,
+        'limit': 15,
+    },
+    # Hidden gems: players from lower leagues with good output
+    'hiddenGems': {
+        'filter': lambda p: (
+            bool(p.get('is_hidden_gem')) and
+            _num(p, 'goals', 0) >= 3 and
+            bool(p.get('tm_verified'))
+        ),
+        'where': "is_hidden_gem AND goals >= 3 AND tm_verified",
+        'order_by': "xgi_per_90 DESC, market_value_eur_m ASC",
+        'key': lambda x: (_num(x, 'xgi_per_90', 0), -_num(x, 'market_value_eur_m', 100)),
+        'reverse': True,
+        'limit': 25,
+    },
+}
+
+def categorize_players(players, names=None, limit=None):
+    """Apply CATEGORIES to a player list -> {category name: ranked players}"""
+    groups = {}
+    for name in names or CATEGORIES:
+        category = CATEGORIES[name]
+        ranked = sorted(
+            [p for p in players if category['filter'](p)],
+            key=category['key'],
+            reverse=category['reverse']
+        )
+        groups[name] = ranked[:limit or category['limit']]
+    return groups
+
+def assign_ids(players):
+    """Number players 1..N in list order"""
     for i, p in enumerate(players):
         p['id'] = i + 1
+    return players
+
+def generate_js(players, output_path, groups=None, rumors=None):
+    """Generate player_data.js (groups: precomputed categorize_players output,
+    rumors: rumor list to join, default the unexpired rumors in rumors.json)"""
+    
+    # Add IDs
+    assign_ids(players)
     
     # Categorize
     tier2_leagues = ['Championship', 'Eredivisie', 'Primeira Liga', 'Belgian Pro League', 
@@ -622,60 +1208,39 @@ def generate_js(players, output_path):
     
     lower_leagues = tier2_leagues + tier3_leagues
     
-    # Only show undervalued if we have verified TM value AND meaningful undervaluation
-    undervalued = sorted(
-        [p for p in players if 
-            p.get('tm_verified', False) and  # Must have real TM value
-            p.get('undervaluation_pct', 0) > 20 and  # Meaningful gap
-            p.get('undervaluation_pct', 0) < 200 and  # Not absurdly high (data error)
-            p.get('goals', 0) >= 3],  # Has actual output
-        key=lambda x: x['undervaluation_pct'],
-        reverse=True
-    )[:20]
-    
-    # Contract expiring soon = bargains
-    expiring_contracts = sorted(
-        [p for p in players if p.get('contract_status') == 'expiring'],
-        key=lambda x: x.get('market_value_eur_m', 0),
-        reverse=True
-    )[:15]
-    
-    top_performers = sorted(
-        [p for p in players if p.get('xgi_per_90', 0) > 0],
-        key=lambda x: x['xgi_per_90'],
-        reverse=True
-    )[:15]
-    
-    rising = sorted(
-        [p for p in players if p.get('age', 30) <= 23 and p.get('goals', 0) > 0],
-        key=lambda x: x['xgi_per_90'],
-        reverse=True
-    )[:15]
-    
-    # Hidden gems: players from lower leagues with good output
-    hidden_gems = sorted(
-        [p for p in players if 
-            p.get('is_hidden_gem', False) and 
-            p.get('goals', 0) >= 3 and
-            p.get('tm_verified', False)],
-        key=lambda x: (x.get('xgi_per_90', 0), -x.get('market_value_eur_m', 100)),
-        reverse=True
-    )[:25]
-    
-    # Best bargains: high value players with expiring contracts
-    bargains = sorted(
-        [p for p in players if 
-            p.get('contract_expiry') and 
-            p.get('contract_expiry') <= 2026 and
-            p.get('market_value_eur_m', 0) >= 20],
-        key=lambda x: x.get('market_value_eur_m', 0),
-        reverse=True
-    )[:15]
+    with METRICS.stage('export:categorize', items=len(players)):
+        groups = groups or categorize_players(players)
+    undervalued = groups['undervalued']
+    expiring_contracts = groups['expiringContracts']
+    bargains = groups['bargains']
+    top_performers = groups['topPerformers']
+    rising = groups['risingStars']
+    hidden_gems = groups['hiddenGems']
     
     # Count unique leagues
     unique_leagues = set(p.get('league') for p in players if p.get('league'))
     
-    js_content = f"""// Auto-generated - {datetime.now().strftime('%Y-%m-%d %H:%M')}
+    # Leagues served from last known good data after a failed fetch
+    stale_leagues = {}
+    for p in players:
+        as_of = p.get('value_as_of') or p.get('stats_as_of')
+        if as_of and p.get('league') not in stale_leagues:
+            stale_leagues[p['league']] = {'asOf': as_of, 'ageHours': age_hours(as_of)}
+
+    # Index every player the client can display
+    with METRICS.stage('export:index'):
+        search_index = build_search_index(unique_players(*groups.values()))
+        # Copies of a player in several groups (e.g. from the pipeline cache) all get rumor_ids
+        rumor_players = join_rumors([p for group in groups.values() for p in group],
+                                    load_rumors() if rumors is None else rumors)
+        
+        views = {name: build_category_views(group) for name, group in groups.items()}
+        sort_index = {name: view['sort'] for name, view in views.items()}
+        facets = {name: view['facets'] for name, view in views.items()}
+
+    # The whole file is built as one string, then written
+    with METRICS.stage('export:render', items=len(players)):
+        js_content = f"""// Auto-generated - {datetime.now().strftime('%Y-%m-%d %H:%M')}
 // Sources: Transfermarkt (values) + Football-Data.org (stats)
 // 25+ Leagues for Hidden Gem Discovery
 // Run: python3 fetch_combined.py --api-key YOUR_KEY
@@ -687,6 +1252,7 @@ const PLAYER_DATA = {{
     updateFrequency: "daily",
     totalPlayers: {len(players)},
     leaguesCovered: {len(unique_leagues)},
+    staleLeagues: {json.dumps(stale_leagues, indent=8, ensure_ascii=False)},
     
     undervalued: {json.dumps(undervalued, indent=8)},
     
@@ -698,28 +1264,58 @@ const PLAYER_DATA = {{
     
     risingStars: {json.dumps(rising, indent=8)},
     
-    hiddenGems: {json.dumps(hidden_gems, indent=8)}
+    hiddenGems: {json.dumps(hidden_gems, indent=8)},
+
+    searchIndex: {json.dumps(search_index, separators=(',', ':'))},
+
+    sortIndex: {json.dumps(sort_index, separators=(',', ':'))},
+
+    rumorPlayers: {json.dumps(rumor_players, separators=(',', ':'), ensure_ascii=False)},
+
+    facets: {json.dumps(facets, separators=(',', ':'), ensure_ascii=False)}
 }};
 
 if (typeof module !== 'undefined') {{
     module.exports = PLAYER_DATA;
 }}
 """
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(js_content)
+        
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(js_content)
     
     print(f"\n✅ Generated {output_path}")
     print(f"   📊 {len(undervalued)} undervalued")
     print(f"   ⚡ {len(top_performers)} top performers")
     print(f"   🌟 {len(rising)} rising stars")
     print(f"   💎 {len(hidden_gems)} hidden gems")
+    if rumor_players:
+        print(f"   📰 {len(rumor_players)} rumors linked to players")
+    if stale_leagues:
+        print(f"   ⏳ {len(stale_leagues)} leagues from cached data: {', '.join(stale_leagues)}")
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--api-key', help='Football-Data.org API key')
+    parser.add_argument('--snapshot-db', help='SQLite snapshot store (default: data/snapshots.db)')
+    parser.add_argument('--no-snapshot', action='store_true', help='Do not record this run in the snapshot store')
+    parser.add_argument('--series-dir', help='Market value time series (default: data/timeseries)')
+    parser.add_argument('--no-series', action='store_true', help='Do not append this run to the value time series')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted Transfermarkt fetch')
+    parser.add_argument('--dry-run', action='store_true', help='Print the Football-Data.org quota plan and exit')
+    parser.add_argument('--full', action='store_true',
+                        help=f'Full Football-Data.org scorer listings (up to {FD_FULL_PAGES * FD_PAGE_SIZE} per league) '
+                             f'instead of the top {FD_TOP_SCORERS}')
+    parser.add_argument('--revalidate-wait', type=int, default=60,
+                        help='Seconds to wait for failed leagues retrying in the background before finishing')
+    parser.add_argument('--metrics-dir', help='Write scoutlens.prom + run_report.json for this run here')
+    add_profile_args(parser)
+    add_memtrace_args(parser)
     args = parser.parse_args()
     
+    if args.dry_run:
+        print_plan(QuotaPlanner('football-data'), fd_plan_units(args.full), FD_LIMITER.interval)
+        return
+    
     api_key = args.api_key or os.environ.get('FOOTBALL_DATA_KEY')
     
     if not api_key:
@@ -727,22 +1323,57 @@ def main():
         print("   Usage: python3 fetch_combined.py --api-key YOUR_KEY")
         sys.exit(1)
     
+    with profiling(args, 'combined'), memtracing(args, 'combined'):
+        run(args, api_key)
+
+def run(args, api_key):
+    """Fetch, merge and export one combined run (main after argument checks)"""
     print("🔭 ScoutLens - Combined Data Fetcher")
     print("=" * 50)
     print(f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
+    METRICS.reset('combined')
     
-    # 1. Get TM values
-    tm_values = fetch_transfermarkt_values()
-    
-    # 2. Get FD stats
-    fd_stats = fetch_football_data_stats(api_key)
+    # 1+2. Get TM values and FD stats concurrently (different hosts, separate limiters)
+    pool = ThreadPoolExecutor(max_workers=2)
+    revalidator = Revalidator()
+    try:
+        tm_future = pool.submit(METRICS.call, 'fetch:transfermarkt', fetch_transfermarkt_values,
+                                args.resume, revalidator)
+        fd_future = pool.submit(METRICS.call, 'fetch:football-data', fetch_football_data_stats, api_key,
+                                full=args.full)
+        tm_values = tm_future.result()
+        fd_stats = fd_future.result()
+    except KeyboardInterrupt:
+        print("\n⏸️  Interrupted - rerun with --resume to continue")
+        # Don't wait for the fetch threads; the journal survives a torn write
+        os._exit(130)
+    pool.shutdown()
     
-    # 3. Merge
+    # 3. Merge and generate right away, with cached data for any failed league
+    output_path = os.path.join(os.path.dirname(__file__), 'player_data.js')
     players = merge_data(tm_values, fd_stats)
+    with METRICS.stage('export', items=len(players)):
+        generate_js(players, output_path)
     
-    # 4. Generate JS
-    output_path = os.path.join(os.path.dirname(__file__), 'player_data.js')
-    generate_js(players, output_path)
+    # 3b. Leagues still retrying in the background: regenerate if they come back in time
+    pending = revalidator.pending()
+    if pending:
+        print(f"\n🔁 Waiting up to {args.revalidate_wait}s for {len(pending)} leagues retrying in the background...")
+    refreshed = revalidator.wait(args.revalidate_wait if pending else 0)
+    if refreshed:
+        print(f"   ✓ Refreshed {len(refreshed)} leagues, regenerating")
+        tm_values = apply_revalidated(tm_values, refreshed)
+        players = merge_data(tm_values, fd_stats)
+        with METRICS.stage('export', items=len(players)):
+            generate_js(players, output_path)
+    
+    # 4. Keep history of this run
+    if not args.no_snapshot:
+        from snapshot_store import DEFAULT_DB_PATH, record_snapshot
+        record_snapshot(players, 'combined', args.snapshot_db or DEFAULT_DB_PATH)
+    if not args.no_series:
+        from value_series import DEFAULT_SERIES_DIR, append_run
+        append_run(players, args.series_dir or DEFAULT_SERIES_DIR)
     
     print(f"\n📈 Total: {len(players)} players")
     
@@ -750,6 +1381,9 @@ def main():
     print("\n📋 Sample (with stats + values):")
     for p in sorted(players, key=lambda x: x.get('xgi_per_90', 0), reverse=True)[:5]:
         print(f"   {p['name']}: €{p['market_value_eur_m']}M | {p['goals']}G {p['assists']}A | xGI/90: {p['xgi_per_90']}")
+    
+    if args.metrics_dir:
+        METRICS.write(args.metrics_dir)
 
 if __name__ == '__main__':
     main()
@@ -8,12 +8,18 @@ Usage:
     python3 fetch_fbref.py
 """
 
+import argparse
 import json
 import time
 import re
 from datetime import datetime
 from pathlib import Path
 
+from metrics import METRICS
+from memtrace import add_memtrace_args, memtracing
+from profiling import add_profile_args, profiling
+from search_index import build_search_index, unique_players
+
 try:
     import requests
     from bs4 import BeautifulSoup
@@ -244,6 +250,8 @@ def generate_js(all_players: list, output_path: str):
         reverse=True
     )[:15]
     
+    search_index = build_search_index(unique_players(undervalued, top_performers, rising))
+    
     js_content = f"""// Auto-generated player data - {datetime.now().strftime('%Y-%m-%d %H:%M')}
 // Source: FBref (fbref.com) - Current 2024-25 Season
 // Run: python3 fetch_fbref.py
@@ -258,7 +266,9 @@ const PLAYER_DATA = {{
     
     topPerformers: {json.dumps(top_performers, indent=8)},
     
-    risingStars: {json.dumps(rising, indent=8)}
+    risingStars: {json.dumps(rising, indent=8)},
+    
+    searchIndex: {json.dumps(search_index, separators=(',', ':'))}
 }};
 
 if (typeof module !== 'undefined') {{
@@ -275,6 +285,15 @@ if (typeof module !== 'undefined') {{
     print(f"   🌟 {len(rising)} rising stars (U23)")
 
 def main():
+    parser = argparse.ArgumentParser(description='Fetch current season stats from FBref')
+    add_profile_args(parser)
+    add_memtrace_args(parser)
+    args = parser.parse_args()
+    
+    with profiling(args, 'fbref'), memtracing(args, 'fbref'):
+        run()
+
+def run():
     print("🔭 ScoutLens - FBref Data Fetcher")
     print("=" * 50)
     print("📅 Fetching CURRENT 2024-25 season data (FREE!)")
@@ -284,7 +303,7 @@ def main():
     
     for league_name, league_info in LEAGUES.items():
         print(f"📡 Fetching {league_name}...")
-        players = fetch_league_stats(league_name, league_info)
+        players = METRICS.call('fetch:fbref', fetch_league_stats, league_name, league_info)
         
         if players:
             all_players.extend(players)
@@ -297,7 +316,8 @@ def main():
     
     if all_players:
         output_path = Path(__file__).parent / 'player_data.js'
-        generate_js(all_players, str(output_path))
+        with METRICS.stage('export', items=len(all_players)):
+            generate_js(all_players, str(output_path))
         
         print(f"\n📈 Total: {len(all_players)} players from Big 5 leagues")
     else:
@@ -11,16 +11,23 @@ Get your FREE API key:
 
 Usage:
     python3 fetch_footballdata.py --api-key YOUR_KEY
+    python3 fetch_footballdata.py --api-key YOUR_KEY --full   # Full scorer listings
 """
 
 import os
 import json
 import argparse
+import urllib.error
 import urllib.request
 import time
 from datetime import datetime
 from pathlib import Path
 
+from metrics import METRICS
+from memtrace import add_memtrace_args, memtracing
+from profiling import add_profile_args, profiling
+from search_index import build_search_index, unique_players
+
 # League codes for football-data.org (free tier covers these)
 # BIG 5 LEAGUES
 TIER1_LEAGUES = {
@@ -119,10 +126,8 @@ def calculate_age(date_of_birth: str) -> int:
     except:
         return 25
 
-def fetch_scorers(api_key: str, league_code: str) -> list:
-    """Fetch top scorers from a league"""
-    url = f"https://api.football-data.org/v4/competitions/{league_code}/scorers?limit=30"
-    
+def _get_scorers(api_key: str, url: str):
+    """One scorers request -> list, or None if it failed"""
     req = urllib.request.Request(url, headers={
         'X-Auth-Token': api_key
     })
@@ -134,10 +139,37 @@ def fetch_scorers(api_key: str, league_code: str) -> list:
     except urllib.error.HTTPError as e:
         error_body = e.read().decode() if e.fp else ''
         print(f"  ⚠️ HTTP {e.code}: {error_body[:100]}")
-        return []
+        return None
     except Exception as e:
         print(f"  ⚠️ Error: {e}")
-        return []
+        return None
+
+def fetch_scorers(api_key: str, league_code: str, full: bool = False) -> list:
+    """Fetch top scorers from a league
+    
+    full: page through the whole scorers listing (up to FD_FULL_PAGES pages
+          of FD_PAGE_SIZE), stopping at a short or repeated page
+    """
+    # Shared with fetch_combined's scorer fetches; imported here so loading this script stays light
+    from fetch_combined import FD_FULL_PAGES, FD_PAGE_SIZE, scorers_url
+    
+    if not full:
+        return _get_scorers(api_key, scorers_url(league_code)) or []
+    
+    scorers, seen = [], set()
+    for page in range(FD_FULL_PAGES):
+        if page:
+            time.sleep(6)  # Same free-tier spacing as between leagues
+        rows = _get_scorers(api_key, scorers_url(league_code, FD_PAGE_SIZE, page * FD_PAGE_SIZE))
+        if not rows:
+            break
+        key = lambda r: r.get('player', {}).get('id') or r.get('player', {}).get('name')
+        new = [r for r in rows if key(r) not in seen]
+        seen.update(key(r) for r in new)
+        scorers.extend(new)
+        if len(rows) < FD_PAGE_SIZE or not new:
+            break
+    return scorers
 
 def process_scorer(scorer: dict, league_info: dict) -> dict:
     """Process scorer data into our format"""
@@ -274,6 +306,8 @@ def generate_js(all_players: list, output_path: str):
         reverse=True
     )[:20]
     
+    search_index = build_search_index(unique_players(undervalued, top_performers, rising, hidden_gems))
+    
     js_content = f"""// Auto-generated player data - {datetime.now().strftime('%Y-%m-%d %H:%M')}
 // Source: Football-Data.org - Current 2024-25 Season (FREE!)
 // Leagues: PL, La Liga, Bundesliga, Serie A, Ligue 1, Championship, Eredivisie, Portugal, Brazil
@@ -293,7 +327,9 @@ const PLAYER_DATA = {{
     
     risingStars: {json.dumps(rising, indent=8)},
     
-    hiddenGems: {json.dumps(hidden_gems, indent=8)}
+    hiddenGems: {json.dumps(hidden_gems, indent=8)},
+    
+    searchIndex: {json.dumps(search_index, separators=(',', ':'))}
 }};
 
 if (typeof module !== 'undefined') {{
@@ -313,6 +349,9 @@ if (typeof module !== 'undefined') {{
 def main():
     parser = argparse.ArgumentParser(description='Fetch from football-data.org')
     parser.add_argument('--api-key', type=str, help='Football-data.org API key')
+    parser.add_argument('--full', action='store_true', help='Page through the full scorer listings, not just the top 30')
+    add_profile_args(parser)
+    add_memtrace_args(parser)
     args = parser.parse_args()
     
     api_key = args.api_key or os.environ.get('FOOTBALL_DATA_KEY')
@@ -330,6 +369,10 @@ def main():
         print("  python3 fetch_footballdata.py --api-key YOUR_KEY")
         return
     
+    with profiling(args, 'footballdata'), memtracing(args, 'footballdata'):
+        run(api_key, args.full)
+
+def run(api_key, full=False):
     print("🔭 ScoutLens - Football-Data.org Fetcher")
     print("=" * 50)
     print("📅 Current 2024-25 Season (FREE!)")
@@ -339,10 +382,12 @@ def main():
     
     for league_code, league_info in LEAGUES.items():
         print(f"📡 Fetching {league_info['name']}...")
-        scorers = fetch_scorers(api_key, league_code)
+        scorers = METRICS.call('fetch:football-data', fetch_scorers, api_key, league_code, full)
         
         if scorers:
-            players = [process_scorer(s, league_info) for s in scorers]
+            with METRICS.stage('process') as rec:
+                players = [process_scorer(s, league_info) for s in scorers]
+                rec['items'] = len(players)
             all_players.extend(players)
             print(f"   ✓ {len(players)} players")
         else:
@@ -352,7 +397,8 @@ def main():
     
     if all_players:
         output_path = Path(__file__).parent / 'player_data.js'
-        generate_js(all_players, str(output_path))
+        with METRICS.stage('export', items=len(all_players)):
+            generate_js(all_players, str(output_path))
         print(f"\n📈 Total: {len(all_players)} players")
     else:
         print("\n❌ No data fetched")
@@ -10,6 +10,15 @@ import time
 from datetime import datetime
 import os
 import sys
+import argparse
+
+from checkpoint import Journal
+from json_stream import ACCEPT_ENCODING, iter_json_items, read_body
+from metrics import METRICS
+from memtrace import add_memtrace_args, memtracing
+from profiling import add_profile_args, profiling
+from search_index import build_search_index, unique_players
+from single_flight import HTTP_FLIGHTS
 
 # Free Transfermarkt API (no key needed)
 TM_API_BASE = "https://transfermarkt-api.fly.dev"
@@ -26,16 +35,27 @@ LEAGUES = {
     'PO1': {'name': 'Primeira Liga', 'multiplier': 0.65},
 }
 
-def fetch_json(url):
-    """Fetch JSON from URL"""
+def fetch_json(url, key=None):
+    """Fetch JSON from URL (shared with other callers of the same URL, see single_flight.py)
+    
+    key: top-level array to stream element by element (iter_json_items), e.g. a squad's 'players'
+    """
+    return HTTP_FLIGHTS.do(url, _fetch_json, url, key)
+
+def _fetch_json(url, key=None):
     headers = {
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)',
         'Accept': 'application/json',
+        'Accept-Encoding': ACCEPT_ENCODING,
     }
     req = urllib.request.Request(url, headers=headers)
     try:
         with urllib.request.urlopen(req, timeout=30) as response:
-            return json.loads(response.read().decode('utf-8'))
+            if key is None:
+                return json.loads(b''.join(read_body(response)))
+            meta = {}
+            items = list(iter_json_items(read_body(response), key, meta))
+            return {**meta, key: items}
     except Exception as e:
         print(f"  ⚠️ Error: {e}")
         return None
@@ -92,7 +112,7 @@ def fetch_league_top_scorers(league_id):
             
         # Fetch club players
         players_url = f"{TM_API_BASE}/clubs/{club_id}/players"
-        players_data = fetch_json(players_url)
+        players_data = fetch_json(players_url, key='players')
         
         if players_data and 'players' in players_data:
             for p in players_data['players'][:15]:  # Top 15 per club
@@ -111,9 +131,10 @@ def fetch_league_top_scorers(league_id):
     
     return players
 
-def fetch_all_players():
-    """Fetch players from all leagues"""
+def fetch_all_players(resume=False):
+    """Fetch players from all leagues (resume: skip clubs/leagues done by an interrupted run)"""
     all_players = []
+    journal = Journal('transfermarkt_players', resume)
     
     print("🔭 Fetching REAL Transfermarkt Values")
     print("=" * 50)
@@ -123,26 +144,38 @@ def fetch_all_players():
     for league_id, league_info in LEAGUES.items():
         print(f"📡 Fetching {league_info['name']}...")
         
+        if journal.done(league_id):
+            all_players.extend(journal.get(league_id))
+            print(f"   ✓ {len(journal.get(league_id))} players (resumed)")
+            continue
+        
         # Try to get top scorers first
         url = f"{TM_API_BASE}/competitions/{league_id}/clubs"
         data = fetch_json(url)
         
         if data and 'clubs' in data:
             league_players = []
+            complete = True
             
             for club in data.get('clubs', [])[:8]:  # Top 8 clubs
                 club_id = club.get('id')
                 club_name = club.get('name', 'Unknown')
+                unit = f"{league_id}/{club_id}"
+                
+                if journal.done(unit):
+                    league_players.extend(journal.get(unit))
+                    continue
                 
                 # Get club squad
                 squad_url = f"{TM_API_BASE}/clubs/{club_id}/players"
-                squad_data = fetch_json(squad_url)
+                squad_data = fetch_json(squad_url, key='players')
                 
                 if squad_data and 'players' in squad_data:
+                    club_players = []
                     for p in squad_data['players']:
                         mv = parse_market_value(p.get('marketValue'))
                         if mv and mv >= 1:  # Only players worth €1M+
-                            league_players.append({
+                            club_players.append({
                                 'name': p.get('name', 'Unknown'),
                                 'team': club_name,
                                 'league': league_info['name'],
@@ -151,18 +184,25 @@ def fetch_all_players():
                                 'position': p.get('position', 'Forward')[0] if p.get('position') else 'F',
                                 'nationality': p.get('nationality', ''),
                             })
+                    league_players.extend(club_players)
+                    journal.record(unit, club_players)
+                else:
+                    complete = False  # Not journaled, so --resume retries this club
                 
                 time.sleep(0.3)  # Rate limit
             
             # Sort by market value and take top 30
             league_players.sort(key=lambda x: x['market_value_eur_m'], reverse=True)
             all_players.extend(league_players[:30])
+            if complete:
+                journal.record(league_id, league_players[:30])
             print(f"   ✓ {len(league_players[:30])} players")
         else:
             print(f"   ⚠️ Failed")
         
         time.sleep(1)  # Rate limit between leagues
     
+    journal.finish()
     return all_players
 
 def calculate_fair_values(players):
@@ -230,6 +270,8 @@ def generate_player_data_js(players, output_path):
         reverse=True
     )[:20]
     
+    search_index = build_search_index(unique_players(undervalued, top_value, rising, hidden_gems))
+    
     js_content = f"""// Auto-generated - REAL Transfermarkt values - {datetime.now().strftime('%Y-%m-%d %H:%M')}
 // Source: Transfermarkt via API
 // Run: python3 fetch_transfermarkt.py
@@ -248,7 +290,9 @@ const PLAYER_DATA = {{
     
     risingStars: {json.dumps(rising, indent=8)},
     
-    hiddenGems: {json.dumps(hidden_gems, indent=8)}
+    hiddenGems: {json.dumps(hidden_gems, indent=8)},
+    
+    searchIndex: {json.dumps(search_index, separators=(',', ':'))}
 }};
 
 if (typeof module !== 'undefined') {{
@@ -268,21 +312,36 @@ if (typeof module !== 'undefined') {{
     return True
 
 def main():
+    parser = argparse.ArgumentParser(description='Fetch real Transfermarkt values')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted fetch')
+    add_profile_args(parser)
+    add_memtrace_args(parser)
+    args = parser.parse_args()
+    
+    with profiling(args, 'transfermarkt'), memtracing(args, 'transfermarkt'):
+        run(args)
+
+def run(args):
     print()
     
     # Fetch all players with real TM values
-    players = fetch_all_players()
+    try:
+        players = METRICS.call('fetch:transfermarkt', fetch_all_players, args.resume)
+    except KeyboardInterrupt:
+        print("\n⏸️  Interrupted - rerun with --resume to continue")
+        sys.exit(130)
     
     if not players:
         print("❌ No players fetched. Using fallback...")
         sys.exit(1)
     
     # Calculate fair values
-    players = calculate_fair_values(players)
+    players = METRICS.call('fair_values', calculate_fair_values, players)
     
     # Generate output
     output_path = os.path.join(os.path.dirname(__file__), 'player_data.js')
-    generate_player_data_js(players, output_path)
+    with METRICS.stage('export', items=len(players)):
+        generate_player_data_js(players, output_path)
     
     print(f"\n📈 Total: {len(players)} players with REAL Transfermarkt values")
     
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - Fetch Job Queue
+Splits a fetch into small units that any number of worker processes claim
+with a lease, retry on failure and store results for a single reducer:
+
+    tm_clubs   {tm_id}                         Club list -> enqueues tm_squad units
+    tm_squad   {tm_id, club_id, club_name}     One club's squad values
+    fd_league  {code, season}                  One competition's scorers
+
+Each worker paces its own requests. With a multi-machine backend, workers on
+several IPs would scale past one box's per-IP limits. The reducer merges
+finished results with merge_data and writes player_data.js.
+
+Backends are pluggable: SQLiteQueue (the default, sqlite:///path) is for
+workers on one machine only - WAL-mode SQLite is not safe on a network
+filesystem. No multi-machine backend ships yet; one would register a
+QueueBackend subclass with register_backend().
+
+Usage:
+    python3 job_queue.py enqueue --seasons 2023,2024      # Today's run
+    python3 job_queue.py work                               # Run in each worker process
+    python3 job_queue.py work --drain                       # Exit when nothing is left
+    python3 job_queue.py status
+    python3 job_queue.py reduce --season 2024
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import sys
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from pathlib import Path
+
+from fetch_combined import (
+    FD_LEAGUES, TM_LEAGUES, fd_priority, fetch_club_values, fetch_league_clubs, fetch_league_stats, generate_js,
+    merge_data,
+)
+
+DEFAULT_QUEUE_URL = f"sqlite:///{Path(__file__).parent / 'jobs.db'}"
+
+LEASE_S = 300
+MAX_ATTEMPTS = 4
+RETRY_BASE_S = 30  # Doubles per failed attempt
+
+class QueueBackend(ABC):
+    """Storage for jobs and their results. Subclass and register_backend() to add one."""
+
+    @abstractmethod
+    def enqueue(self, run, kind, payload, priority=5, max_attempts=MAX_ATTEMPTS):
+        """Add a unit unless the run already has it -> True if added"""
+
+    @abstractmethod
+    def claim(self, worker, lease_s=LEASE_S):
+        """Lease the next available unit (or one whose lease expired) -> job dict or None
+
+        An expired lease on a unit's last attempt marks the unit failed instead.
+        """
+
+    @abstractmethod
+    def complete(self, job, result):
+        """Store a unit's result if the worker still holds its lease -> True if stored"""
+
+    @abstractmethod
+    def fail(self, job, error):
+        """Release a unit for retry after backoff, or mark it failed after max_attempts
+        -> 'retry', 'failed', or None if the worker no longer holds the lease (nothing changed)
+        """
+
+    @abstractmethod
+    def results(self, run, kind):
+        """[(payload, result)] of finished units, in enqueue order"""
+
+    @abstractmethod
+    def counts(self, run):
+        """{status: count} for a run"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    last_error TEXT,
+    UNIQUE (run, key)
+);
+
+CREATE TABLE IF NOT EXISTS results (
+    job_id INTEGER PRIMARY KEY REFERENCES jobs(id),
+    result TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    finished_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, priority, available_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_run_kind ON jobs (run, kind, status);
+"""
+
+class SQLiteQueue(QueueBackend):
+    """Queue in one SQLite file; claims are serialized with BEGIN IMMEDIATE"""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def enqueue(self, run, kind, payload, priority=5, max_attempts=MAX_ATTEMPTS):
+        key = f"{kind}:{json.dumps(payload, sort_keys=True)}"
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO jobs (run, kind, key, payload, priority, max_attempts, available_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (run, kind, key, json.dumps(payload), priority, max_attempts, time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def claim(self, worker, lease_s=LEASE_S):
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # A worker that died holding its last attempt's lease used up the unit
+            self.conn.execute(
+                "UPDATE jobs SET status = 'failed', last_error = 'lease expired on the last attempt', "
+                "lease_owner = NULL, lease_expires = NULL "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts",
+                (now,),
+            )
+            row = self.conn.execute(
+                "SELECT * FROM jobs WHERE (status = 'pending' AND available_at <= ?) "
+                "OR (status = 'leased' AND lease_expires < ? AND attempts < max_attempts) "
+                "ORDER BY priority, id LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row:
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    (worker, now + lease_s, row['id']),
+                )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        if not row:
+            return None
+        job = dict(row)
+        job['payload'] = json.loads(job['payload'])
+        job['attempts'] += 1
+        job['lease_owner'] = worker
+        return job
+
+    def complete(self, job, result):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Only the current lease holder may finish the unit
+            updated = self.conn.execute(
+                "UPDATE jobs SET status = 'done', lease_owner = NULL, lease_expires = NULL "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (job['id'], job['lease_owner']),
+            ).rowcount
+            if updated:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO results (job_id, result, worker, finished_at) VALUES (?, ?, ?, ?)",
+                    (job['id'], json.dumps(result, ensure_ascii=False), job['lease_owner'], datetime.now().isoformat()),
+                )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return bool(updated)
+
+    def fail(self, job, error):
+        exhausted = job['attempts'] >= job['max_attempts']
+        updated = self.conn.execute(
+            "UPDATE jobs SET status = ?, available_at = ?, last_error = ?, lease_owner = NULL, lease_expires = NULL "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            ('failed' if exhausted else 'pending', time.time() + RETRY_BASE_S * 2 ** (job['attempts'] - 1),
+             str(error)[:500], job['id'], job['lease_owner']),
+        ).rowcount
+        if not updated:
+            return None
+        return 'failed' if exhausted else 'retry'
+
+    def results(self, run, kind):
+        rows = self.conn.execute(
+            "SELECT j.payload, r.result FROM jobs j JOIN results r ON r.job_id = j.id "
+            "WHERE j.run = ? AND j.kind = ? AND j.status = 'done' ORDER BY j.id",
+            (run, kind),
+        )
+        return [(json.loads(payload), json.loads(result)) for payload, result in rows]
+
+    def counts(self, run):
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM jobs WHERE run = ? GROUP BY status", (run,))
+        return dict(rows.fetchall())
+
+BACKENDS = {'sqlite': lambda location: SQLiteQueue(location)}
+
+def register_backend(scheme, factory):
+    """Make scheme://location URLs open with factory(location)"""
+    BACKENDS[scheme] = factory
+
+def open_queue(url=DEFAULT_QUEUE_URL):
+    """Open a queue from scheme://location (a bare path means SQLite)"""
+    scheme, sep, location = url.partition('://')
+    if not sep:
+        return SQLiteQueue(url)
+    if scheme not in BACKENDS:
+        raise ValueError(f"Unknown queue backend: {scheme} (have {', '.join(BACKENDS)})")
+    return BACKENDS[scheme](location)
+
+# ============================================
+# UNITS
+# ============================================
+
+def enqueue_run(queue, run, seasons=None, leagues=None, stats=True):
+    """Enqueue the top-level units of one run -> number added"""
+    added = 0
+    for tm_id, info in TM_LEAGUES.items():
+        if leagues and tm_id not in leagues:
+            continue
+        added += queue.enqueue(run, 'tm_clubs', {'tm_id': tm_id}, priority=info['tier'])
+    if stats:
+        for season in seasons or [None]:
+            for code in FD_LEAGUES:
+                added += queue.enqueue(run, 'fd_league', {'code': code, 'season': season}, priority=fd_priority(code))
+    return added
+
+def handle_tm_clubs(queue, job):
+    tm_id = job['payload']['tm_id']
+    clubs = fetch_league_clubs(tm_id)
+    if clubs is None:
+        raise RuntimeError(f"club list failed for {tm_id}")
+    # Fan out: one unit per squad, so several workers can share a league
+    for club in clubs:
+        queue.enqueue(job['run'], 'tm_squad', {'tm_id': tm_id, 'club_id': club['id'], 'club_name': club['name']},
+                      priority=TM_LEAGUES[tm_id]['tier'])
+    return clubs
+
+def handle_tm_squad(queue, job):
+    p = job['payload']
+    values = fetch_club_values(p['club_id'], p['club_name'], TM_LEAGUES[p['tm_id']])
+    if values is None:
+        raise RuntimeError(f"squad failed for club {p['club_id']}")
+    return values
+
+def handle_fd_league(queue, job):
+    api_key = os.environ.get('FOOTBALL_DATA_KEY')
+    if not api_key:
+        raise RuntimeError("FOOTBALL_DATA_KEY is not set on this worker")
+    p = job['payload']
+    stats = fetch_league_stats(p['code'], FD_LEAGUES[p['code']], api_key, season=p['season'])
+    if stats is None:
+        raise RuntimeError(f"scorers failed for {p['code']} {p['season']}")
+    return stats
+
+HANDLERS = {
+    'tm_clubs': handle_tm_clubs,
+    'tm_squad': handle_tm_squad,
+    'fd_league': handle_fd_league,
+}
+
+def work(queue, worker=None, lease_s=LEASE_S, drain=False, poll_s=5):
+    """Claim and run units until stopped (or until the queue is empty with drain) -> units done"""
+    worker = worker or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:4]}"
+    done = 0
+    while True:
+        job = queue.claim(worker, lease_s)
+        if not job:
+            if drain:
+                return done
+            time.sleep(poll_s)
+            continue
+
+        label = f"{job['kind']} {json.dumps(job['payload'], ensure_ascii=False)}"
+        try:
+            result = HANDLERS[job['kind']](queue, job)
+        except Exception as e:
+            outcome = queue.fail(job, e)
+            note = {'retry': '', 'failed': ' - giving up'}.get(outcome, ' - lease lost, left to its new holder')
+            print(f"   ⚠️ {label} (attempt {job['attempts']}): {e}{note}")
+            continue
+        if queue.complete(job, result):
+            done += 1
+            print(f"   ✓ {label}")
+        else:
+            print(f"   ⚠️ {label}: lease lost, result discarded")
+
+def reduce_run(queue, run, season=None):
+    """Merge a run's finished results -> (tm_values, fd_stats)"""
+    tm_values = {}
+    league_order = list(TM_LEAGUES)
+    squads = queue.results(run, 'tm_squad')
+    for payload, values in sorted(squads, key=lambda item: league_order.index(item[0]['tm_id'])):
+        tm_values.update(values)
+
+    fd_stats = {}
+    fd_order = list(FD_LEAGUES)
+    leagues = [(p, r) for p, r in queue.results(run, 'fd_league') if p['season'] == season]
+    for payload, stats in sorted(leagues, key=lambda item: fd_order.index(item[0]['code'])):
+        fd_stats.update(stats)
+    return tm_values, fd_stats
+
+def main():
+    parser = argparse.ArgumentParser(description='ScoutLens fetch job queue')
+    parser.add_argument('--queue', type=str, default=os.environ.get('SCOUTLENS_QUEUE', DEFAULT_QUEUE_URL),
+                        help='Queue URL (default: sqlite:///data/jobs.db, or SCOUTLENS_QUEUE)')
+    parser.add_argument('--run', type=str, default=date.today().isoformat(), help='Run tag (default: today)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    enqueue = sub.add_parser('enqueue', help='Add the units of a run')
+    enqueue.add_argument('--seasons', type=str, help='Comma-separated Football-Data.org seasons (default: current)')
+    enqueue.add_argument('--leagues', type=str, help='Comma-separated TM league IDs (default: all)')
+    enqueue.add_argument('--no-stats', action='store_true', help='Only Transfermarkt units')
+
+    worker = sub.add_parser('work', help='Claim and run units')
+    worker.add_argument('--worker-id', type=str)
+    worker.add_argument('--lease', type=int, default=LEASE_S, help='Lease length in seconds')
+    worker.add_argument('--drain', action='store_true', help='Exit once nothing is claimable')
+
+    sub.add_parser('status', help='Unit counts for the run')
+
+    reducer = sub.add_parser('reduce', help='Merge finished results into player_data.js')
+    reducer.add_argument('--season', type=str, help='Football-Data.org season to merge (default: current)')
+    reducer.add_argument('--output', type=str, default=str(Path(__file__).parent / 'player_data.js'))
+    reducer.add_argument('--snapshot-db', type=str, help='Also record the merged run in this snapshot store')
+    args = parser.parse_args()
+
+    queue = open_queue(args.queue)
+
+    if args.command == 'enqueue':
+        seasons = [s.strip() for s in args.seasons.split(',')] if args.seasons else None
+        leagues = [l.strip() for l in args.leagues.split(',')] if args.leagues else None
+        added = enqueue_run(queue, args.run, seasons, leagues, not args.no_stats)
+        print(f"📥 Enqueued {added} units for run {args.run}")
+
+    elif args.command == 'work':
+        print(f"👷 Working on {args.queue}")
+        try:
+            done = work(queue, args.worker_id, args.lease, args.drain)
+            print(f"\n✅ {done} units done")
+        except KeyboardInterrupt:
+            # The leased unit is picked up by another worker once its lease expires
+            print("\n⏹️  Worker stopped")
+
+    elif args.command == 'status':
+        counts = queue.counts(args.run)
+        print(f"📊 Run {args.run}: " + (', '.join(f"{n} {s}" for s, n in sorted(counts.items())) or 'empty'))
+
+    elif args.command == 'reduce':
+        counts = queue.counts(args.run)
+        unfinished = counts.get('pending', 0) + counts.get('leased', 0)
+        if unfinished:
+            print(f"⚠️  {unfinished} units still unfinished - merging what is done")
+        tm_values, fd_stats = reduce_run(queue, args.run, args.season)
+        if not tm_values or not fd_stats:
+            print("❌ Need finished Transfermarkt and Football-Data.org units to merge")
+            sys.exit(1)
+        players = merge_data(tm_values, fd_stats)
+        if args.snapshot_db:
+            from snapshot_store import record_snapshot
+            record_snapshot(players, 'queue', args.snapshot_db)
+        generate_js(players, args.output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - Compressed, Streamed Response Bodies
+Helpers for fetch_json (fetch_combined.py):
+
+    ACCEPT_ENCODING     gzip, deflate, and br when the brotli package is installed
+    read_body()         Decompressed body chunks of an HTTP response, decoded
+                        as they arrive instead of after the whole body is read
+    iter_json_items()   Elements of one top-level array in a JSON object,
+                        parsed one at a time from body chunks, so a large
+                        squad or scorers payload never exists as one bytes,
+                        one str and one parsed object at the same time
+"""
+
+import codecs
+import http.client
+import json
+import re
+import zlib
+
+try:
+    import brotli  # Optional: pip install brotli
+except ImportError:
+    brotli = None
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if brotli else 'gzip, deflate'
+
+# Errors of a corrupt compressed body
+_DECODE_ERRORS = (zlib.error, brotli.error) if brotli else (zlib.error,)
+
+# Bytes read from the socket at a time
+READ_CHUNK = 64 * 1024
+
+class _DeflateDecoder:
+    """'deflate' is zlib-wrapped per the RFC, but some servers send raw deflate"""
+
+    def __init__(self):
+        self._zlib = zlib.decompressobj()
+        self._started = False
+
+    def decompress(self, data):
+        if not self._started:
+            self._started = True
+            try:
+                return self._zlib.decompress(data)
+            except zlib.error:
+                self._zlib = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._zlib.decompress(data)
+
+    def flush(self):
+        return self._zlib.flush()
+
+class _BrotliDecoder:
+    def __init__(self):
+        self._brotli = brotli.Decompressor()
+
+    def decompress(self, data):
+        return self._brotli.process(data)
+
+    def flush(self):
+        return b''
+
+def decoder_for(content_encoding):
+    """Streaming decompressor for a Content-Encoding header, None for identity
+
+    Raises ValueError for an encoding we did not offer.
+    """
+    encoding = (content_encoding or 'identity').strip().lower()
+    if encoding in ('identity', ''):
+        return None
+    if encoding in ('gzip', 'x-gzip'):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        return _DeflateDecoder()
+    if encoding == 'br' and brotli:
+        return _BrotliDecoder()
+    raise ValueError(f"Unsupported Content-Encoding: {content_encoding}")
+
+def read_body(response, counter=None, chunk_size=READ_CHUNK):
+    """Yield the decompressed body of an HTTP response chunk by chunk
+
+    counter: dict whose 'wire_bytes' is increased by the bytes actually received
+    Raises ValueError for a body that is cut off or fails to decompress, OSError
+    for a dropped connection.
+    """
+    decoder = decoder_for(response.headers.get('Content-Encoding'))
+    try:
+        while True:
+            chunk = response.read(chunk_size)
+            if not chunk:
+                break
+            if counter is not None:
+                counter['wire_bytes'] = counter.get('wire_bytes', 0) + len(chunk)
+            data = decoder.decompress(chunk) if decoder else chunk
+            if data:
+                yield data
+        if decoder:
+            tail = decoder.flush()
+            if tail:
+                yield tail
+    except (http.client.HTTPException, *_DECODE_ERRORS) as e:
+        raise ValueError(f"Unreadable response body: {e!r}") from e
+
+# ============================================
+# INCREMENTAL JSON
+# ============================================
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+_NUMBER_CHARS = set('0123456789.eE+-')
+
+class _TextBuffer:
+    """UTF-8 text from byte chunks, consumed from the front"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.exhausted = False
+
+    def more(self):
+        """Append the next chunk; False once the body is exhausted"""
+        if self.exhausted:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.exhausted = True
+            self.text += self._utf8.decode(b'', final=True)
+            return False
+        # Drop what was consumed so the buffer stays the size of a chunk or two
+        self.text = self.text[self.pos:] + self._utf8.decode(chunk)
+        self.pos = 0
+        return True
+
+    def skip_whitespace(self):
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text) or not self.more():
+                return
+
+    def expect(self, chars):
+        """Consume one of chars (after whitespace) and return it"""
+        self.skip_whitespace()
+        if self.pos >= len(self.text) or self.text[self.pos] not in chars:
+            found = self.text[self.pos:self.pos + 20] or 'end of body'
+            raise ValueError(f"Expected one of {chars!r} in JSON body, found {found!r}")
+        self.pos += 1
+        return self.text[self.pos - 1]
+
+    def value(self):
+        """Decode the next complete JSON value, reading more chunks as needed"""
+        self.skip_whitespace()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.more():
+                    continue
+                raise
+            # A number cut by a chunk boundary decodes as its prefix ("1" of "1.25"): read on and retry
+            cut = end == len(self.text) or (isinstance(value, (int, float)) and not isinstance(value, bool)
+                                            and self.text[end] in _NUMBER_CHARS)
+            if cut and self.more():
+                continue
+            self.pos = end
+            return value
+
+def iter_json_items(chunks, key, meta=None):
+    """Yield the elements of the array at top-level `key` of a JSON object body
+
+    chunks: iterable of bytes (e.g. read_body(response))
+    meta: dict that receives the object's other top-level fields (those after
+          the array only once iteration finishes)
+    Raises ValueError (json.JSONDecodeError included) for malformed bodies and
+    for objects without `key` (e.g. an API error object).
+    """
+    buf = _TextBuffer(chunks)
+    buf.expect('{')
+    if buf.expect('"}') == '}':
+        raise ValueError(f"No {key!r} array in JSON body")
+    buf.pos -= 1
+    found = False
+    while True:
+        name = buf.value()
+        buf.expect(':')
+        if name == key:
+            found = True
+            buf.expect('[')
+            buf.skip_whitespace()
+            if buf.text[buf.pos:buf.pos + 1] == ']':
+                buf.pos += 1
+            else:
+                while True:
+                    yield buf.value()
+                    if buf.expect(',]') == ']':
+                        break
+        else:
+            value = buf.value()
+            if meta is not None:
+                meta[name] = value
+        if buf.expect(',}') == '}':
+            if not found:
+                raise ValueError(f"No {key!r} array in JSON body")
+            return
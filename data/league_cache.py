@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - Last-Known-Good League Cache
+Keeps the last successful fetch of every league, so a league whose fetch
+fails or times out is served from its previous data (marked with its age)
+instead of disappearing from player_data.js. The failed league keeps
+retrying in a background thread and refreshes the cache when it succeeds.
+
+Layout (data/.cache/leagues/):
+    tm-<id>.json      {"fetched_at": ISO time, "values": {...}}
+    fd-<code>.json
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+LEAGUE_CACHE_DIR = Path(__file__).parent / '.cache' / 'leagues'
+
+def save_league(key, values, cache_dir=LEAGUE_CACHE_DIR):
+    """Store a league's values as its last known good data"""
+    path = Path(cache_dir) / f"{key}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'fetched_at': datetime.now().isoformat(), 'values': values}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def load_league(key, cache_dir=LEAGUE_CACHE_DIR):
+    """{'fetched_at', 'values'} for a league, or None"""
+    path = Path(cache_dir) / f"{key}.json"
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def age_hours(fetched_at):
+    return round((datetime.now() - datetime.fromisoformat(fetched_at)).total_seconds() / 3600, 1)
+
+class Revalidator:
+    """Runs league fetches in background threads, retrying failures and caching successes"""
+
+    def __init__(self, attempts=3, retry_after_s=20, cache_dir=LEAGUE_CACHE_DIR):
+        self.attempts = attempts
+        self.retry_after_s = retry_after_s
+        self.cache_dir = cache_dir
+        self.tasks = {}
+
+    def submit(self, key, fetch):
+        """Start fetch() (-> values or None) for a league; retries continue after the first attempt"""
+        task = {'first': threading.Event(), 'done': threading.Event(), 'values': None, 'claimed': False}
+
+        def run():
+            for attempt in range(self.attempts):
+                try:
+                    values = fetch()
+                except Exception:
+                    values = None
+                if values is not None:
+                    save_league(key, values, self.cache_dir)
+                    task['values'] = values
+                task['first'].set()
+                if values is not None or attempt == self.attempts - 1:
+                    break
+                time.sleep(self.retry_after_s * 2 ** attempt)
+            task['done'].set()
+
+        self.tasks[key] = task
+        threading.Thread(target=run, name=f"revalidate-{key}", daemon=True).start()
+        return task
+
+    def first_result(self, key, timeout):
+        """Values from the first attempt if it finishes within timeout, else None (keeps retrying)"""
+        task = self.tasks[key]
+        task['first'].wait(timeout)
+        if task['values'] is not None:
+            task['claimed'] = True
+        return task['values']
+
+    def wait(self, timeout):
+        """Wait up to timeout for the retries still running -> {key: values} refreshed since"""
+        deadline = time.monotonic() + timeout
+        for task in self.tasks.values():
+            task['done'].wait(max(deadline - time.monotonic(), 0))
+        refreshed = {}
+        for key, task in self.tasks.items():
+            if task['values'] is not None and not task['claimed']:
+                task['claimed'] = True
+                refreshed[key] = task['values']
+        return refreshed
+
+    def pending(self):
+        return [key for key, task in self.tasks.items() if not task['done'].is_set()]
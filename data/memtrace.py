@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - Per-Stage Memory Accounting
+--memtrace takes tracemalloc snapshots at every metrics stage boundary (see
+metrics.py) and reports, per stage:
+    retained     Python memory still allocated after the stage vs before it
+    peak         Highest traced Python memory while the stage ran
+    peak +       How far that peak rose above the memory at stage start
+    rss peak     Process max resident set size at the end of the stage
+    top sites    Source lines that allocated the most retained memory
+
+Report: data/.cache/memtrace/<run>-<time>/memtrace.json (or --memtrace DIR).
+tracemalloc slows allocation-heavy code 2-4x, so wall times of a
+--memtrace run are not comparable to normal runs. Peaks of stages running
+in parallel (the concurrent fetches) include each other's allocations.
+
+Usage:
+    python3 fetch_combined.py --api-key YOUR_KEY --memtrace
+    python3 scraper.py --memtrace /tmp/mem --memtrace-top 5
+"""
+
+import json
+import os
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from metrics import METRICS
+
+DEFAULT_MEMTRACE_DIR = Path(__file__).parent / '.cache' / 'memtrace'
+
+# Stack depth kept per allocation (1 = the allocating line only)
+TRACE_FRAMES = 1
+
+MB = 1024 * 1024
+
+# The snapshots themselves are traced: leave them out of the allocation sites
+SNAPSHOT_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__)]
+
+def peak_rss_bytes():
+    """Max resident set size of this process so far (None where unavailable)"""
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024  # KB on Linux, bytes on macOS
+
+def _short_path(site):
+    # Repo files relative to data/, everything else as is
+    here = str(Path(__file__).parent)
+    return os.path.relpath(site, here) if site.startswith(here) else site
+
+class MemTracer:
+    """Snapshot tracemalloc around every stage"""
+
+    def __init__(self, out_dir, top=10):
+        self.out_dir = Path(out_dir)
+        self.top = top
+        self.stages = []  # One entry per stage call, in completion order
+        self._active = []  # Running stages' peak trackers (tracemalloc has one global peak)
+        self._lock = threading.Lock()
+
+    def _fold_peak(self):
+        # Carry the peak since the last reset into every running stage
+        _, peak = tracemalloc.get_traced_memory()
+        for tracker in self._active:
+            tracker['peak'] = max(tracker['peak'], peak)
+
+    @contextmanager
+    def stage(self, name):
+        before = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        current_before, _ = tracemalloc.get_traced_memory()
+        tracker = {'peak': current_before}
+        with self._lock:
+            self._fold_peak()
+            tracemalloc.reset_peak()
+            self._active.append(tracker)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._fold_peak()
+                self._active = [t for t in self._active if t is not tracker]
+            current_after, _ = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+            sites = [
+                {'site': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                 'retained_bytes': stat.size_diff, 'blocks': stat.count_diff}
+                for stat in after.compare_to(before, 'lineno')[:self.top] if stat.size_diff > 0
+            ]
+            with self._lock:
+                self.stages.append({
+                    'stage': name,
+                    'retained_bytes': current_after - current_before,
+                    'peak_bytes': tracker['peak'],
+                    'peak_growth_bytes': tracker['peak'] - current_before,
+                    'peak_rss_bytes': peak_rss_bytes(),
+                    'top_sites': sites,
+                })
+
+    def start(self):
+        tracemalloc.start(TRACE_FRAMES)
+        METRICS.stage_hooks.append(self.stage)
+
+    def stop(self):
+        """Uninstall, write memtrace.json and print the per-stage table"""
+        METRICS.stage_hooks.remove(self.stage)
+        tracemalloc.stop()
+
+        report = {
+            'date': datetime.now().isoformat(),
+            'peak_rss_bytes': peak_rss_bytes(),
+            'stages': self.stages,
+        }
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.out_dir / 'memtrace.json', 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+        print("\n🧠 Memory by stage (MB):")
+        print("   Stage                   retained     peak   peak +  rss peak")
+        for s in self.stages:
+            rss = f"{s['peak_rss_bytes'] / MB:9.1f}" if s['peak_rss_bytes'] else '        -'
+            print(f"   {s['stage']:<22} {s['retained_bytes'] / MB:9.1f} {s['peak_bytes'] / MB:8.1f} "
+                  f"{s['peak_growth_bytes'] / MB:8.1f} {rss}")
+        heaviest = max(self.stages, key=lambda s: s['retained_bytes'], default=None)
+        if heaviest and heaviest['top_sites']:
+            print(f"\n   Top allocation sites in {heaviest['stage']}:")
+            for site in heaviest['top_sites'][:5]:
+                print(f"   {site['retained_bytes'] / MB:8.2f} MB  {_short_path(site['site'])}")
+        print(f"\n🧠 Memtrace written to {self.out_dir / 'memtrace.json'}")
+
+def add_memtrace_args(parser):
+    parser.add_argument('--memtrace', nargs='?', const='', metavar='DIR',
+                        help='Snapshot memory at each stage (default dir: data/.cache/memtrace/<run>-<time>)')
+    parser.add_argument('--memtrace-top', type=int, default=10, help='Allocation sites kept per stage')
+
+@contextmanager
+def memtracing(args, run):
+    """Trace memory per stage if --memtrace was given; a no-op otherwise"""
+    if args.memtrace is None:
+        yield None
+        return
+    out_dir = args.memtrace or DEFAULT_MEMTRACE_DIR / f"{run}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    tracer = MemTracer(out_dir, args.memtrace_top)
+    tracer.start()
+    try:
+        yield tracer
+    finally:
+        tracer.stop()
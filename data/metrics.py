@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - Run Metrics
+Per-stage wall/CPU time, item counts and throughput, plus per-host HTTP
+request counts, status codes, latency histograms, bytes and cache hit rates,
+so a slow run shows whether the time went to Transfermarkt, the match loop
+or writing player_data.js.
+
+Recording is always on and cheap; nothing is written unless a main is run
+with --metrics-dir:
+    scoutlens.prom     Prometheus text format (node_exporter textfile collector)
+    run_report.json    The same numbers as one JSON document
+
+Usage:
+    python3 fetch_combined.py --api-key YOUR_KEY --metrics-dir /var/lib/node_exporter
+    python3 pipeline.py --api-key YOUR_KEY --metrics-dir metrics/
+    python3 metrics.py metrics/run_report.json      # Print a saved report
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlparse
+
+# Upper bounds (seconds) of the HTTP latency histogram buckets
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+PROM_FILE = 'scoutlens.prom'
+REPORT_FILE = 'run_report.json'
+
+def host_of(url):
+    return urlparse(url).hostname or 'unknown'
+
+class RunMetrics:
+    """Counters for one run, safe to update from fetch threads"""
+
+    def __init__(self, run='scoutlens'):
+        self.stage_hooks = []  # name -> context manager entered around every stage (profiling)
+        self.reset(run)
+
+    def reset(self, run='scoutlens'):
+        self.run = run
+        self.started_at = datetime.now().isoformat()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages = {}  # name -> {calls, wall_s, cpu_s, items, failures}
+        self.http = {}    # host -> {requests, errors, bytes, status, latency_sum_s, buckets}
+        self.cache = {}   # scope -> {hits, misses}
+
+    @contextmanager
+    def stage(self, name, items=None):
+        """Time a block as one call of a stage; set rec['items'] inside the block to count its output"""
+        rec = {'items': items}
+        with ExitStack() as hooks:
+            for hook in self.stage_hooks:
+                hooks.enter_context(hook(name))
+            wall, cpu = time.perf_counter(), time.thread_time()
+            failed = False
+            try:
+                yield rec
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+                with self._lock:
+                    s = self.stages.setdefault(name, {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'items': 0,
+                                                      'failures': 0})
+                    s['calls'] += 1
+                    s['wall_s'] += wall
+                    s['cpu_s'] += cpu
+                    s['items'] += rec['items'] or 0
+                    s['failures'] += failed
+
+    def call(self, name, func, *args, **kwargs):
+        """func(*args, **kwargs) timed as stage `name`, counting len() of its result as items"""
+        with self.stage(name) as rec:
+            result = func(*args, **kwargs)
+            rec['items'] = len(result) if hasattr(result, '__len__') else None
+        return result
+
+    def record_http(self, url, status, seconds, nbytes=0):
+        """One request: status is the HTTP code, or None when no response came back"""
+        host = host_of(url)
+        with self._lock:
+            h = self.http.setdefault(host, {'requests': 0, 'errors': 0, 'bytes': 0, 'status': {},
+                                            'latency_sum_s': 0.0, 'buckets': [0] * (len(LATENCY_BUCKETS) + 1)})
+            h['requests'] += 1
+            h['bytes'] += nbytes
+            code = str(status) if status else 'error'
+            h['status'][code] = h['status'].get(code, 0) + 1
+            if not status or status >= 400:
+                h['errors'] += 1
+            h['latency_sum_s'] += seconds
+            bucket = next((i for i, le in enumerate(LATENCY_BUCKETS) if seconds <= le), len(LATENCY_BUCKETS))
+            h['buckets'][bucket] += 1
+
+    def record_cache(self, scope, hit, count=1):
+        """A lookup in a cache (a host's journal, the league cache, the pipeline stage cache)"""
+        with self._lock:
+            c = self.cache.setdefault(scope, {'hits': 0, 'misses': 0})
+            c['hits' if hit else 'misses'] += count
+
+    def report(self):
+        """Everything recorded so far, with derived rates, as a JSON-serializable dict"""
+        with self._lock:
+            stages = {
+                name: {**s, 'wall_s': round(s['wall_s'], 4), 'cpu_s': round(s['cpu_s'], 4),
+                       'items_per_s': round(s['items'] / s['wall_s'], 2) if s['wall_s'] else 0.0}
+                for name, s in self.stages.items()
+            }
+            http = {}
+            for host, h in self.http.items():
+                http[host] = {
+                    'requests': h['requests'], 'errors': h['errors'], 'bytes': h['bytes'],
+                    'status': dict(h['status']),
+                    'latency_avg_s': round(h['latency_sum_s'] / h['requests'], 4),
+                    'latency_sum_s': round(h['latency_sum_s'], 4),
+                    'latency_buckets': {str(le): n for le, n in zip(LATENCY_BUCKETS + ['+Inf'], h['buckets'])},
+                }
+            cache = {scope: {**c, 'hit_rate': round(c['hits'] / (c['hits'] + c['misses']), 3)
+                             if c['hits'] + c['misses'] else 0.0}
+                     for scope, c in self.cache.items()}
+        return {
+            'run': self.run,
+            'started_at': self.started_at,
+            'wall_s': round(time.perf_counter() - self._started, 4),
+            'stages': stages,
+            'http': http,
+            'cache': cache,
+        }
+
+    def prometheus(self):
+        """The report in Prometheus text exposition format"""
+        report = self.report()
+        run = report['run']
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP scoutlens_{name} {help_text}")
+            lines.append(f"# TYPE scoutlens_{name} {kind}")
+            for labels, value in samples:
+                label_str = ','.join(f'{k}="{v}"' for k, v in {'run': run, **labels}.items())
+                lines.append(f"scoutlens_{name}{{{label_str}}} {value}")
+
+        stages = report['stages']
+        metric('stage_wall_seconds', 'gauge', 'Wall time spent in the stage',
+               [({'stage': n}, s['wall_s']) for n, s in stages.items()])
+        metric('stage_cpu_seconds', 'gauge', 'CPU time of the thread running the stage',
+               [({'stage': n}, s['cpu_s']) for n, s in stages.items()])
+        metric('stage_items', 'gauge', 'Items produced by the stage',
+               [({'stage': n}, s['items']) for n, s in stages.items()])
+        metric('stage_items_per_second', 'gauge', 'Stage throughput',
+               [({'stage': n}, s['items_per_s']) for n, s in stages.items()])
+        metric('stage_failures', 'gauge', 'Stage calls that raised',
+               [({'stage': n}, s['failures']) for n, s in stages.items()])
+
+        http = report['http']
+        metric('http_requests_total', 'counter', 'HTTP requests by host and status',
+               [({'host': host, 'status': code}, n) for host, h in http.items() for code, n in h['status'].items()])
+        metric('http_response_bytes_total', 'counter', 'Response body bytes by host',
+               [({'host': host}, h['bytes']) for host, h in http.items()])
+
+        lines.append("# HELP scoutlens_http_request_duration_seconds HTTP request latency by host")
+        lines.append("# TYPE scoutlens_http_request_duration_seconds histogram")
+        for host, h in http.items():
+            cumulative = 0
+            for le, n in h['latency_buckets'].items():
+                cumulative += n
+                lines.append(f'scoutlens_http_request_duration_seconds_bucket{{run="{run}",host="{host}",le="{le}"}} {cumulative}')
+            lines.append(f'scoutlens_http_request_duration_seconds_sum{{run="{run}",host="{host}"}} {h["latency_sum_s"]}')
+            lines.append(f'scoutlens_http_request_duration_seconds_count{{run="{run}",host="{host}"}} {h["requests"]}')
+
+        cache = report['cache']
+        metric('cache_lookups_total', 'counter', 'Cache lookups by scope and result',
+               [({'scope': scope, 'result': result}, c[key]) for scope, c in cache.items()
+                for result, key in [('hit', 'hits'), ('miss', 'misses')]])
+        metric('cache_hit_ratio', 'gauge', 'Cache hit rate by scope',
+               [({'scope': scope}, c['hit_rate']) for scope, c in cache.items()])
+
+        metric('run_wall_seconds', 'gauge', 'Wall time of the whole run', [({}, report['wall_s'])])
+        metric('run_last_timestamp_seconds', 'gauge', 'When the run finished', [({}, round(time.time()))])
+        return '\n'.join(lines) + '\n'
+
+    def write(self, out_dir):
+        """Write scoutlens.prom and run_report.json (atomically, for scrapers) -> report"""
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        report = self.report()
+        for name, content in [(PROM_FILE, self.prometheus()),
+                              (REPORT_FILE, json.dumps(report, indent=2, ensure_ascii=False))]:
+            tmp = out_dir / f".{name}.tmp"
+            tmp.write_text(content, encoding='utf-8')
+            os.replace(tmp, out_dir / name)
+        print(f"\n📏 Metrics written to {out_dir}/ ({PROM_FILE}, {REPORT_FILE})")
+        return report
+
+# The current run; fetchers and stages record into it
+METRICS = RunMetrics()
+
+def print_report(report):
+    print(f"📏 {report['run']} - {report['started_at'][:16]} - {report['wall_s']:.1f}s")
+    print("\n   Stage                   wall      cpu    items     items/s")
+    for name, s in report['stages'].items():
+        print(f"   {name:<22} {s['wall_s']:7.2f}s {s['cpu_s']:7.2f}s {s['items']:7} {s['items_per_s']:10.1f}")
+    if report['http']:
+        print("\n   Host                              req   err      KB   avg latency")
+        for host, h in report['http'].items():
+            print(f"   {host:<32} {h['requests']:4} {h['errors']:5} {h['bytes'] / 1024:7.0f} {h['latency_avg_s']:9.3f}s")
+    if report['cache']:
+        print("\n   Cache                             hits  misses  hit rate")
+        for scope, c in report['cache'].items():
+            print(f"   {scope:<32} {c['hits']:5} {c['misses']:7} {c['hit_rate']:8.0%}")
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else REPORT_FILE
+    with open(path, 'r', encoding='utf-8') as f:
+        print_report(json.load(f))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - Pipeline Runner
+Runs the fetch -> normalize -> match -> score -> categorize -> export flow
+as declared stages. Each stage's output is cached under data/.cache/pipeline
+by a hash of its inputs (stage code and rule tables, parameters and upstream
+outputs), so a rerun only executes stages whose inputs changed. Independent
+stages (the per-source fetches) run in parallel.
+
+Sources:
+    transfermarkt   Market values          (fetch_combined / fetch_transfermarkt)
+    football-data   Season stats           (fetch_combined / fetch_footballdata)
+    api-football    Season stats, needs --api-football-key   (fetch_api_football)
+    fbref           Season stats, needs requests/bs4/pandas  (fetch_fbref)
+    understat       Season stats, needs aiohttp              (scraper)
+
+Usage:
+    python3 pipeline.py --api-key YOUR_KEY
+    python3 pipeline.py --api-key YOUR_KEY --sources transfermarkt,football-data,understat
+    python3 pipeline.py --api-key YOUR_KEY --refetch      # Ignore today's cached fetches
+    python3 pipeline.py --api-key YOUR_KEY --full         # Full Football-Data.org scorer listings
+    python3 pipeline.py --list                             # Show stages and cache state
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date
+from pathlib import Path
+
+import fetch_combined
+from metrics import METRICS
+from memtrace import add_memtrace_args, memtracing
+from profiling import add_profile_args, profiling
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / '.cache' / 'pipeline'
+
+# Seconds to wait for Transfermarkt leagues retrying in the background (fetch_combined's --revalidate-wait)
+REVALIDATE_WAIT_S = 60
+
+STATS_SOURCES = ['football-data', 'api-football', 'fbref', 'understat']
+DEFAULT_SOURCES = ['transfermarkt', 'football-data']
+
+# Fields every stats source is normalized to (the fd_stats shape merge_data expects)
+STATS_FIELDS = ['name', 'team', 'league', 'age', 'nationality', 'position', 'goals', 'assists',
+                'xG', 'xA', 'xgi_per_90', 'minutes_played', 'games']
+
+def _fingerprint(item):
+    """Source of a function; canonical JSON of a table, with the functions in it (e.g. CATEGORIES lambdas) by source"""
+    if callable(item):
+        try:
+            return inspect.getsource(item)
+        except (OSError, TypeError):
+            return getattr(item, '__qualname__', repr(item))
+    if isinstance(item, (set, frozenset)):
+        return json.dumps(sorted(item, key=repr), default=_fingerprint)
+    if isinstance(item, (dict, list, tuple, str, int, float, bool)) or item is None:
+        return json.dumps(item, sort_keys=True, default=_fingerprint)
+    return repr(item)
+
+class Stage:
+    """One pipeline step: func(*dep_outputs, **params) -> JSON-serializable output"""
+
+    def __init__(self, name, func, deps=(), params=None, cache=True, cache_key=None, code=(), secrets=None):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.params = params or {}
+        self.secrets = secrets or {}  # Passed to func like params; only whether each is set is hashed
+        self.cache = cache
+        self.cache_key = cache_key or {}  # Extra cache inputs not passed to func (e.g. day)
+        self.code = [func, *code]  # Functions and tables (e.g. KNOWN_VALUES) whose change invalidates the cache
+
+    def code_hash(self):
+        h = hashlib.sha256()
+        for item in self.code:
+            h.update(_fingerprint(item).encode('utf-8'))
+        return h.hexdigest()
+
+    def input_hash(self, dep_hashes):
+        payload = json.dumps({
+            'stage': self.name,
+            'code': self.code_hash(),
+            'params': self.params,
+            'secrets': {name: bool(value) for name, value in self.secrets.items()},
+            'key': self.cache_key,
+            'deps': dep_hashes,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:20]
+
+def _count_items(output):
+    # Stages returning {'players': [...] or n, ...} count players, others their length
+    if isinstance(output, dict) and 'players' in output:
+        players = output['players']
+        return players if isinstance(players, int) else len(players)
+    return len(output) if hasattr(output, '__len__') else None
+
+class Pipeline:
+    """Runs stages in dependency order with a thread pool and an input-hash cache"""
+
+    def __init__(self, stages, cache_dir=DEFAULT_CACHE_DIR, workers=4):
+        self.stages = {s.name: s for s in stages}
+        self.cache_dir = Path(cache_dir)
+        self.workers = workers
+
+    def _required(self, targets):
+        needed, stack = set(), list(targets or self.stages)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.stages[name].deps)
+        return needed
+
+    def _cache_path(self, stage, input_hash):
+        return self.cache_dir / f"{stage.name}-{input_hash}.json"
+
+    def _execute(self, stage, dep_outputs, dep_hashes):
+        """Load from cache or run one stage -> (output, output_hash, status, seconds)"""
+        started = time.perf_counter()
+        input_hash = stage.input_hash(dep_hashes)
+        path = self._cache_path(stage, input_hash)
+
+        METRICS.record_cache('pipeline', hit=stage.cache and path.exists())
+        if stage.cache and path.exists():
+            raw = path.read_bytes()
+            return json.loads(raw), hashlib.sha256(raw).hexdigest(), 'cached', time.perf_counter() - started
+
+        with METRICS.stage(stage.name) as rec:
+            output = stage.func(*dep_outputs, **stage.params, **stage.secrets)
+            rec['items'] = _count_items(output)
+        raw = json.dumps(output, ensure_ascii=False, sort_keys=True, default=str).encode('utf-8')
+        if stage.cache:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix('.tmp')
+            tmp.write_bytes(raw)
+            os.replace(tmp, path)
+        return output, hashlib.sha256(raw).hexdigest(), 'ran', time.perf_counter() - started
+
+    def run(self, targets=None):
+        """Run targets (default: all stages) -> {stage: (status, seconds)}"""
+        pending = self._required(targets)
+        outputs, hashes, report = {}, {}, {}
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while pending or running:
+                progressed = True
+                while progressed:
+                    progressed = self._submit_ready(pool, pending, running, outputs, hashes, report)
+
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        outputs[name], hashes[name], status, seconds = future.result()
+                        report[name] = (status, seconds)
+                    except Exception as e:
+                        print(f"   ⚠️ Stage {name} failed: {e}")
+                        report[name] = ('failed', 0.0)
+
+        self.outputs = outputs
+        return report
+
+    def _submit_ready(self, pool, pending, running, outputs, hashes, report):
+        """Submit stages whose deps are done, skip those behind a failure -> whether any moved"""
+        progressed = False
+        for name in sorted(pending):
+            stage = self.stages[name]
+            if any(report.get(d, ('',))[0] in ('failed', 'skipped') for d in stage.deps):
+                report[name] = ('skipped', 0.0)
+                pending.discard(name)
+                progressed = True
+            elif all(d in outputs for d in stage.deps):
+                future = pool.submit(self._execute, stage,
+                                     [outputs[d] for d in stage.deps],
+                                     {d: hashes[d] for d in stage.deps})
+                running[future] = name
+                pending.discard(name)
+        return progressed
+
+    def cache_state(self):
+        """Which stages are cached for the current inputs (stops at the first unknown output)"""
+        state, hashes = {}, {}
+        for name in self._topological():
+            stage = self.stages[name]
+            if not all(d in hashes for d in stage.deps):
+                state[name] = 'unknown'
+                continue
+            path = self._cache_path(stage, stage.input_hash({d: hashes[d] for d in stage.deps}))
+            if stage.cache and path.exists():
+                hashes[name] = hashlib.sha256(path.read_bytes()).hexdigest()
+                state[name] = 'cached'
+            else:
+                state[name] = 'stale' if stage.cache else 'always'
+        return state
+
+    def _topological(self):
+        order, seen = [], set()
+        def visit(name):
+            if name in seen:
+                return
+            seen.add(name)
+            for d in self.stages[name].deps:
+                visit(d)
+            order.append(name)
+        for name in self.stages:
+            visit(name)
+        return order
+
+# ============================================
+# STAGES
+# ============================================
+
+def _require(data, source):
+    # An empty fetch is a failure: never cache it as today's result
+    if not data:
+        raise RuntimeError(f"no data from {source}")
+    return data
+
+def fetch_transfermarkt(revalidate_wait=REVALIDATE_WAIT_S):
+    from league_cache import Revalidator
+
+    # Failed leagues keep retrying in the background: wait for them here, or they die with the process
+    revalidator = Revalidator()
+    tm_values = fetch_combined.fetch_transfermarkt_values(revalidator=revalidator)
+    pending = revalidator.pending()
+    if pending:
+        print(f"\n🔁 Waiting up to {revalidate_wait}s for {len(pending)} leagues retrying in the background...")
+    refreshed = revalidator.wait(revalidate_wait if pending else 0)
+    if refreshed:
+        print(f"   ✓ Refreshed {len(refreshed)} leagues")
+        tm_values = fetch_combined.apply_revalidated(tm_values, refreshed)
+    return _require(tm_values, 'Transfermarkt')
+
+def fetch_football_data(api_key, full=False):
+    return _require(fetch_combined.fetch_football_data_stats(api_key, full=full), 'Football-Data.org')
+
+def fetch_api_football(api_key, season=2024):
+    import fetch_api_football as af
+
+    print("\n⚽ Fetching API-Football stats...")
+    players = []
+    for league_name, league_info in af.LEAGUES.items():
+        players.extend(af.process_player(p, league_info)
+                       for p in af.fetch_players(api_key, league_info['id'], season))
+    print(f"   Total: {len(players)} players from API-Football")
+    return _require(players, 'API-Football')
+
+def fetch_fbref():
+    try:
+        import fetch_fbref as fb
+    except SystemExit:
+        raise RuntimeError("fbref source needs: pip3 install requests beautifulsoup4 pandas lxml")
+
+    print("\n📡 Fetching FBref stats...")
+    players = []
+    for league_name, league_info in fb.LEAGUES.items():
+        players.extend(fb.fetch_league_stats(league_name, league_info))
+        time.sleep(3)  # Be nice to FBref
+    print(f"   Total: {len(players)} players from FBref")
+    return _require(players, 'FBref')
+
+def fetch_understat(season='2024', min_minutes=450):
+    import asyncio
+    import scraper
+
+    print("\n📡 Fetching Understat stats...")
+    leagues = list(scraper.TIER1_LEAGUES)
+    scored, _ = asyncio.run(scraper.fetch_and_score(leagues, season, min_minutes))
+    players = scraper.rank_players(scored, leagues)
+    print(f"   Total: {len(players)} players from Understat")
+    return _require(players, 'Understat')
+
+def normalize_stats(*sources):
+    """Combine stats sources into one name -> stats dict (earlier sources win)"""
+    combined = {}
+    for source in sources:
+        rows = source.values() if isinstance(source, dict) else source
+        for row in rows:
+            name = row.get('name')
+            if not name or name.lower() in combined:
+                continue
+            stats = {field: row.get(field) for field in STATS_FIELDS}
+            stats['position'] = (stats['position'] or 'F')[0]
+            for field in ['goals', 'assists', 'xG', 'xA', 'xgi_per_90', 'minutes_played', 'games']:
+                stats[field] = stats[field] or 0
+            stats['age'] = stats['age'] or 25
+            combined[name.lower()] = stats
+    print(f"   Normalized: {len(combined)} players with stats")
+    return combined
+
+def match(tm_values, fd_stats):
+    players, matched, unmatched = fetch_combined.match_player_values(tm_values, fd_stats)
+    print(f"   Matched TM values: {matched}/{len(fd_stats)}")
+    return {
+        'players': players,
+        'tm_only': fetch_combined.tm_only_players(tm_values, fd_stats),
+        'unmatched': unmatched,
+    }
+
+def score(matched):
+    for player in matched['players']:
+        fetch_combined.score_player(player)
+    return matched['players'] + matched['tm_only']
+
+def categorize(players):
+    fetch_combined.assign_ids(players)
+    return {'players': players, 'groups': fetch_combined.categorize_players(players)}
+
+def export(categorized, output_path):
+    fetch_combined.generate_js(categorized['players'], output_path, categorized['groups'])
+    return {'output': output_path, 'players': len(categorized['players'])}
+
+def snapshot(players, db_path):
+    from snapshot_store import record_snapshot
+    return {'run_id': record_snapshot(players, 'pipeline', db_path)}
+
+def build_stages(sources, api_key=None, api_football_key=None, output_path=None,
+                 snapshot_db=None, refetch=False, season='2024', full=False):
+    """Declare the stage graph for the selected sources"""
+    fc = fetch_combined
+    day = {'day': date.today().isoformat()}
+    if refetch:
+        day['refetch'] = time.time()
+
+    # API keys go in secrets: the cache hashes whether one is set, not its value
+    fetchers = {
+        'transfermarkt': Stage('fetch:transfermarkt', fetch_transfermarkt, cache_key=dict(day),
+                               code=[fc.fetch_transfermarkt_values, fc.fetch_league_values, fc.fetch_club_values,
+                                     fc.parse_market_value, fc.mark_stale, fc.apply_revalidated, fc.TM_LEAGUES]),
+        'football-data': Stage('fetch:football-data', fetch_football_data, params={'full': full},
+                               secrets={'api_key': api_key}, cache_key=dict(day),
+                               code=[fc.fetch_football_data_stats, fc.fetch_league_stats, fc.fetch_league_stats_full,
+                                     fc.fetch_scorers_page, fc.scorer_stats, fc.scorers_url, fc.calculate_age, fc.FD_LEAGUES,
+                                     [fc.FD_TOP_SCORERS, fc.FD_PAGE_SIZE, fc.FD_FULL_PAGES]]),
+        'api-football': Stage('fetch:api-football', fetch_api_football, params={'season': int(season)},
+                              secrets={'api_key': api_football_key}, cache_key=dict(day)),
+        'fbref': Stage('fetch:fbref', fetch_fbref, cache_key=dict(day)),
+        'understat': Stage('fetch:understat', fetch_understat, params={'season': season}, cache_key=dict(day)),
+    }
+
+    stats_stages = [f"fetch:{s}" for s in STATS_SOURCES if s in sources]
+    stages = [fetchers[s] for s in sources]
+    stages += [
+        Stage('normalize', normalize_stats, deps=stats_stages),
+        Stage('match', match, deps=['fetch:transfermarkt', 'normalize'],
+              code=[fc.match_player_values, fc.names_match, fc.normalize_name, fc.tm_only_players,
+                    fc.get_age_multiplier, fc.KNOWN_VALUES]),
+        Stage('score', score, deps=['match'],
+              code=[fc.score_player, fc.get_age_multiplier, fc.normalize_name,
+                    fc.CONTRACT_EXPIRY, fc.RELEASE_CLAUSES, fc.TM_LEAGUES]),
+        Stage('categorize', categorize, deps=['score'],
+              code=[fc.categorize_players, fc.assign_ids, fc.stable_player_id, fc.CATEGORIES]),
+        Stage('export', export, deps=['categorize'], params={'output_path': str(output_path)},
+              cache=False, code=[fetch_combined.generate_js]),
+    ]
+    if snapshot_db:
+        stages.append(Stage('snapshot', snapshot, deps=['score'], params={'db_path': str(snapshot_db)}))
+    return stages
+
+def main():
+    parser = argparse.ArgumentParser(description='ScoutLens staged pipeline')
+    parser.add_argument('--api-key', help='Football-Data.org API key')
+    parser.add_argument('--api-football-key', help='API-Football key (api-football source)')
+    parser.add_argument('--sources', type=str, default=','.join(DEFAULT_SOURCES),
+                        help=f"Comma-separated sources (transfermarkt + any of {', '.join(STATS_SOURCES)})")
+    parser.add_argument('--season', type=str, default='2024', help='Season start year (Understat, API-Football)')
+    parser.add_argument('--full', action='store_true',
+                        help='Full Football-Data.org scorer listings (as fetch_combined.py --full)')
+    parser.add_argument('--output', type=str, default=str(Path(__file__).parent / 'player_data.js'))
+    parser.add_argument('--snapshot-db', type=str, help='Also record the run in this snapshot store')
+    parser.add_argument('--cache-dir', type=str, default=str(DEFAULT_CACHE_DIR))
+    parser.add_argument('--workers', type=int, default=4, help='Stages run in parallel')
+    parser.add_argument('--refetch', action='store_true', help="Ignore today's cached fetches")
+    parser.add_argument('--list', action='store_true', help='Show stages and cache state, run nothing')
+    parser.add_argument('--metrics-dir', help='Write scoutlens.prom + run_report.json for this run here')
+    add_profile_args(parser)
+    add_memtrace_args(parser)
+    args = parser.parse_args()
+
+    sources = [s.strip() for s in args.sources.split(',') if s.strip()]
+    unknown = [s for s in sources if s not in ['transfermarkt'] + STATS_SOURCES]
+    if unknown or 'transfermarkt' not in sources or not any(s in STATS_SOURCES for s in sources):
+        print(f"❌ Sources must include transfermarkt and at least one of {STATS_SOURCES}")
+        sys.exit(1)
+
+    api_key = args.api_key or os.environ.get('FOOTBALL_DATA_KEY')
+    api_football_key = args.api_football_key or os.environ.get('FOOTBALL_API_KEY')
+    if 'football-data' in sources and not api_key and not args.list:
+        print("❌ Need Football-Data.org API key (--api-key or FOOTBALL_DATA_KEY)")
+        sys.exit(1)
+    if 'api-football' in sources and not api_football_key and not args.list:
+        print("❌ Need API-Football key (--api-football-key or FOOTBALL_API_KEY)")
+        sys.exit(1)
+
+    stages = build_stages(sources, api_key, api_football_key, args.output, args.snapshot_db,
+                          args.refetch, args.season, args.full)
+    pipeline = Pipeline(stages, args.cache_dir, args.workers)
+
+    if args.list:
+        for name, state in pipeline.cache_state().items():
+            deps = ', '.join(pipeline.stages[name].deps) or '-'
+            print(f"  {name:<22} {state:<8} <- {deps}")
+        return
+
+    print("🔭 ScoutLens - Pipeline")
+    print("=" * 50)
+    METRICS.reset('pipeline')
+    with profiling(args, 'pipeline'), memtracing(args, 'pipeline'):
+        report = pipeline.run()
+
+    print("\n📋 Stages:")
+    icons = {'ran': '⚙️ ', 'cached': '💾', 'failed': '❌', 'skipped': '⏭️ '}
+    for name in pipeline._topological():
+        if name in report:
+            status, seconds = report[name]
+            print(f"   {icons[status]} {name:<22} {status:<8} {seconds:6.2f}s")
+
+    if args.metrics_dir:
+        METRICS.write(args.metrics_dir)
+
+    if any(status in ('failed', 'skipped') for status, _ in report.values()):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - Run Profiler
+--profile on the fetch entry points profiles every metrics stage (see
+metrics.py) without hand-wrapping main() in cProfile. It writes:
+    <stage>.pstats       cProfile of each stage (python3 -m pstats, snakeviz)
+    all.pstats           All stages combined
+    stacks.collapsed     Wall-clock stack samples of every thread, prefixed
+                         with the stage running on it (flamegraph.pl,
+                         speedscope, inferno)
+and prints the top-N functions by own time.
+
+Without --profile nothing is installed: the stage hook list stays empty.
+
+Usage:
+    python3 fetch_combined.py --api-key YOUR_KEY --profile
+    python3 scraper.py --profile /tmp/prof --profile-top 40
+    flamegraph.pl data/.cache/profile/<run>/stacks.collapsed > flame.svg
+"""
+
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from metrics import METRICS
+
+DEFAULT_PROFILE_DIR = Path(__file__).parent / '.cache' / 'profile'
+
+# Seconds between stack samples
+SAMPLE_INTERVAL_S = 0.005
+
+def _file_name(stage):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '-', stage)
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ',')
+
+class Profiler:
+    """cProfile per stage plus a sampling thread for collapsed stacks"""
+
+    def __init__(self, out_dir, top=25, interval=SAMPLE_INTERVAL_S):
+        self.out_dir = Path(out_dir)
+        self.top = top
+        self.interval = interval
+        self.samples = Counter()
+        self.stats = {}          # stage -> pstats.Stats
+        self.sampled_only = set()  # Stages that could not get their own cProfile
+        self._stage_stack = {}   # thread id -> [stage names]
+        self._profiling = set()  # thread ids with a cProfile running
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    @contextmanager
+    def stage(self, name):
+        import cProfile
+        import pstats
+
+        tid = threading.get_ident()
+        stack = self._stage_stack.setdefault(tid, [])
+        stack.append(name)
+        profile = None
+        # Nested stages on one thread are already inside the outer stage's profile
+        if tid not in self._profiling:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+                self._profiling.add(tid)
+            except ValueError:
+                # Python 3.12+ allows one cProfile at a time: a parallel stage only gets samples
+                profile = None
+                self.sampled_only.add(name)
+        try:
+            yield
+        finally:
+            if profile:
+                profile.disable()
+                self._profiling.discard(tid)
+                with self._lock:
+                    if name in self.stats:
+                        self.stats[name].add(profile)
+                    else:
+                        self.stats[name] = pstats.Stats(profile)
+            stack.pop()
+
+    def _sample(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for tid, frame in sys._current_frames().items():
+                if tid == own:
+                    continue
+                frames = []
+                while frame is not None:
+                    frames.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stages = self._stage_stack.get(tid)
+                root = f"stage:{stages[-1]}" if stages else f"thread:{names.get(tid, tid)}"
+                self.samples[';'.join([root] + frames[::-1])] += 1
+
+    def start(self):
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self._sampler = threading.Thread(target=self._sample, name='profile-sampler', daemon=True)
+        self._sampler.start()
+        METRICS.stage_hooks.append(self.stage)
+
+    def stop(self):
+        """Uninstall, write the profile files and print the summary"""
+        import pstats
+
+        METRICS.stage_hooks.remove(self.stage)
+        self._stop.set()
+        self._sampler.join()
+
+        with open(self.out_dir / 'stacks.collapsed', 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+        paths = []
+        for name, stats in self.stats.items():
+            paths.append(str(self.out_dir / f"{_file_name(name)}.pstats"))
+            stats.dump_stats(paths[-1])
+        combined = pstats.Stats(*paths) if paths else None
+        if combined:
+            combined.dump_stats(self.out_dir / 'all.pstats')
+
+        self.print_summary(combined)
+        print(f"\n🔬 Profile written to {self.out_dir}/ ({len(self.stats)} stages, "
+              f"{sum(self.samples.values())} stack samples)")
+
+    def print_summary(self, combined):
+        if combined is None:
+            print("\n🔬 No stages were profiled")
+            return
+        rows = sorted(combined.stats.items(), key=lambda item: item[1][2], reverse=True)[:self.top]
+        total = sum(tt for _, (_, _, tt, _, _) in combined.stats.items()) or 1
+        print(f"\n🔬 Top {len(rows)} functions by own time:")
+        print("     own%     own s    cum s      calls  function")
+        for (filename, line, func), (_, calls, tt, ct, _) in rows:
+            print(f"   {tt / total:6.1%} {tt:9.3f} {ct:8.3f} {calls:10}  {func} ({os.path.basename(filename)}:{line})")
+        if self.sampled_only:
+            print(f"   (sampled only, ran alongside another profiled stage: {', '.join(sorted(self.sampled_only))})")
+
+def add_profile_args(parser):
+    parser.add_argument('--profile', nargs='?', const='', metavar='DIR',
+                        help='Profile each stage (default dir: data/.cache/profile/<run>-<time>)')
+    parser.add_argument('--profile-top', type=int, default=25, help='Functions in the --profile summary')
+
+@contextmanager
+def profiling(args, run):
+    """Profile the block if --profile was given; a no-op otherwise"""
+    if args.profile is None:
+        yield None
+        return
+    out_dir = args.profile or DEFAULT_PROFILE_DIR / f"{run}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    profiler = Profiler(out_dir, args.profile_top)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
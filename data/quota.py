@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - API Quota Planner
+Tracks the remaining request budget of the free-tier stats APIs from their
+response headers, persists it across runs, and orders requests by league
+priority so a short budget is spent on the most valuable leagues first.
+
+Headers read:
+    football-data   X-Requests-Available-Minute, X-RequestCounter-Reset
+    api-football    x-ratelimit-requests-remaining/-limit (daily),
+                    X-RateLimit-Remaining/-Limit (per minute)
+
+State: data/.cache/quota.json
+
+Usage:
+    python3 quota.py                          # Remaining budget per provider
+    python3 fetch_combined.py --dry-run       # Football-Data.org plan + estimated time
+    python3 fetch_api_football.py --dry-run   # API-Football plan + estimated time
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+DEFAULT_STATE_PATH = Path(__file__).parent / '.cache' / 'quota.json'
+
+# Free-tier limits, used until the provider's headers say otherwise
+PROVIDER_LIMITS = {
+    'football-data': {'per_minute': 10, 'per_day': None},
+    'api-football': {'per_minute': 10, 'per_day': 100},
+}
+
+def _next_utc_midnight(now):
+    tomorrow = datetime.fromtimestamp(now, timezone.utc).date() + timedelta(days=1)
+    return datetime(tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=timezone.utc).timestamp()
+
+def _int_header(headers, name):
+    try:
+        return int(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+class QuotaPlanner:
+    """Remaining per-minute / per-day budget for one provider"""
+
+    def __init__(self, provider, state_path=DEFAULT_STATE_PATH):
+        self.provider = provider
+        self.state_path = Path(state_path)
+        self._lock = threading.Lock()
+
+        saved = {}
+        if self.state_path.exists():
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f).get(provider, {})
+        self.state = {**PROVIDER_LIMITS[provider], **saved}
+        self._roll(time.time())
+
+    def _roll(self, now):
+        """Refill windows that have reset since the state was written"""
+        s = self.state
+        if s.get('minute_reset_at', 0) <= now:
+            s['minute_remaining'] = s['per_minute']
+            s['minute_reset_at'] = 0  # Unknown until the next request opens a window
+        if s['per_day'] and s.get('day_reset_at', 0) <= now:
+            s['day_remaining'] = s['per_day']
+            s['day_reset_at'] = _next_utc_midnight(now)
+
+    def _save(self):
+        all_state = {}
+        if self.state_path.exists():
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                all_state = json.load(f)
+        all_state[self.provider] = {**self.state, 'updated_at': datetime.now().isoformat()}
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(all_state, f, indent=2)
+        os.replace(tmp, self.state_path)
+
+    def observe(self, headers):
+        """Update the budget from a response's headers (case-insensitive mapping)"""
+        if headers is None:
+            return
+        headers = {k.lower(): v for k, v in headers.items()}
+        now = time.time()
+        with self._lock:
+            s = self.state
+            if self.provider == 'football-data':
+                minute = _int_header(headers, 'x-requests-available-minute')
+                reset_in = _int_header(headers, 'x-requestcounter-reset')
+                if minute is not None:
+                    s['minute_remaining'] = minute
+                if reset_in is not None:
+                    s['minute_reset_at'] = now + reset_in
+            elif self.provider == 'api-football':
+                for field, name in [('per_day', 'x-ratelimit-requests-limit'),
+                                    ('day_remaining', 'x-ratelimit-requests-remaining'),
+                                    ('per_minute', 'x-ratelimit-limit'),
+                                    ('minute_remaining', 'x-ratelimit-remaining')]:
+                    value = _int_header(headers, name)
+                    if value is not None:
+                        s[field] = value
+                # No reset header for the minute window: assume it started with this request
+                if 'x-ratelimit-remaining' in headers and s['minute_reset_at'] <= now:
+                    s['minute_reset_at'] = now + 60
+            self._save()
+
+    def acquire(self):
+        """Wait for a per-minute slot and spend one request -> False if today's budget is gone"""
+        while True:
+            with self._lock:
+                now = time.time()
+                self._roll(now)
+                s = self.state
+                if s['per_day'] and s['day_remaining'] <= 0:
+                    return False
+                if s['minute_remaining'] > 0:
+                    s['minute_remaining'] -= 1
+                    if s['per_day']:
+                        s['day_remaining'] -= 1
+                    if not s['minute_reset_at']:
+                        s['minute_reset_at'] = now + 60
+                    self._save()
+                    return True
+                wait = max(s['minute_reset_at'] - now, 0.1)
+            print(f"   ⏳ {self.provider} minute quota used, waiting {wait:.0f}s")
+            time.sleep(wait)
+
+    def plan(self, units, spacing=0.0):
+        """Order units by priority and fit them to the budget
+
+        units: [{'key', 'name', 'priority', 'cost'}], lower priority first
+        spacing: minimum seconds between requests (the host's rate limiter)
+        Returns (planned, skipped, estimated_seconds)
+        """
+        with self._lock:
+            self._roll(time.time())
+            s = dict(self.state)
+
+        day_left = s['day_remaining'] if s['per_day'] else None
+        planned, skipped = [], []
+        for unit in sorted(units, key=lambda u: u['priority']):
+            if day_left is not None and unit['cost'] > day_left:
+                skipped.append(unit)
+                continue
+            planned.append(unit)
+            if day_left is not None:
+                day_left -= unit['cost']
+
+        # Walk the per-minute windows to estimate wall time
+        now = time.time()
+        elapsed = 0.0
+        minute_left = s['minute_remaining']
+        window_end = (s['minute_reset_at'] - now) if s['minute_reset_at'] else None
+        for _ in range(sum(u['cost'] for u in planned)):
+            if minute_left <= 0:
+                elapsed = max(elapsed, window_end or 60)
+                minute_left = s['per_minute']
+                window_end = None
+            if window_end is None:
+                window_end = elapsed + 60
+            minute_left -= 1
+            elapsed += spacing
+        return planned, skipped, elapsed
+
+    def describe(self):
+        s = self.state
+        day = f"{s['day_remaining']}/{s['per_day']} today" if s['per_day'] else 'no daily cap'
+        return f"{self.provider}: {s['minute_remaining']}/{s['per_minute']} this minute, {day}"
+
+def print_plan(planner, units, spacing=0.0):
+    """Dry run: show what would be fetched, in order, and how long it should take"""
+    planned, skipped, seconds = planner.plan(units, spacing)
+    print(f"\n🧮 Quota plan - {planner.describe()}")
+    for i, unit in enumerate(planned, 1):
+        print(f"   {i:2}. [P{unit['priority']}] {unit['name']:<22} {unit['cost']} req")
+    for unit in skipped:
+        print(f"   ⏭️  [P{unit['priority']}] {unit['name']:<22} over budget")
+    total = sum(u['cost'] for u in planned)
+    print(f"   {total} requests, ~{seconds:.0f}s estimated")
+    return planned
+
+def main():
+    for provider in PROVIDER_LIMITS:
+        print(QuotaPlanner(provider).describe())
+
+if __name__ == '__main__':
+    main()
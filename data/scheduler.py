@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - Tiered Refresh Scheduler
+Long-running alternative to the daily full refetch: every league gets a
+refresh interval and priority from its tier, and only leagues that are due
+get fetched. Requests to each provider are paced evenly across its quota
+window, so top leagues stay fresh within the same request budget.
+
+State (data/.cache/):
+    schedule.json              Last success / attempt / failure count per job
+    leagues/tm-<id>.json       Last good Transfermarkt values per league (league_cache)
+    leagues/fd-<code>.json     Last good Football-Data.org stats per competition
+
+player_data.js is rebuilt from the league caches whenever a cycle refreshed
+something.
+
+Usage:
+    python3 scheduler.py --api-key YOUR_KEY            # Run forever
+    python3 scheduler.py --api-key YOUR_KEY --once     # One cycle of due jobs (cron)
+    python3 scheduler.py --status                      # Show what is due
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from fetch_combined import (
+    FD_LEAGUES, TM_LEAGUES, RateLimiter, fetch_league_stats, fetch_league_values, generate_js, merge_data,
+)
+from league_cache import load_league, save_league
+
+CACHE_DIR = Path(__file__).parent / '.cache'
+STATE_PATH = CACHE_DIR / 'schedule.json'
+
+# Refresh cadence by league tier (TM_LEAGUES 'tier'); lower priority runs first
+TIER_SCHEDULE = {
+    1: {'interval_h': 12, 'priority': 1},   # Big 5: values move daily
+    2: {'interval_h': 48, 'priority': 2},
+    3: {'interval_h': 168, 'priority': 3},  # Rarely moves
+}
+
+# Request budget per provider: `budget` requests per `window` seconds
+PROVIDERS = {
+    'transfermarkt': {'budget': 600, 'window': 3600},
+    'football-data': {'budget': 10, 'window': 60},  # Free tier: 10/minute
+}
+
+# First retry after a failure, doubling up to the job's own interval
+RETRY_AFTER_S = 15 * 60
+
+def _write_json_atomic(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def _load_json(path, default):
+    if not path.exists():
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def fetch_complete_league_values(tm_id, info, limiter):
+    """One league's values, or None (a failed job) unless every club came back"""
+    values, complete = fetch_league_values(tm_id, info, limiter=limiter)
+    return values if complete else None
+
+def build_jobs(api_key=None):
+    """One job per league and provider, with the tier's interval and priority"""
+    jobs = []
+    fd_tiers = {}
+    for tm_id, info in TM_LEAGUES.items():
+        schedule = TIER_SCHEDULE[info['tier']]
+        jobs.append({
+            'key': f"tm-{tm_id}",
+            'provider': 'transfermarkt',
+            'name': info['name'],
+            'tier': info['tier'],
+            'interval_s': schedule['interval_h'] * 3600,
+            'priority': schedule['priority'],
+            'fetch': lambda limiter, tm_id=tm_id, info=info: fetch_complete_league_values(tm_id, info, limiter),
+        })
+        if info.get('fd_code'):
+            fd_tiers[info['fd_code']] = info['tier']
+
+    if api_key:
+        for code, name in FD_LEAGUES.items():
+            schedule = TIER_SCHEDULE[fd_tiers.get(code, 3)]
+            jobs.append({
+                'key': f"fd-{code}",
+                'provider': 'football-data',
+                'name': name,
+                'tier': fd_tiers.get(code, 3),
+                'interval_s': schedule['interval_h'] * 3600,
+                'priority': schedule['priority'],
+                'fetch': lambda limiter, code=code, name=name: fetch_league_stats(code, name, api_key, limiter),
+            })
+    return jobs
+
+def next_due(job, state):
+    """Epoch seconds when the job is next due (0 = never fetched)"""
+    entry = state.get(job['key'])
+    if not entry:
+        return 0
+    if entry.get('failures'):
+        return entry['last_attempt'] + min(RETRY_AFTER_S * 2 ** (entry['failures'] - 1), job['interval_s'])
+    return entry.get('last_success', 0) + job['interval_s']
+
+def due_jobs(jobs, state, now):
+    """Jobs due now, by priority then most overdue"""
+    due = [job for job in jobs if next_due(job, state) <= now]
+    return sorted(due, key=lambda job: (job['priority'], next_due(job, state)))
+
+def provider_limiters():
+    """One limiter per provider, spacing requests window/budget apart"""
+    return {name: RateLimiter(p['window'] / p['budget']) for name, p in PROVIDERS.items()}
+
+def run_cycle(jobs, state, limiters=None):
+    """Fetch every due job once, pacing each provider -> number of jobs refreshed"""
+    limiters = limiters or provider_limiters()
+    refreshed = 0
+
+    for job in due_jobs(jobs, state, time.time()):
+        print(f"   🔄 [T{job['tier']}] {job['name']} ({job['provider']})...", end=" ", flush=True)
+        started = time.time()
+        try:
+            values = job['fetch'](limiters[job['provider']])
+        except Exception as e:
+            print(f"   ⚠️ {e}")
+            values = None
+
+        entry = state.setdefault(job['key'], {})
+        entry['last_attempt'] = started
+        if values:
+            save_league(job['key'], values)
+            entry['last_success'] = started
+            entry['failures'] = 0
+            refreshed += 1
+            print(f"✓ {len(values)}")
+        else:
+            entry['failures'] = entry.get('failures', 0) + 1
+            print("⚠️ failed (keeping last good data)")
+        _write_json_atomic(STATE_PATH, state)
+
+    return refreshed
+
+def load_cached(prefix, order):
+    """Merge the cached league files for one provider, in config order"""
+    merged = {}
+    for key in order:
+        cached = load_league(f"{prefix}-{key}")
+        if cached:
+            merged.update(cached['values'])
+    return merged
+
+def rebuild(output_path, snapshot_db=None):
+    """Regenerate player_data.js from whatever the league caches hold"""
+    tm_values = load_cached('tm', TM_LEAGUES)
+    fd_stats = load_cached('fd', FD_LEAGUES)
+    if not tm_values or not fd_stats:
+        print("   ⏳ Waiting for both Transfermarkt and Football-Data.org caches before rebuilding")
+        return False
+
+    players = merge_data(tm_values, fd_stats)
+    if snapshot_db:
+        from snapshot_store import record_snapshot
+        record_snapshot(players, 'scheduler', snapshot_db)
+    generate_js(players, output_path)
+    return True
+
+def print_status(jobs, state):
+    now = time.time()
+    for job in sorted(jobs, key=lambda job: (job['priority'], job['key'])):
+        entry = state.get(job['key'], {})
+        last = entry.get('last_success')
+        last_str = datetime.fromtimestamp(last).strftime('%Y-%m-%d %H:%M') if last else 'never'
+        due_in = next_due(job, state) - now
+        due_str = 'due now' if due_in <= 0 else f"in {due_in / 3600:.1f}h"
+        failures = f" ({entry['failures']} failures)" if entry.get('failures') else ''
+        print(f"  T{job['tier']} {job['key']:<10} {job['name']:<22} last {last_str:<16} {due_str}{failures}")
+
+def main():
+    parser = argparse.ArgumentParser(description='ScoutLens tiered refresh scheduler')
+    parser.add_argument('--api-key', help='Football-Data.org API key')
+    parser.add_argument('--output', type=str, default=str(Path(__file__).parent / 'player_data.js'))
+    parser.add_argument('--snapshot-db', type=str, help='Also record each rebuild in this snapshot store')
+    parser.add_argument('--once', action='store_true', help='Run due jobs once and exit')
+    parser.add_argument('--status', action='store_true', help='Show schedule and exit')
+    parser.add_argument('--max-sleep', type=int, default=900, help='Longest idle sleep between checks (seconds)')
+    args = parser.parse_args()
+
+    api_key = args.api_key or os.environ.get('FOOTBALL_DATA_KEY')
+    jobs = build_jobs(api_key)
+    state = _load_json(STATE_PATH, {})
+
+    if args.status:
+        print_status(jobs, state)
+        return
+
+    if not api_key:
+        print("❌ Need Football-Data.org API key (--api-key or FOOTBALL_DATA_KEY)")
+        sys.exit(1)
+
+    print("🔭 ScoutLens - Refresh Scheduler")
+    print("=" * 50)
+
+    limiters = provider_limiters()
+    try:
+        while True:
+            print(f"\n📅 {datetime.now().strftime('%Y-%m-%d %H:%M')} - {len(due_jobs(jobs, state, time.time()))} jobs due")
+            if run_cycle(jobs, state, limiters):
+                rebuild(args.output, args.snapshot_db)
+            if args.once:
+                break
+
+            wake = min(next_due(job, state) for job in jobs)
+            sleep_s = min(max(wake - time.time(), 1), args.max_sleep)
+            print(f"   💤 Next check in {sleep_s / 60:.0f} min")
+            time.sleep(sleep_s)
+    except KeyboardInterrupt:
+        print("\n⏹️  Scheduler stopped")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+ScoutLens command line
+One entry point for every ScoutLens script. Each subcommand imports its
+module only when it runs, so light commands (rumors, query, --help) do not
+pay for the fetchers, their HTTP stacks or optional dependencies
+(aiohttp, requests/bs4/pandas). benchmarks/startup_time.py checks the
+startup target.
+
+Usage:
+    python3 scoutlens.py query --category undervalued --since 2025-12-01
+    python3 scoutlens.py query --league "Premier League" --max-age 23 --min-undervaluation 30
+    python3 scoutlens.py query --category hiddenGems --contract-status expiring --latest --json
+    python3 scoutlens.py generate                      # Rebuild player_data.js from the league caches
+    python3 scoutlens.py rumors list
+    python3 scoutlens.py fetch --api-key YOUR_KEY      # Any script's own arguments follow its command
+    python3 scoutlens.py pipeline --list
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent.parent / 'scripts'
+
+# Commands handed to a script's own main(): name -> (module, help)
+SCRIPT_COMMANDS = {
+    'fetch': ('fetch_combined', 'Transfermarkt values + Football-Data.org stats -> player_data.js'),
+    'fetch-transfermarkt': ('fetch_transfermarkt', 'Transfermarkt-only fetch'),
+    'fetch-footballdata': ('fetch_footballdata', 'Football-Data.org-only fetch'),
+    'fetch-api-football': ('fetch_api_football', 'API-Football fetch'),
+    'fetch-fbref': ('fetch_fbref', 'FBref fetch (needs requests, bs4, pandas)'),
+    'understat': ('scraper', 'Understat scraper (needs aiohttp)'),
+    'pipeline': ('pipeline', 'Staged, cached pipeline run'),
+    'schedule': ('scheduler', 'Tiered refresh scheduler'),
+    'queue': ('job_queue', 'Distributed fetch job queue'),
+    'snapshots': ('snapshot_store', 'Snapshot store runs and player history'),
+    'series': ('value_series', "A player's market value time series"),
+    'rumors': ('update_rumors', 'List, add, update, import and clean transfer rumors'),
+}
+
+def run_script(command, argv):
+    """Import the command's module and run its main() with argv as its arguments"""
+    import importlib
+
+    module_name, _ = SCRIPT_COMMANDS[command]
+    if module_name == 'update_rumors' and str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        print(f"❌ {command} needs a missing dependency: {e}")
+        return 1
+
+    sys.argv = [f"scoutlens {command}", *argv]
+    result = module.main()
+    if hasattr(result, '__await__'):  # scraper.main is async
+        import asyncio
+        result = asyncio.run(result)
+    return result if isinstance(result, int) else 0
+
+def cmd_query(args):
+    """Filter and rank players over the snapshot history"""
+    from fetch_combined import CATEGORIES, categorize_players
+    from snapshot_store import DEFAULT_DB_PATH, latest_snapshot_date, query_snapshots
+
+    args.db = args.db or str(DEFAULT_DB_PATH)
+
+    if args.category and args.category not in CATEGORIES:
+        print(f"❌ Unknown category: {args.category}")
+        print(f"   Available: {list(CATEGORIES)}")
+        return 1
+
+    # Narrow and rank in SQL with the category's own clauses, then re-apply it exactly below
+    category = CATEGORIES[args.category] if args.category else None
+    limit = args.limit or (category['limit'] if category else 20)
+
+    started = time.perf_counter()
+    since, until = args.since, args.until
+    if args.latest:
+        since = until = latest_snapshot_date(args.db, since, until, args.source)
+        if since is None:
+            # No matching run: don't fall through to an unbounded query over every day
+            if args.json:
+                print('{}')
+            else:
+                print("❌ No snapshots match these filters")
+            return 0
+
+    by_date = query_snapshots(
+        args.db,
+        since=since,
+        until=until,
+        source=args.source,
+        leagues=args.league,
+        position=args.position,
+        min_age=args.min_age,
+        max_age=args.max_age,
+        contract_status=args.contract_status,
+        min_undervaluation=args.min_undervaluation,
+        where=category['where'] if category else None,
+        order_by=category['order_by'] if category else 'undervaluation_pct DESC',
+        top_per_day=limit,
+    )
+
+    # Same category rules as player_data.js, recomputed for each day
+    leaderboards = {}
+    for date, rows in by_date.items():
+        if args.category:
+            ranked = categorize_players(rows, [args.category], limit)[args.category]
+        else:
+            ranked = sorted(rows, key=lambda p: p.get('undervaluation_pct') or 0, reverse=True)[:limit]
+        leaderboards[date] = ranked
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if args.json:
+        json.dump(leaderboards, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+
+    if not leaderboards:
+        print("❌ No snapshots match these filters")
+        return 0
+
+    title = args.category or 'undervaluation'
+    for date, ranked in leaderboards.items():
+        print(f"\n📅 {date} - {title} ({len(ranked)})")
+        print("-" * 50)
+        for i, p in enumerate(ranked, 1):
+            print(f"{i:2}. {p['name']:<25} {p['team'] or '':<25} {p['league'] or ''}")
+            print(f"    Age {p['age']} | {p['position']} | Market: €{p['market_value_eur_m']}M | "
+                  f"Fair: €{p['fair_value_eur_m']}M | Gap: {p['undervaluation_pct']}%")
+
+    print(f"\n⏱️  {len(leaderboards)} day(s) in {elapsed_ms:.0f} ms")
+    return 0
+
+def cmd_generate(args):
+    """Rebuild player_data.js from the cached league data, without fetching"""
+    from scheduler import rebuild
+
+    return 0 if rebuild(args.output, args.snapshot_db) else 1
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='scoutlens', description='ScoutLens command line')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    query = sub.add_parser('query', help='Filter and rank players across snapshot history')
+    query.add_argument('--db', type=str, help='SQLite snapshot store (default: data/snapshots.db)')
+    query.add_argument('--category', type=str, help='Category from player_data.js (undervalued, hiddenGems, bargains, ...)')
+    query.add_argument('--since', type=str, help='First date (YYYY-MM-DD)')
+    query.add_argument('--until', type=str, help='Last date (YYYY-MM-DD)')
+    query.add_argument('--latest', action='store_true', help='Only the most recent day in range')
+    query.add_argument('--source', type=str, help='Only runs from this source (combined, understat, ...)')
+    query.add_argument('--league', type=str, action='append', help='League name (repeatable)')
+    query.add_argument('--position', type=str, help='Position code (F, M, D, G)')
+    query.add_argument('--min-age', type=int)
+    query.add_argument('--max-age', type=int)
+    query.add_argument('--contract-status', type=str, choices=['expiring', 'short', 'long'])
+    query.add_argument('--min-undervaluation', type=float, help='Minimum undervaluation %%')
+    query.add_argument('--limit', type=int, help='Players per day (default: category size, or 20)')
+    query.add_argument('--json', action='store_true', help='Print leaderboards as JSON')
+    query.set_defaults(func=cmd_query)
+
+    generate = sub.add_parser('generate', help='Rebuild player_data.js from the league caches (no fetching)')
+    generate.add_argument('--output', type=str, default=str(Path(__file__).parent / 'player_data.js'))
+    generate.add_argument('--snapshot-db', type=str, help='Also record the rebuild in this snapshot store')
+    generate.set_defaults(func=cmd_generate)
+
+    # Listed for --help only: main() hands these to the script before argparse sees them
+    for name, (_, help_text) in SCRIPT_COMMANDS.items():
+        sub.add_parser(name, help=help_text, add_help=False)
+
+    return parser
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SCRIPT_COMMANDS:
+        return run_script(argv[0], argv[1:])
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -20,6 +20,12 @@ from datetime import datetime
 from pathlib import Path
 from urllib.parse import quote
 
+from metrics import METRICS
+from memtrace import add_memtrace_args, memtracing
+from profiling import add_profile_args, profiling
+from search_index import build_search_index, unique_players
+from snapshot_store import DEFAULT_DB_PATH, record_snapshot
+
 # ============================================
 # LEAGUE CONFIGURATION
 # ============================================
@@ -152,9 +158,9 @@ class UnderstatScraper:
             return []
         
         try:
-        # Decode the escaped JSON
-        json_str = json_str.encode().decode('unicode_escape')
-        players = json.loads(json_str)
+            # Decode the escaped JSON
+            json_str = json_str.encode().decode('unicode_escape')
+            players = json.loads(json_str)
         except (json.JSONDecodeError, UnicodeDecodeError) as e:
             print(f"  ⚠️ JSON decode error for {league_key}: {e}")
             return []
@@ -335,49 +341,98 @@ def estimate_market_value(player: dict) -> float:
     return round(max(1.0, min(estimated, 150.0)), 1)
 
 
-def process_players(raw_data: dict, min_minutes: int = 450) -> list:
-    """Process raw player data into undervaluation scores"""
-    model = UndervaluationModel()
+def score_league_players(league: str, players: list, min_minutes: int = 450, model: UndervaluationModel = None) -> list:
+    """Score one league's raw players (unsorted, no IDs yet)"""
+    model = model or UndervaluationModel()
     processed = []
     
-    for league, players in raw_data.items():
-        for player in players:
-            minutes = float(player.get('time', player.get('minutes', 0)))
-            if minutes < min_minutes:
-                continue
-            
-            metrics = model.calculate_metrics(player)
-            fair_value = model.calculate_fair_value(player)
-            market_value = estimate_market_value(player)
-            
-            undervaluation = fair_value - market_value
-            undervaluation_pct = (undervaluation / market_value * 100) if market_value > 0 else 0
-            
-            processed.append({
-                'id': len(processed) + 1,
-                'name': player.get('player_name', player.get('name', 'Unknown')),
-                'team': player.get('team_title', player.get('team', 'Unknown')),
-                'league': player.get('_league_name', league.replace('_', ' ')),
-                'country': player.get('_country', ''),
-                'position': player.get('position', 'Unknown'),
-                'age': int(player.get('age', 25)),
-                'nationality': player.get('nationality', ''),
-                'fair_value_eur_m': fair_value,
-                'market_value_eur_m': market_value,
-                'undervaluation_eur_m': round(undervaluation, 1),
-                'undervaluation_pct': round(undervaluation_pct, 1),
-                **metrics,
-                'goals': int(player.get('goals', 0)),
-                'assists': int(player.get('assists', 0)),
-                'xG': round(float(player.get('xG', player.get('xg', 0))), 2),
-                'xA': round(float(player.get('xA', player.get('xa', 0))), 2),
-            })
+    for player in players:
+        minutes = float(player.get('time', player.get('minutes', 0)))
+        if minutes < min_minutes:
+            continue
+        
+        metrics = model.calculate_metrics(player)
+        fair_value = model.calculate_fair_value(player)
+        market_value = estimate_market_value(player)
+        
+        undervaluation = fair_value - market_value
+        undervaluation_pct = (undervaluation / market_value * 100) if market_value > 0 else 0
+        
+        processed.append({
+            'name': player.get('player_name', player.get('name', 'Unknown')),
+            'team': player.get('team_title', player.get('team', 'Unknown')),
+            'league': player.get('_league_name', league.replace('_', ' ')),
+            'country': player.get('_country', ''),
+            'position': player.get('position', 'Unknown'),
+            'age': int(player.get('age', 25)),
+            'nationality': player.get('nationality', ''),
+            'fair_value_eur_m': fair_value,
+            'market_value_eur_m': market_value,
+            'undervaluation_eur_m': round(undervaluation, 1),
+            'undervaluation_pct': round(undervaluation_pct, 1),
+            **metrics,
+            'goals': int(player.get('goals', 0)),
+            'assists': int(player.get('assists', 0)),
+            'xG': round(float(player.get('xG', player.get('xg', 0))), 2),
+            'xA': round(float(player.get('xA', player.get('xa', 0))), 2),
+        })
+    
+    return processed
+
+def rank_players(scored: dict, league_order: list) -> list:
+    """Merge per-league scored players: IDs in league order, then sort by undervaluation"""
+    processed = []
+    for league in league_order:
+        for player in scored.get(league, []):
+            processed.append({'id': len(processed) + 1, **player})
     
     # Sort by undervaluation percentage
     processed.sort(key=lambda x: x['undervaluation_pct'], reverse=True)
     
     return processed
 
+def process_players(raw_data: dict, min_minutes: int = 450) -> list:
+    """Process raw player data into undervaluation scores"""
+    model = UndervaluationModel()
+    scored = {league: score_league_players(league, players, min_minutes, model) for league, players in raw_data.items()}
+    return rank_players(scored, list(raw_data))
+
+async def fetch_and_score(league_keys: list, season: str = "2024", min_minutes: int = 450) -> tuple:
+    """Fetch Understat leagues and score each one as it arrives -> (scored by league, raw player count)
+    
+    The fetch (producer) and scoring (consumer) run concurrently through a queue,
+    so only the last league's scoring is left once the final fetch returns.
+    """
+    queue = asyncio.Queue()
+    scored = {}
+    raw_count = 0
+    
+    async def produce():
+        async with UnderstatScraper() as scraper:
+            for i, league_key in enumerate(league_keys):
+                print(f"  → {TIER1_LEAGUES[league_key]['name']}...")
+                players = await scraper.get_league_players(league_key, season)
+                if players:
+                    await queue.put((league_key, players))
+                    print(f"    ✓ {len(players)} players")
+                if i < len(league_keys) - 1:
+                    await asyncio.sleep(1)  # Rate limiting
+        await queue.put(None)
+    
+    async def consume():
+        nonlocal raw_count
+        model = UndervaluationModel()
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            league_key, players = item
+            raw_count += len(players)
+            # Score off the event loop so the next request isn't held up
+            scored[league_key] = await asyncio.to_thread(score_league_players, league_key, players, min_minutes, model)
+    
+    await asyncio.gather(produce(), consume())
+    return scored, raw_count
 
 def export_csv(data: list, filepath: str):
     """Export data to CSV"""
@@ -421,6 +476,8 @@ def generate_js_data(data: list, filepath: str):
     lower_league_mults = [0.7, 0.65, 0.6, 0.55, 0.5, 0.45, 0.4, 0.35, 0.3]
     hidden_gems = [p for p in data if p['undervaluation_pct'] > 30][:20]
     
+    search_index = build_search_index(unique_players(top_undervalued, top_performers, rising, hidden_gems))
+    
     js_content = f"""// Auto-generated player data - {datetime.now().strftime('%Y-%m-%d %H:%M')}
 // Run: python scraper.py to update
 
@@ -437,7 +494,10 @@ const PLAYER_DATA = {{
     risingStars: {json.dumps(rising, indent=4)},
     
     // Hidden gems from lower leagues
-    hiddenGems: {json.dumps(hidden_gems, indent=4)}
+    hiddenGems: {json.dumps(hidden_gems, indent=4)},
+    
+    // Prefix postings for player search (token prefix -> player IDs)
+    searchIndex: {json.dumps(search_index, separators=(',', ':'))}
 }};
 
 if (typeof module !== 'undefined') {{
@@ -459,14 +519,23 @@ async def main():
     parser.add_argument('--output', type=str, default='all', choices=['csv', 'json', 'js', 'all'])
     parser.add_argument('--season', type=str, default='2024', help='Season to fetch')
     parser.add_argument('--min-minutes', type=int, default=450, help='Minimum minutes played')
+    parser.add_argument('--snapshot-db', type=str, default=str(DEFAULT_DB_PATH), help='SQLite snapshot store')
+    parser.add_argument('--no-snapshot', action='store_true', help='Do not record this run in the snapshot store')
+    add_profile_args(parser)
+    add_memtrace_args(parser)
     args = parser.parse_args()
     
+    with profiling(args, 'understat'), memtracing(args, 'understat'):
+        await run(args)
+
+async def run(args):
     output_dir = Path(__file__).parent
     
     print("🔭 ScoutLens Data Pipeline")
     print("=" * 50)
     
-    raw_data = {}
+    scored = {}
+    raw_count = 0
     
     # Determine which leagues to fetch
     if args.league:
@@ -491,19 +560,15 @@ async def main():
     print(f"📋 Fetching {len(leagues_to_fetch)} leagues...")
     print()
     
-    # Fetch from Understat (Tier 1)
+    # Fetch from Understat (Tier 1), scoring each league as it arrives
+    understat_leagues = []
     if use_understat or args.all_tiers:
-        understat_leagues = {k: v for k, v in leagues_to_fetch.items() if k in TIER1_LEAGUES}
+        understat_leagues = [k for k in leagues_to_fetch if k in TIER1_LEAGUES]
         if understat_leagues:
             print("📡 Fetching from Understat (Big 5 leagues)...")
-            async with UnderstatScraper() as scraper:
-                for league_key in understat_leagues:
-                    print(f"  → {TIER1_LEAGUES[league_key]['name']}...")
-                    players = await scraper.get_league_players(league_key, args.season)
-                    if players:
-                        raw_data[league_key] = players
-                        print(f"    ✓ {len(players)} players")
-                    await asyncio.sleep(1)  # Rate limiting
+            with METRICS.stage('fetch:understat') as rec:
+                scored, raw_count = await fetch_and_score(understat_leagues, args.season, args.min_minutes)
+                rec['items'] = raw_count
     
     # Note about FBref (Tier 2-4)
     non_understat = {k: v for k, v in leagues_to_fetch.items() if k not in TIER1_LEAGUES}
@@ -514,31 +579,34 @@ async def main():
         print("    Then enable FBref scraper in code.")
         print()
     
-    if not raw_data:
+    if not scored:
         print("❌ No data fetched")
         return
     
-    # Process players
-    total_raw = sum(len(p) for p in raw_data.values())
-    print(f"\n⚙️ Processing {total_raw} raw players...")
+    # Leagues are already scored: only the ranking merge is left
+    print(f"\n⚙️ Ranking {raw_count} raw players...")
     
-    processed = process_players(raw_data, args.min_minutes)
+    processed = METRICS.call('rank', rank_players, scored, understat_leagues)
     
     undervalued_count = len([p for p in processed if p['undervaluation_pct'] > 20])
     print(f"✓ {len(processed)} players after filtering")
     print(f"✓ {undervalued_count} significantly undervalued (>20%)")
     
+    if not args.no_snapshot:
+        record_snapshot(processed, 'understat', args.snapshot_db)
+    
     # Export
     timestamp = datetime.now().strftime('%Y%m%d')
     
-    if args.output in ['csv', 'all']:
-        export_csv(processed, output_dir / f'players_{timestamp}.csv')
-    
-    if args.output in ['json', 'all']:
-        export_json(processed, output_dir / f'players_{timestamp}.json')
-    
-    if args.output in ['js', 'all']:
-        generate_js_data(processed, output_dir / 'player_data.js')
+    with METRICS.stage('export', items=len(processed)):
+        if args.output in ['csv', 'all']:
+            export_csv(processed, output_dir / f'players_{timestamp}.csv')
+        
+        if args.output in ['json', 'all']:
+            export_json(processed, output_dir / f'players_{timestamp}.json')
+        
+        if args.output in ['js', 'all']:
+            generate_js_data(processed, output_dir / 'player_data.js')
     
     # Print summary
     print("\n" + "=" * 50)
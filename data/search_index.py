@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - Search Index
+Name normalization and the prefix search index every player_data.js writer
+embeds. Standard library only, so the standalone fetchers can use it
+without importing fetch_combined.
+"""
+
+import re
+import unicodedata
+
+def normalize_name(name):
+    """Normalize name for matching (remove accents, lowercase)"""
+    if not name:
+        return ""
+    # Remove accents
+    normalized = unicodedata.normalize('NFD', name)
+    normalized = ''.join(c for c in normalized if unicodedata.category(c) != 'Mn')
+    # Lowercase and remove extra spaces
+    normalized = normalized.lower().strip()
+    # Remove common prefixes/suffixes
+    normalized = re.sub(r'\s+(jr|sr|ii|iii)\.?$', '', normalized)
+    return normalized
+
+SEARCH_MIN_PREFIX = 2
+SEARCH_MAX_PREFIX = 10
+
+def search_tokens(text):
+    """Split text into accent-folded search tokens"""
+    return [t for t in re.split(r'[^a-z0-9]+', normalize_name(text)) if t]
+
+def build_search_index(players, fields=('name', 'team')):
+    """Build prefix postings (token prefix -> sorted player IDs)"""
+    postings = {}
+
+    for p in players:
+        player_id = p.get('id')
+        if player_id is None:
+            continue
+
+        for field in fields:
+            for token in search_tokens(p.get(field, '')):
+                shortest = min(SEARCH_MIN_PREFIX, len(token))
+                longest = min(SEARCH_MAX_PREFIX, len(token))
+                for end in range(shortest, longest + 1):
+                    postings.setdefault(token[:end], set()).add(player_id)
+
+    return {
+        'minPrefix': SEARCH_MIN_PREFIX,
+        'maxPrefix': SEARCH_MAX_PREFIX,
+        'postings': {prefix: sorted(ids) for prefix, ids in sorted(postings.items())},
+    }
+
+def unique_players(*groups):
+    """Players from several category lists, deduplicated by ID"""
+    seen = {}
+    for group in groups:
+        for p in group:
+            seen.setdefault(p.get('id'), p)
+    return list(seen.values())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - Request Coalescing
+Several code paths ask for the same resource in one run: fetch_transfermarkt's
+top scorers and full fetch both pull every league's club list and squads, and
+fetch_combined pulls the same URLs when it runs in the same process. A
+SingleFlight shares one call per key between them:
+
+    in flight   callers asking for a key that is being fetched wait for that
+                fetch instead of starting their own
+    recent      a successful result is reused for ttl seconds
+
+Failures (None results, exceptions) are handed to the callers already waiting
+but never kept, so the next caller retries.
+
+Results are shared objects: callers must not mutate them.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import METRICS
+
+# How long a successful result is reused (well under the scheduler's shortest refresh interval)
+RECENT_TTL_S = 900
+
+class SingleFlight:
+    """One call per key at a time, successful results reused for ttl seconds"""
+
+    def __init__(self, scope, ttl=RECENT_TTL_S):
+        self.scope = scope  # Cache scope in METRICS
+        self.ttl = ttl
+        self._recent = OrderedDict()  # key -> (stored at, result), oldest first
+        self._calls = {}              # key -> in-flight call
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        while self._recent:
+            key, (stored_at, _) = next(iter(self._recent.items()))
+            if now - stored_at < self.ttl:
+                break
+            del self._recent[key]
+
+    def do(self, key, func, *args, **kwargs):
+        """func(*args, **kwargs), unless the same key is in flight or was fetched recently"""
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            if key in self._recent:
+                METRICS.record_cache(self.scope, hit=True)
+                return self._recent[key][1]
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {'done': threading.Event(), 'result': None, 'error': None}
+        METRICS.record_cache(self.scope, hit=not leader)
+
+        if not leader:
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+
+        try:
+            call['result'] = func(*args, **kwargs)
+            return call['result']
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call['error'] is None and call['result'] is not None:
+                    self._recent[key] = (time.monotonic(), call['result'])
+            call['done'].set()
+
+    def forget(self, key):
+        """Drop a recent result so the next call fetches again"""
+        with self._lock:
+            self._recent.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._recent.clear()
+
+# Shared by every fetch_json in the process, keyed by URL
+HTTP_FLIGHTS = SingleFlight('single_flight')
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - Snapshot Store
+Keeps every pipeline run's merged players in a local SQLite database,
+so market value / fair value / undervaluation history survives the
+daily overwrite of player_data.js.
+
+Usage:
+    python3 snapshot_store.py runs                      # List recorded runs
+    python3 snapshot_store.py history "Erling Haaland"  # One player's history
+    python3 snapshot_store.py history "Haaland" --since 2025-12-01
+"""
+
+import argparse
+import sqlite3
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from fetch_combined import is_stale, normalize_name, stable_player_id
+
+DEFAULT_DB_PATH = Path(__file__).parent / 'snapshots.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    snapshot_date TEXT NOT NULL,
+    player_count INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS player_snapshots (
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    snapshot_date TEXT NOT NULL,
+    player_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    team TEXT,
+    league TEXT,
+    league_tier INTEGER,
+    position TEXT,
+    age INTEGER,
+    nationality TEXT,
+    market_value_eur_m REAL,
+    fair_value_eur_m REAL,
+    undervaluation_pct REAL,
+    goals INTEGER,
+    assists INTEGER,
+    xgi_per_90 REAL,
+    minutes_played INTEGER,
+    games INTEGER,
+    tm_verified INTEGER,
+    is_hidden_gem INTEGER,
+    contract_expiry INTEGER,
+    contract_status TEXT,
+    PRIMARY KEY (run_id, player_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_runs_date ON runs (snapshot_date, started_at);
+CREATE INDEX IF NOT EXISTS idx_snapshots_player_date ON player_snapshots (player_id, snapshot_date);
+CREATE INDEX IF NOT EXISTS idx_snapshots_name_date ON player_snapshots (name_key, snapshot_date);
+CREATE INDEX IF NOT EXISTS idx_snapshots_last_name_date ON player_snapshots (last_name, snapshot_date);
+CREATE INDEX IF NOT EXISTS idx_snapshots_league_date ON player_snapshots (league, snapshot_date);
+CREATE INDEX IF NOT EXISTS idx_snapshots_date ON player_snapshots (snapshot_date);
+"""
+
+# Player fields copied as-is into player_snapshots (in column order)
+PLAYER_COLUMNS = [
+    'team', 'league', 'league_tier', 'position', 'age', 'nationality',
+    'market_value_eur_m', 'fair_value_eur_m', 'undervaluation_pct',
+    'goals', 'assists', 'xgi_per_90', 'minutes_played', 'games',
+    'tm_verified', 'is_hidden_gem', 'contract_expiry', 'contract_status',
+]
+
+INSERT_SQL = (
+    "INSERT INTO player_snapshots "
+    f"(run_id, snapshot_date, player_id, name, name_key, last_name, {', '.join(PLAYER_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * (6 + len(PLAYER_COLUMNS)))})"
+)
+
+def connect(db_path=DEFAULT_DB_PATH):
+    """Open the snapshot database, creating tables and indexes if needed"""
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+def record_snapshot(players, source, db_path=DEFAULT_DB_PATH, when=None):
+    """Append one run's players to the store in a single transaction. Returns the run ID.
+
+    Players sharing a stable ID (homonyms with the same nationality) keep the
+    first one; the others are reported and skipped. So are players served from
+    last known good data (is_stale): they were not observed on this date.
+    """
+    when = when or datetime.now()
+    run_id = f"{source}-{when.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    snapshot_date = when.strftime('%Y-%m-%d')
+
+    rows, seen, duplicates, stale = [], set(), [], 0
+    for p in players:
+        if is_stale(p):
+            stale += 1
+            continue
+        player_id = stable_player_id(p)
+        if player_id in seen:
+            duplicates.append(p.get('name', 'Unknown'))
+            continue
+        seen.add(player_id)
+        name_key = normalize_name(p.get('name'))
+        last_name = name_key.split()[-1] if name_key.split() else name_key
+        rows.append((run_id, snapshot_date, player_id, p.get('name', 'Unknown'), name_key, last_name,
+                     *[p.get(col) for col in PLAYER_COLUMNS]))
+
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.execute(
+                "INSERT INTO runs (run_id, source, started_at, snapshot_date, player_count) VALUES (?, ?, ?, ?, ?)",
+                (run_id, source, when.isoformat(), snapshot_date, len(rows)),
+            )
+            conn.executemany(INSERT_SQL, rows)
+    finally:
+        conn.close()
+
+    if stale:
+        print(f"   ⏳ Skipped {stale} players served from cached league data")
+    if duplicates:
+        print(f"   ⚠️ Skipped {len(duplicates)} players with a duplicate ID: {', '.join(duplicates[:5])}"
+              + (' ...' if len(duplicates) > 5 else ''))
+    print(f"🗄️  Recorded {len(rows)} players as run {run_id}")
+    return run_id
+
+def player_history(name, since=None, until=None, db_path=DEFAULT_DB_PATH, column='name_key'):
+    """Snapshots for one player (by name or stable ID), oldest first"""
+    name_key = normalize_name(name)
+    sql = f"SELECT * FROM player_snapshots WHERE ({column} = ? OR player_id = ?)"
+    params = [name_key, name]
+    if since:
+        sql += " AND snapshot_date >= ?"
+        params.append(since)
+    if until:
+        sql += " AND snapshot_date <= ?"
+        params.append(until)
+    sql += " ORDER BY snapshot_date, run_id"
+
+    conn = connect(db_path)
+    try:
+        rows = [dict(r) for r in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+    # Fall back to last name, as merge_data does for its lookups
+    if not rows and column == 'name_key' and name_key:
+        return player_history(name_key.split()[-1], since, until, db_path, column='last_name')
+    return rows
+
+def query_snapshots(db_path=DEFAULT_DB_PATH, since=None, until=None, source=None, leagues=None,
+                    position=None, min_age=None, max_age=None, contract_status=None,
+                    min_undervaluation=None, where=None, order_by='undervaluation_pct DESC',
+                    top_per_day=None):
+    """Filtered player rows from the latest run of each day -> {date: [rows]}
+
+    where: extra SQL condition (e.g. a category's 'where' clause)
+    top_per_day: keep only the first N rows per day by order_by (ties keep insertion order)
+    """
+    # Latest run per day (served by idx_runs_date), then rows by run_id (primary key prefix)
+    run_sql = (
+        "SELECT run_id FROM runs r WHERE started_at = "
+        "(SELECT MAX(started_at) FROM runs r2 WHERE r2.snapshot_date = r.snapshot_date"
+        + (" AND r2.source = ?" if source else "") + ")"
+    )
+    params = [source] if source else []
+    if source:
+        run_sql += " AND source = ?"
+        params.append(source)
+    if since:
+        run_sql += " AND snapshot_date >= ?"
+        params.append(since)
+    if until:
+        run_sql += " AND snapshot_date <= ?"
+        params.append(until)
+
+    sql = f"SELECT * FROM player_snapshots WHERE run_id IN ({run_sql})"
+    if leagues:
+        sql += f" AND league IN ({', '.join('?' * len(leagues))})"
+        params.extend(leagues)
+    if position:
+        sql += " AND position = ?"
+        params.append(position)
+    if min_age is not None:
+        sql += " AND age >= ?"
+        params.append(min_age)
+    if max_age is not None:
+        sql += " AND age <= ?"
+        params.append(max_age)
+    if contract_status:
+        sql += " AND contract_status = ?"
+        params.append(contract_status)
+    if min_undervaluation is not None:
+        sql += " AND undervaluation_pct >= ?"
+        params.append(min_undervaluation)
+    if where:
+        sql += f" AND ({where})"
+    if top_per_day:
+        # Rank only rowids, then fetch full rows for the winners
+        ranked = sql.replace(
+            "SELECT *",
+            "SELECT rowid AS rank_rowid, ROW_NUMBER() OVER "
+            f"(PARTITION BY snapshot_date ORDER BY {order_by}, rowid) AS day_rank",
+            1,
+        )
+        sql = (
+            f"SELECT s.* FROM player_snapshots s JOIN ({ranked}) r ON s.rowid = r.rank_rowid "
+            "WHERE r.day_rank <= ? ORDER BY s.snapshot_date, r.day_rank"
+        )
+        params.append(top_per_day)
+
+    conn = connect(db_path)
+    try:
+        by_date = {}
+        for row in conn.execute(sql, params):
+            by_date.setdefault(row['snapshot_date'], []).append(dict(row))
+    finally:
+        conn.close()
+    return dict(sorted(by_date.items()))
+
+def latest_snapshot_date(db_path=DEFAULT_DB_PATH, since=None, until=None, source=None):
+    """Most recent snapshot date in range, or None"""
+    sql = "SELECT MAX(snapshot_date) FROM runs WHERE 1 = 1"
+    params = []
+    for clause, value in [(" AND snapshot_date >= ?", since), (" AND snapshot_date <= ?", until),
+                          (" AND source = ?", source)]:
+        if value:
+            sql += clause
+            params.append(value)
+
+    conn = connect(db_path)
+    try:
+        return conn.execute(sql, params).fetchone()[0]
+    finally:
+        conn.close()
+
+def list_runs(db_path=DEFAULT_DB_PATH):
+    """All recorded runs, newest first"""
+    conn = connect(db_path)
+    try:
+        return [dict(r) for r in conn.execute("SELECT * FROM runs ORDER BY started_at DESC")]
+    finally:
+        conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect the ScoutLens snapshot store')
+    parser.add_argument('--db', type=str, default=str(DEFAULT_DB_PATH), help='SQLite snapshot database')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('runs', help='List recorded runs')
+    history = sub.add_parser('history', help="Show one player's value history")
+    history.add_argument('name', help='Player name or stable ID')
+    history.add_argument('--since', type=str, help='First date (YYYY-MM-DD)')
+    history.add_argument('--until', type=str, help='Last date (YYYY-MM-DD)')
+    args = parser.parse_args()
+
+    if args.command == 'runs':
+        for run in list_runs(args.db):
+            print(f"  {run['snapshot_date']}  {run['run_id']:<45} {run['player_count']:>5} players")
+        return
+
+    rows = player_history(args.name, args.since, args.until, args.db)
+    if not rows:
+        print(f"❌ No snapshots for {args.name}")
+        return
+
+    print(f"\n📈 {rows[-1]['name']} ({len(rows)} snapshots)\n")
+    for r in rows:
+        print(f"  {r['snapshot_date']}  Market: €{r['market_value_eur_m']}M | "
+              f"Fair: €{r['fair_value_eur_m']}M | Gap: {r['undervaluation_pct']}%")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - Market Value Time Series
+Append-only, memory-mapped daily values per player for value-trend charts.
+
+Layout (data/timeseries/):
+    slot.u32                  Player slot of every row (sorted within each run)
+    market_value_eur_m.f32    One float32 column per metric, same row order
+    fair_value_eur_m.f32
+    undervaluation_pct.f32
+    runs.json                 Committed runs: date, first row, row count
+    players.json              Stable player ID -> slot, plus display names
+
+Readers binary-search each run's block of slot.u32 through mmap, so a
+player's history touches a few pages per run instead of the whole file.
+
+Usage:
+    python3 value_series.py "Erling Haaland"
+"""
+
+import argparse
+import json
+import math
+import mmap
+import os
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+
+from fetch_combined import is_stale, normalize_name, stable_player_id
+
+DEFAULT_SERIES_DIR = Path(__file__).parent / 'timeseries'
+
+METRICS = ['market_value_eur_m', 'fair_value_eur_m', 'undervaluation_pct']
+
+def _write_json_atomic(path, data):
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def _load_json(path, default):
+    if not path.exists():
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def append_run(players, series_dir=DEFAULT_SERIES_DIR, when=None):
+    """Append one row per player (merge_data output) as a new run
+
+    Players served from last known good data (is_stale) are left out: their
+    values belong to the date they were fetched, already in the series.
+    """
+    series_dir = Path(series_dir)
+    series_dir.mkdir(parents=True, exist_ok=True)
+    when = when or datetime.now()
+
+    registry = _load_json(series_dir / 'players.json', {'slots': {}, 'names': []})
+    runs = _load_json(series_dir / 'runs.json', [])
+    committed_rows = runs[-1]['start'] + runs[-1]['count'] if runs else 0
+
+    # One row per slot, ordered by slot so readers can binary-search the run
+    rows = {}
+    for p in players:
+        if is_stale(p):
+            continue
+        player_id = stable_player_id(p)
+        slot = registry['slots'].get(player_id)
+        if slot is None:
+            slot = len(registry['names'])
+            registry['slots'][player_id] = slot
+            registry['names'].append(p.get('name', 'Unknown'))
+        rows.setdefault(slot, p)
+
+    slots = array('I', sorted(rows))
+    columns = {metric: array('f') for metric in METRICS}
+    for slot in slots:
+        for metric in METRICS:
+            value = rows[slot].get(metric)
+            columns[metric].append(float(value) if value is not None else math.nan)
+
+    # Drop any rows left over from an interrupted append, then extend every column
+    for name, values in [('slot.u32', slots)] + [(f"{m}.f32", columns[m]) for m in METRICS]:
+        with open(series_dir / name, 'ab') as f:
+            f.truncate(committed_rows * values.itemsize)
+            values.tofile(f)
+
+    # runs.json is written last: rows only become visible once committed here
+    _write_json_atomic(series_dir / 'players.json', registry)
+    runs.append({'date': when.strftime('%Y-%m-%d'), 'start': committed_rows, 'count': len(slots)})
+    _write_json_atomic(series_dir / 'runs.json', runs)
+
+    print(f"📉 Appended {len(slots)} rows to value series ({len(runs)} runs)")
+    return len(runs)
+
+class ValueSeries:
+    """Read-only, memory-mapped view of the value series"""
+
+    def __init__(self, series_dir=DEFAULT_SERIES_DIR):
+        self.series_dir = Path(series_dir)
+        registry = _load_json(self.series_dir / 'players.json', {'slots': {}, 'names': []})
+        self.slots = registry['slots']
+        self.names = registry['names']
+        self.runs = _load_json(self.series_dir / 'runs.json', [])
+        self._files = []
+        self._maps = []
+        self.columns = {}
+
+        committed_rows = self.runs[-1]['start'] + self.runs[-1]['count'] if self.runs else 0
+        if committed_rows == 0:
+            return
+        for name, fmt in [('slot', 'I')] + [(m, 'f') for m in METRICS]:
+            suffix = 'u32' if fmt == 'I' else 'f32'
+            f = open(self.series_dir / f"{name}.{suffix}", 'rb')
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._files.append(f)
+            self._maps.append(mm)
+            # Only expose committed rows (ignores a torn tail from an interrupted append)
+            self.columns[name] = memoryview(mm)[:committed_rows * 4].cast(fmt)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        for view in self.columns.values():
+            view.release()
+        self.columns = {}
+        for mm in self._maps:
+            mm.close()
+        for f in self._files:
+            f.close()
+        self._maps, self._files = [], []
+
+    def find_slot(self, name):
+        """Slot for a stable player ID, or for a player name (exact, then last name)"""
+        if name in self.slots:
+            return self.slots[name]
+        name_key = normalize_name(name)
+        keys = [normalize_name(n) for n in self.names]
+        if name_key in keys:
+            return keys.index(name_key)
+        last_name = name_key.split()[-1] if name_key.split() else name_key
+        for slot, key in enumerate(keys):
+            if key.split() and key.split()[-1] == last_name:
+                return slot
+        return None
+
+    def history(self, slot, since=None, until=None):
+        """[{date, market_value_eur_m, ...}] for one slot, oldest first"""
+        if slot is None or not self.columns:
+            return []
+
+        slot_column = self.columns['slot']
+        points = []
+        for run in self.runs:
+            if (since and run['date'] < since) or (until and run['date'] > until):
+                continue
+            lo, hi = run['start'], run['start'] + run['count']
+            row = bisect_left(slot_column, slot, lo, hi)
+            if row < hi and slot_column[row] == slot:
+                point = {'date': run['date']}
+                for metric in METRICS:
+                    value = self.columns[metric][row]
+                    point[metric] = None if math.isnan(value) else round(value, 2)
+                points.append(point)
+        return points
+
+def main():
+    parser = argparse.ArgumentParser(description='Show a player\'s market value series')
+    parser.add_argument('name', help='Player name or stable ID')
+    parser.add_argument('--series-dir', type=str, default=str(DEFAULT_SERIES_DIR))
+    parser.add_argument('--since', type=str, help='First date (YYYY-MM-DD)')
+    parser.add_argument('--until', type=str, help='Last date (YYYY-MM-DD)')
+    args = parser.parse_args()
+
+    with ValueSeries(args.series_dir) as series:
+        slot = series.find_slot(args.name)
+        points = series.history(slot, args.since, args.until)
+        if not points:
+            print(f"❌ No value history for {args.name}")
+            return
+
+        print(f"\n📉 {series.names[slot]} ({len(points)} points)\n")
+        for p in points:
+            print(f"  {p['date']}  Market: €{p['market_value_eur_m']}M | "
+                  f"Fair: €{p['fair_value_eur_m']}M | Gap: {p['undervaluation_pct']}%")
+
+if __name__ == '__main__':
+    main()
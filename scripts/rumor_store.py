@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+ScoutLens - Rumor Store
+Indexed SQLite backing for update_rumors.py. rumors.json stays the file the
+front end loads, but commands work on data/rumors.db instead of loading,
+scanning and rewriting the whole JSON file:
+    - lookups by id, player and status go through indexes
+    - ids come from an AUTOINCREMENT sequence, so they are never reused
+      after a rumor is deleted (the next id is also kept in rumors.json as
+      next_id, so a fresh checkout continues the sequence)
+    - cleanup deletes through the expiry index and only touches expired rows
+    - a unique (player, from, to) key dedupes adds and batch imports
+    - rumors.json is rewritten only when something changed
+
+rumors.db is a cache of rumors.json: it is (re)built from the JSON file
+whenever that file differs from what the store last exported, so hand
+edits and a fresh clone both just work.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import sqlite3
+import unicodedata
+from datetime import datetime, timedelta
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+RUMORS_FILE = DATA_DIR / 'rumors.json'
+DEFAULT_DB_PATH = DATA_DIR / 'rumors.db'
+
+# Bump when SCHEMA changes: the store is rebuilt from rumors.json
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rumors (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    player TEXT NOT NULL,
+    player_key TEXT NOT NULL,
+    rumor_key TEXT NOT NULL,
+    from_team TEXT,
+    to_team TEXT,
+    fee TEXT,
+    status TEXT,
+    source TEXT,
+    date TEXT,
+    verified,
+    expires TEXT,
+    expires_on TEXT,
+    extra TEXT
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_rumors_key ON rumors (rumor_key);
+CREATE INDEX IF NOT EXISTS idx_rumors_player ON rumors (player_key);
+CREATE INDEX IF NOT EXISTS idx_rumors_status ON rumors (status);
+CREATE INDEX IF NOT EXISTS idx_rumors_expires ON rumors (expires_on);
+"""
+
+# rumors.json field -> column, in export order
+FIELD_COLUMNS = {
+    'id': 'id',
+    'player': 'player',
+    'from': 'from_team',
+    'to': 'to_team',
+    'fee': 'fee',
+    'status': 'status',
+    'source': 'source',
+    'date': 'date',
+    'verified': 'verified',
+    'expires': 'expires',
+}
+
+# The fields rumor_key is built from: an import that matches a rumor by them keeps its spelling
+IDENTITY_FIELDS = ('player', 'from', 'to')
+
+def player_key(name):
+    """Lowercase, accent-free, single-spaced player name for lookups"""
+    text = unicodedata.normalize('NFKD', name or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(text.lower().split())
+
+def rumor_key(player, from_team, to_team):
+    """Dedupe key: the same move of the same player is one rumor"""
+    return '|'.join(player_key(part) for part in (player, from_team, to_team))
+
+def _id_seq(rumor_id):
+    # 'rumor_012' -> 12; None for ids from elsewhere
+    prefix, _, number = (rumor_id or '').rpartition('_')
+    return int(number) if prefix == 'rumor' and number.isdigit() else None
+
+def _file_hash(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest() if path.exists() else None
+
+def _get_meta(conn, key, default=None):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+def _set_meta(conn, key, value):
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+def _mark_changed(conn):
+    # Bumped in the same transaction as every write; export compares it with exported_version
+    _set_meta(conn, 'version', int(_get_meta(conn, 'version', 0)) + 1)
+
+def _row_values(rumor):
+    """rumors.json dict -> column values (unknown fields go to extra)"""
+    values = {column: rumor.get(field) for field, column in FIELD_COLUMNS.items()}
+    values['player_key'] = player_key(rumor.get('player'))
+    values['rumor_key'] = rumor_key(rumor.get('player'), rumor.get('from'), rumor.get('to'))
+    values['expires_on'] = (rumor.get('expires') or '')[:10] or None
+    extra = {k: v for k, v in rumor.items() if k not in FIELD_COLUMNS}
+    values['extra'] = json.dumps(extra, ensure_ascii=False) if extra else None
+    return values
+
+def _to_rumor(row):
+    """Row -> rumors.json dict in the original field order"""
+    rumor = {}
+    for field, column in FIELD_COLUMNS.items():
+        value = row[column]
+        if field == 'verified' and isinstance(value, int):
+            value = bool(value)
+        if value is not None or field not in ('expires', 'verified'):
+            rumor[field] = value
+    if row['extra']:
+        rumor.update(json.loads(row['extra']))
+    return rumor
+
+def _next_seq(conn):
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'rumors'").fetchone()
+    return (row[0] if row else 0) + 1
+
+def _reserve_seq(conn, seq):
+    # Raise the AUTOINCREMENT counter so ids below seq are never handed out
+    if conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'rumors'", (seq,)).rowcount == 0:
+        conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('rumors', ?)", (seq,))
+
+def _find_key(conn, key):
+    return conn.execute("SELECT * FROM rumors WHERE rumor_key = ?", (key,)).fetchone()
+
+def _insert(conn, rumor, seq=None):
+    values = _row_values(rumor)
+    if seq is not None:
+        values['seq'] = seq
+    columns = ', '.join(values)
+    conn.execute(f"INSERT INTO rumors ({columns}) VALUES ({', '.join('?' * len(values))})", list(values.values()))
+
+def _load_json(json_path):
+    if not json_path.exists():
+        return {'last_updated': datetime.now().isoformat()[:10], 'rumors': []}
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _sync_from_json(conn, json_path):
+    """Rebuild the table from rumors.json if the file is not what we last exported"""
+    file_hash = _file_hash(json_path)
+    if file_hash is not None and file_hash == _get_meta(conn, 'json_hash'):
+        return
+    if file_hash is None and conn.execute("SELECT 1 FROM rumors LIMIT 1").fetchone():
+        return  # rumors.json deleted: keep the store, the next export writes it again
+
+    data = _load_json(json_path)
+    with conn:
+        conn.execute("DELETE FROM rumors")
+        # rumor_NNN ids keep their number; foreign and duplicate ids go after them
+        taken, later = set(), []
+        for rumor in data['rumors']:
+            seq = _id_seq(rumor.get('id'))
+            duplicate = _find_key(conn, rumor_key(rumor.get('player'), rumor.get('from'), rumor.get('to')))
+            if duplicate:
+                print(f"⚠️  Rumor {rumor.get('id')} repeats {duplicate['id']} ({rumor.get('player')}), skipped")
+            elif seq is not None and seq not in taken:
+                _insert(conn, rumor, seq)
+                taken.add(seq)
+            else:
+                later.append(rumor)
+        max_seq = conn.execute("SELECT MAX(seq) FROM rumors").fetchone()[0] or 0
+        _reserve_seq(conn, max(max_seq, int(data.get('next_id', 1)) - 1))
+        for rumor in later:
+            if _find_key(conn, rumor_key(rumor.get('player'), rumor.get('from'), rumor.get('to'))):
+                print(f"⚠️  Rumor {rumor.get('id')} repeats another rumor ({rumor.get('player')}), skipped")
+            elif _id_seq(rumor.get('id')) is not None or get_rumor(conn, rumor.get('id')):
+                new_id = f"rumor_{_next_seq(conn):03d}"
+                print(f"⚠️  Duplicate rumor id {rumor.get('id')} ({rumor.get('player')}) renumbered to {new_id}")
+                rumor = {**rumor, 'id': new_id}
+                _insert(conn, rumor, _id_seq(new_id))
+            else:
+                _insert(conn, rumor)
+        _set_meta(conn, 'json_hash', file_hash or '')
+        _set_meta(conn, 'exported_version', _get_meta(conn, 'version', 0))
+
+def connect(db_path=DEFAULT_DB_PATH, json_path=RUMORS_FILE):
+    """Open the rumor store, creating it from rumors.json if needed"""
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        conn.executescript("DROP TABLE IF EXISTS rumors; DROP TABLE IF EXISTS meta;")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.executescript(SCHEMA)
+    _sync_from_json(conn, Path(json_path))
+    return conn
+
+# ============================================
+# QUERIES
+# ============================================
+
+def get_rumor(conn, rumor_id):
+    """One rumor by id, or None"""
+    row = conn.execute("SELECT * FROM rumors WHERE id = ?", (rumor_id,)).fetchone()
+    return _to_rumor(row) if row else None
+
+def rumors_for_player(conn, player):
+    """Rumors about one player (accents and case ignored)"""
+    return [_to_rumor(r) for r in conn.execute(
+        "SELECT * FROM rumors WHERE player_key = ? ORDER BY seq", (player_key(player),))]
+
+def rumors_by_status(conn, status):
+    return [_to_rumor(r) for r in conn.execute("SELECT * FROM rumors WHERE status = ? ORDER BY seq", (status,))]
+
+def all_rumors(conn):
+    return [_to_rumor(r) for r in conn.execute("SELECT * FROM rumors ORDER BY seq")]
+
+# ============================================
+# WRITES
+# ============================================
+
+def add_rumor(conn, player, from_team, to_team, fee, status='warm', source='Unknown', verified=False,
+              expires_days=30):
+    """Insert a new rumor with the next id. Returns it, or None if the same move is already known."""
+    if _find_key(conn, rumor_key(player, from_team, to_team)):
+        return None
+    today = datetime.now()
+    with conn:
+        seq = _next_seq(conn)
+        rumor = {
+            'id': f"rumor_{seq:03d}",
+            'player': player,
+            'from': from_team,
+            'to': to_team,
+            'fee': fee,
+            'status': status,  # 'hot' or 'warm'
+            'source': source,
+            'date': today.isoformat()[:10],
+            'verified': verified,
+            'expires': (today + timedelta(days=expires_days)).isoformat()[:10],
+        }
+        _insert(conn, rumor, seq)
+        _mark_changed(conn)
+    return rumor
+
+def _update_row(conn, row, updates):
+    """Write updates into a row. Returns False if nothing actually changed."""
+    current = _to_rumor(row)
+    rumor = {**current, **{k: v for k, v in updates.items() if k != 'id'}}
+    if rumor == current:
+        return False
+    duplicate = _find_key(conn, rumor_key(rumor.get('player'), rumor.get('from'), rumor.get('to')))
+    if duplicate and duplicate['seq'] != row['seq']:
+        raise ValueError(f"{row['id']} would repeat {duplicate['id']} ({rumor.get('player')})")
+    values = _row_values(rumor)
+    conn.execute(f"UPDATE rumors SET {', '.join(f'{c} = ?' for c in values)} WHERE seq = ?",
+                 [*values.values(), row['seq']])
+    return True
+
+def update_rumor(conn, rumor_id, **updates):
+    """Apply field updates to one rumor. Returns False if the id is unknown.
+
+    Raises ValueError if the update would make it repeat another rumor's move.
+    """
+    row = conn.execute("SELECT * FROM rumors WHERE id = ?", (rumor_id,)).fetchone()
+    if row is None:
+        return False
+    with conn:
+        if _update_row(conn, row, updates):
+            _mark_changed(conn)
+    return True
+
+def remove_expired(conn, today=None):
+    """Delete rumors whose expiry date is today or earlier. Returns how many."""
+    today = (today or datetime.now().date()).isoformat()
+    with conn:
+        removed = conn.execute("DELETE FROM rumors WHERE expires_on <= ?", (today,)).rowcount
+        if removed:
+            _mark_changed(conn)
+    return removed
+
+# ============================================
+# BATCH IMPORT
+# ============================================
+
+TRUE_STRINGS = {'true', '1', 'yes', 'y'}
+
+def _clean_record(record):
+    """Imported NDJSON/CSV record -> rumor fields (blank values dropped)"""
+    rumor = {}
+    for key, value in record.items():
+        if key is None:
+            continue  # Extra CSV cells without a header
+        key = {'from_team': 'from', 'to_team': 'to'}.get(key.strip(), key.strip())
+        if isinstance(value, str):
+            value = value.strip()
+        if value in ('', None) or key == 'id':
+            continue
+        if key == 'verified' and isinstance(value, str):
+            value = value.lower() in TRUE_STRINGS
+        rumor[key] = value
+    return rumor
+
+def read_records(stream, fmt=None):
+    """Rumor records from NDJSON or CSV text (fmt sniffed from the first character if None)
+
+    Invalid NDJSON lines come back as None, so import_rumors counts them as skipped.
+    """
+    text = stream.read()
+    if fmt is None:
+        fmt = 'ndjson' if text.lstrip().startswith('{') else 'csv'
+    if fmt == 'csv':
+        return list(csv.DictReader(io.StringIO(text)))
+
+    records = []
+    for line_no, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            print(f"⚠️  Line {line_no}: invalid JSON ({e}), skipped")
+            records.append(None)
+    return records
+
+def import_rumors(conn, records):
+    """Add new rumors and update known ones (matched by player, from, to) in one transaction
+
+    A known rumor keeps its stored player/from/to spelling; only its other
+    fields are updated. Returns counts: added, updated, unchanged, skipped
+    (unreadable records, or records without player/from/to or with a bad date).
+    """
+    counts = {'added': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0}
+    today = datetime.now().isoformat()[:10]
+    with conn:
+        for n, record in enumerate(records, 1):
+            if not isinstance(record, dict):
+                if record is not None:  # None: read_records already reported the line
+                    print(f"⚠️  Record {n}: not a JSON object, skipped")
+                counts['skipped'] += 1
+                continue
+            rumor = _clean_record(record)
+            expires_days = rumor.pop('expires_days', 30)
+            if not all(rumor.get(field) for field in IDENTITY_FIELDS):
+                print(f"⚠️  Record {n}: needs player, from and to, skipped")
+                counts['skipped'] += 1
+                continue
+
+            row = _find_key(conn, rumor_key(rumor['player'], rumor['from'], rumor['to']))
+            if row is not None:
+                updates = {k: v for k, v in rumor.items() if k not in IDENTITY_FIELDS}
+                counts['updated' if _update_row(conn, row, updates) else 'unchanged'] += 1
+                continue
+
+            date = rumor.get('date', today)
+            try:
+                expires = datetime.fromisoformat(str(date)[:10]) + timedelta(days=int(expires_days))
+            except ValueError:
+                print(f"⚠️  Record {n}: invalid date {date!r} or expires_days {expires_days!r}, skipped")
+                counts['skipped'] += 1
+                continue
+            seq = _next_seq(conn)
+            new = {'id': f"rumor_{seq:03d}", 'fee': 'Undisclosed', 'status': 'warm', 'source': 'Unknown',
+                   'date': date, 'verified': False, 'expires': expires.isoformat()[:10]}
+            _insert(conn, {**new, **rumor}, seq)
+            counts['added'] += 1
+
+        if counts['added'] or counts['updated']:
+            _mark_changed(conn)
+    return counts
+
+# ============================================
+# EXPORT
+# ============================================
+
+def export_json(conn, json_path=RUMORS_FILE, force=False):
+    """Write rumors.json if the store changed since the last export. Returns True if written."""
+    json_path = Path(json_path)
+    version = _get_meta(conn, 'version', '0')
+    if not force and version == _get_meta(conn, 'exported_version') and json_path.exists():
+        return False
+
+    data = {
+        'last_updated': datetime.now().isoformat()[:10],
+        'next_id': _next_seq(conn),
+        'rumors': all_rumors(conn),
+    }
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    with conn:
+        _set_meta(conn, 'json_hash', _file_hash(json_path))
+        _set_meta(conn, 'exported_version', version)
+    return True
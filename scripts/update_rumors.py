@@ -1,86 +1,74 @@
 #!/usr/bin/env python3
 """
 ScoutLens Rumors Update Script
-Manages rumors.json file: add, update, remove expired rumors
+Manages rumors.json file: add, update, bulk import, remove expired rumors
+Commands run against the indexed store in rumor_store.py, which rewrites
+rumors.json only when something changed.
 """
 
-import json
 import sys
-from datetime import datetime, timedelta
 from pathlib import Path
 
-RUMORS_FILE = Path(__file__).parent.parent / 'data' / 'rumors.json'
+import rumor_store
+from rumor_store import RUMORS_FILE
 
-def load_rumors():
-    """Load rumors from JSON file"""
-    if not RUMORS_FILE.exists():
-        return {'last_updated': datetime.now().isoformat()[:10], 'rumors': []}
-    
-    with open(RUMORS_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def save_rumors(data):
-    """Save rumors to JSON file"""
-    data['last_updated'] = datetime.now().isoformat()[:10]
-    with open(RUMORS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    print(f"✅ Saved {len(data['rumors'])} rumors to {RUMORS_FILE}")
+def save_rumors(conn):
+    """Export rumors.json if anything changed"""
+    if rumor_store.export_json(conn, RUMORS_FILE):
+        count = conn.execute("SELECT COUNT(*) FROM rumors").fetchone()[0]
+        print(f"✅ Saved {count} rumors to {RUMORS_FILE}")
+    else:
+        print(f"ℹ️  No changes, {RUMORS_FILE.name} left as is")
 
-def remove_expired(rumors_data):
+def remove_expired(conn):
     """Remove expired rumors"""
-    today = datetime.now().date()
-    original_count = len(rumors_data['rumors'])
-    
-    rumors_data['rumors'] = [
-        r for r in rumors_data['rumors']
-        if not r.get('expires') or datetime.fromisoformat(r['expires']).date() > today
-    ]
-    
-    removed = original_count - len(rumors_data['rumors'])
+    removed = rumor_store.remove_expired(conn)
     if removed > 0:
         print(f"🗑️  Removed {removed} expired rumor(s)")
-    
-    return rumors_data
 
-def add_rumor(rumors_data, player, from_team, to_team, fee, status='warm', source='Unknown', verified=False, expires_days=30):
+def add_rumor(conn, player, from_team, to_team, fee, status='warm', source='Unknown', verified=False, expires_days=30):
     """Add a new rumor"""
-    today = datetime.now()
-    expires = (today + timedelta(days=expires_days)).isoformat()[:10]
-    
-    new_id = f"rumor_{len(rumors_data['rumors']) + 1:03d}"
-    
-    rumor = {
-        'id': new_id,
-        'player': player,
-        'from': from_team,
-        'to': to_team,
-        'fee': fee,
-        'status': status,  # 'hot' or 'warm'
-        'source': source,
-        'date': today.isoformat()[:10],
-        'verified': verified,
-        'expires': expires
-    }
-    
-    rumors_data['rumors'].append(rumor)
+    rumor = rumor_store.add_rumor(conn, player, from_team, to_team, fee, status, source, verified, expires_days)
+    if rumor is None:
+        print(f"⚠️  {player} ({from_team} → {to_team}) is already a rumor, use update to change it")
+        return
     print(f"✅ Added rumor: {player} ({from_team} → {to_team})")
-    return rumors_data
 
-def update_rumor(rumors_data, rumor_id, **updates):
+def update_rumor(conn, rumor_id, **updates):
     """Update an existing rumor"""
-    for rumor in rumors_data['rumors']:
-        if rumor['id'] == rumor_id:
-            rumor.update(updates)
-            print(f"✅ Updated rumor: {rumor_id}")
-            return rumors_data
-    
-    print(f"❌ Rumor {rumor_id} not found")
-    return rumors_data
+    try:
+        found = rumor_store.update_rumor(conn, rumor_id, **updates)
+    except ValueError as e:
+        print(f"❌ Not updated: {e}")
+        return
+    if found:
+        print(f"✅ Updated rumor: {rumor_id}")
+    else:
+        print(f"❌ Rumor {rumor_id} not found")
+
+def import_rumors(conn, source='-', fmt=None):
+    """Add or update rumors in bulk from an NDJSON/CSV file, or stdin for '-'"""
+    if fmt is None and source != '-':
+        fmt = 'csv' if Path(source).suffix.lower() == '.csv' else 'ndjson'
+    if source == '-':
+        records = rumor_store.read_records(sys.stdin, fmt)
+    else:
+        try:
+            with open(source, 'r', encoding='utf-8-sig', newline='') as f:
+                records = rumor_store.read_records(f, fmt)
+        except OSError as e:
+            print(f"❌ Could not read {source}: {e}")
+            return
+
+    counts = rumor_store.import_rumors(conn, records)
+    print(f"📥 Imported {len(records)} record(s): {counts['added']} added, {counts['updated']} updated, "
+          f"{counts['unchanged']} unchanged, {counts['skipped']} skipped")
 
-def list_rumors(rumors_data):
+def list_rumors(conn):
     """List all rumors"""
-    print(f"\n📰 Current Rumors ({len(rumors_data['rumors'])}):\n")
-    for r in sorted(rumors_data['rumors'], key=lambda x: x['date'], reverse=True):
+    rumors = rumor_store.all_rumors(conn)
+    print(f"\n📰 Current Rumors ({len(rumors)}):\n")
+    for r in sorted(rumors, key=lambda x: x['date'], reverse=True):
         status_icon = '🔥' if r['status'] == 'hot' else '⚡'
         verified = '✓' if r.get('verified') else ''
         print(f"  {status_icon} {r['player']} {verified}")
@@ -96,19 +84,26 @@ def main():
         print("  python update_rumors.py clean                   # Remove expired rumors")
         print("  python update_rumors.py add <player> <from> <to> <fee> [status] [source]")
         print("  python update_rumors.py update <id> <field>=<value>")
+        print("  python update_rumors.py import [file|-]          # Bulk add/update from NDJSON or CSV")
         print("\nExample:")
         print("  python update_rumors.py add 'Erling Haaland' 'Man City' 'Real Madrid' '€200M' hot 'Fabrizio Romano'")
+        print("  feed_dump | python update_rumors.py import -   # One {\"player\", \"from\", \"to\", ...} object per line")
         return
     
     command = sys.argv[1]
-    rumors_data = load_rumors()
-    
+    conn = rumor_store.connect()
+    try:
+        run_command(conn, command)
+    finally:
+        conn.close()
+
+def run_command(conn, command):
     if command == 'list':
-        list_rumors(rumors_data)
+        list_rumors(conn)
     
     elif command == 'clean':
-        rumors_data = remove_expired(rumors_data)
-        save_rumors(rumors_data)
+        remove_expired(conn)
+        save_rumors(conn)
     
     elif command == 'add':
         if len(sys.argv) < 6:
@@ -122,8 +117,8 @@ def main():
         status = sys.argv[6] if len(sys.argv) > 6 else 'warm'
         source = sys.argv[7] if len(sys.argv) > 7 else 'Unknown'
         
-        rumors_data = add_rumor(rumors_data, player, from_team, to_team, fee, status, source)
-        save_rumors(rumors_data)
+        add_rumor(conn, player, from_team, to_team, fee, status, source)
+        save_rumors(conn)
     
     elif command == 'update':
         if len(sys.argv) < 4:
@@ -137,8 +132,12 @@ def main():
                 key, value = arg.split('=', 1)
                 updates[key] = value
         
-        rumors_data = update_rumor(rumors_data, rumor_id, **updates)
-        save_rumors(rumors_data)
+        update_rumor(conn, rumor_id, **updates)
+        save_rumors(conn)
+    
+    elif command == 'import':
+        import_rumors(conn, sys.argv[2] if len(sys.argv) > 2 else '-')
+        save_rumors(conn)
     
     else:
         print(f"❌ Unknown command: {command}")
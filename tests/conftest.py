@@ -0,0 +1,12 @@
+"""
+ScoutLens - Python test setup
+The data pipeline scripts run from data/ (and scripts/) and import their
+siblings by name, so the tests put both directories on sys.path.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for directory in ('data', 'scripts'):
+    sys.path.insert(0, str(ROOT / directory))
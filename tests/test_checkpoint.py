@@ -0,0 +1,73 @@
+"""
+ScoutLens - Checkpoint Resume Tests
+A journal survives an interrupted run (torn last line included) and
+--resume skips exactly the units it holds.
+Run with: python3 -m pytest tests
+"""
+
+import fetch_combined
+from checkpoint import Journal
+
+
+def test_resume_restores_recorded_units(tmp_path):
+    journal = Journal('fetch', journal_dir=tmp_path)
+    journal.record('GB1/281', {'haaland': {'market_value_eur_m': 180}})
+    journal.record('GB1/11')
+    journal.close()
+
+    resumed = Journal('fetch', resume=True, journal_dir=tmp_path)
+    assert resumed.done('GB1/281') and resumed.done('GB1/11')
+    assert resumed.get('GB1/281') == {'haaland': {'market_value_eur_m': 180}}
+    assert not resumed.done('GB1/31')
+
+
+def test_without_resume_a_run_starts_fresh(tmp_path):
+    Journal('fetch', journal_dir=tmp_path).record('GB1/281', {})
+    assert not Journal('fetch', journal_dir=tmp_path).done('GB1/281')
+
+
+def test_torn_last_line_is_dropped_and_cut_off(tmp_path):
+    journal = Journal('fetch', journal_dir=tmp_path)
+    journal.record('GB1/281', {'a': 1})
+    journal.close()
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"unit": "GB1/11", "data": {"b"')  # Killed mid-write
+
+    resumed = Journal('fetch', resume=True, journal_dir=tmp_path)
+    assert resumed.done('GB1/281') and not resumed.done('GB1/11')
+    resumed.record('GB1/11', {'b': 2})
+    resumed.close()
+
+    again = Journal('fetch', resume=True, journal_dir=tmp_path)
+    assert again.units == {'GB1/281': {'a': 1}, 'GB1/11': {'b': 2}}
+
+
+def test_finish_removes_the_journal(tmp_path):
+    journal = Journal('fetch', journal_dir=tmp_path)
+    journal.record('GB1', [281])
+    journal.finish()
+    assert not journal.path.exists()
+    journal.record('GB1/11')  # A late background retry: ignored, not an error
+    assert not Journal('fetch', resume=True, journal_dir=tmp_path).done('GB1')
+
+
+def test_resumed_league_fetch_only_requests_missing_squads(tmp_path, monkeypatch):
+    clubs = [{'id': 281, 'name': 'Man City'}, {'id': 11, 'name': 'Arsenal'}]
+    fetched = []
+
+    def fetch_club_values(club_id, club_name, league_info, limiter):
+        fetched.append(club_id)
+        return {f"{club_name.lower()} player": {'market_value_eur_m': 50, 'team': club_name}}
+
+    monkeypatch.setattr(fetch_combined, 'fetch_league_clubs', lambda tm_id, limiter: clubs)
+    monkeypatch.setattr(fetch_combined, 'fetch_club_values', fetch_club_values)
+
+    journal = Journal('tm', journal_dir=tmp_path)
+    journal.record('GB1/281', {'man city player': {'market_value_eur_m': 50, 'team': 'Man City'}})
+    journal.close()
+
+    resumed = Journal('tm', resume=True, journal_dir=tmp_path)
+    values, complete = fetch_combined.fetch_league_values('GB1', {'name': 'Premier League'}, resumed, limiter=None)
+    assert fetched == [11]
+    assert complete and set(values) == {'man city player', 'arsenal player'}
+    assert resumed.get('GB1') == [281, 11]
@@ -0,0 +1,81 @@
+"""
+ScoutLens - Job Queue Tests
+Lease expiry, retries and max_attempts of the SQLite queue backend.
+Run with: python3 -m pytest tests
+"""
+
+import time
+
+import pytest
+
+import job_queue
+from job_queue import SQLiteQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return SQLiteQueue(str(tmp_path / 'jobs.db'))
+
+
+def expire_leases(queue):
+    queue.conn.execute("UPDATE jobs SET lease_expires = ? WHERE status = 'leased'", (time.time() - 1,))
+
+
+def status(queue):
+    return tuple(queue.conn.execute("SELECT status, attempts, last_error FROM jobs").fetchone())
+
+
+def test_enqueue_dedupes_units_of_a_run(queue):
+    assert queue.enqueue('run', 'tm_clubs', {'tm_id': 'GB1'})
+    assert not queue.enqueue('run', 'tm_clubs', {'tm_id': 'GB1'})
+    assert queue.enqueue('other-run', 'tm_clubs', {'tm_id': 'GB1'})
+
+
+def test_leased_unit_is_not_claimed_twice(queue):
+    queue.enqueue('run', 'tm_clubs', {'tm_id': 'GB1'})
+    assert queue.claim('a')['lease_owner'] == 'a'
+    assert queue.claim('b') is None
+
+
+def test_expired_lease_is_reclaimed_and_old_holder_cannot_finish(queue):
+    queue.enqueue('run', 'tm_clubs', {'tm_id': 'GB1'})
+    first = queue.claim('a')
+    expire_leases(queue)
+
+    second = queue.claim('b')
+    assert second['id'] == first['id']
+    assert second['attempts'] == 2
+    assert not queue.complete(first, {'clubs': 1})
+    assert queue.fail(first, 'late') is None
+    assert queue.complete(second, {'clubs': 2})
+    assert queue.results('run', 'tm_clubs') == [({'tm_id': 'GB1'}, {'clubs': 2})]
+
+
+def test_fail_retries_after_backoff_then_fails_at_max_attempts(queue, monkeypatch):
+    monkeypatch.setattr(job_queue, 'RETRY_BASE_S', 0)
+    queue.enqueue('run', 'fd_league', {'code': 'PL'}, max_attempts=2)
+
+    assert queue.fail(queue.claim('a'), 'HTTP 500') == 'retry'
+    assert queue.fail(queue.claim('a'), 'HTTP 500') == 'failed'
+    assert queue.claim('a') is None
+    assert queue.counts('run') == {'failed': 1}
+
+
+def test_expired_lease_on_last_attempt_fails_the_unit(queue):
+    queue.enqueue('run', 'fd_league', {'code': 'PL'}, max_attempts=1)
+    queue.claim('a')
+    expire_leases(queue)
+
+    assert queue.claim('b') is None
+    assert status(queue) == ('failed', 1, 'lease expired on the last attempt')
+
+
+def test_claim_skips_exhausted_units_for_the_next_one(queue):
+    queue.enqueue('run', 'fd_league', {'code': 'PL'}, priority=1, max_attempts=1)
+    queue.enqueue('run', 'fd_league', {'code': 'PD'}, priority=2)
+    queue.claim('a')
+    expire_leases(queue)
+
+    job = queue.claim('b')
+    assert job['payload'] == {'code': 'PD'}
+    assert queue.counts('run') == {'failed': 1, 'leased': 1}
@@ -0,0 +1,90 @@
+"""
+ScoutLens - Streamed JSON Tests
+iter_json_items must give the same elements as json.loads wherever the
+chunk boundaries fall: inside numbers, strings, escapes and multi-byte
+UTF-8 characters.
+Run with: python3 -m pytest tests
+"""
+
+import gzip
+import io
+import json
+
+import pytest
+
+from json_stream import iter_json_items, read_body
+
+BODY = {
+    'count': 3,
+    'filters': {'season': '2024', 'limit': [10, 20]},
+    'scorers': [
+        {'player': {'name': 'Kylian Mbappé', 'id': 44}, 'goals': 27, 'xg': 1.25e1, 'penalties': None},
+        {'player': {'name': 'Ødegaard "Martin" [c]', 'id': -7}, 'goals': 0, 'assists': 12.5, 'active': True},
+        {'player': {'name': '김민재 \\ {ok}', 'id': 3}, 'goals': 1000000, 'tags': [], 'extra': {}},
+    ],
+    'season': {'startDate': '2024-08-16', 'currentMatchday': 38},
+}
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 5, 7, 16, 64, 4096])
+def test_items_and_meta_match_json_loads_at_every_chunk_size(size):
+    data = json.dumps(BODY, ensure_ascii=False).encode('utf-8')
+    meta = {}
+    assert list(iter_json_items(chunked(data, size), 'scorers', meta)) == BODY['scorers']
+    assert meta == {k: v for k, v in BODY.items() if k != 'scorers'}
+
+
+def test_every_split_point_of_a_number_heavy_array():
+    data = b'{"scorers": [1.25, -30, 4e2, 0.5, 12345678901234, true, false, null]}'
+    expected = json.loads(data)['scorers']
+    for cut in range(1, len(data)):
+        assert list(iter_json_items([data[:cut], data[cut:]], 'scorers')) == expected, cut
+
+
+def test_whitespace_and_empty_array():
+    data = b' {\n  "scorers" :\t[ ]\r\n , "count": 0 } '
+    meta = {}
+    assert list(iter_json_items(chunked(data, 1), 'scorers', meta)) == []
+    assert meta == {'count': 0}
+
+
+@pytest.mark.parametrize('body', [b'{}', b'{"message": "Too many requests", "errorCode": 429}'])
+def test_body_without_the_array_raises(body):
+    with pytest.raises(ValueError):
+        list(iter_json_items([body], 'scorers'))
+
+
+def test_cut_off_body_raises_after_the_complete_items():
+    data = json.dumps(BODY).encode('utf-8')
+    cut = data.index(b'"player"', data.index(b'"scorers"') + 30)
+    items = iter_json_items(chunked(data[:cut], 8), 'scorers')
+    assert next(items) == BODY['scorers'][0]
+    with pytest.raises(ValueError):
+        list(items)
+
+
+class FakeResponse(io.BytesIO):
+    def __init__(self, body, encoding=None):
+        super().__init__(body)
+        self.headers = {'Content-Encoding': encoding} if encoding else {}
+
+
+def test_gzip_response_streamed_in_small_reads():
+    data = json.dumps(BODY).encode('utf-8')
+    compressed = gzip.compress(data)
+    chunks = read_body(FakeResponse(compressed, 'gzip'), chunk_size=5)
+    assert list(iter_json_items(chunks, 'scorers')) == BODY['scorers']
+
+    counter = {}
+    assert b''.join(read_body(FakeResponse(compressed, 'gzip'), counter, chunk_size=5)) == data
+    assert counter['wire_bytes'] == len(compressed)
+
+
+def test_corrupt_gzip_body_raises_value_error():
+    response = FakeResponse(b'\x1f\x8b\x08\x00not gzip at all', 'gzip')
+    with pytest.raises(ValueError):
+        list(read_body(response))
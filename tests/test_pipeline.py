@@ -0,0 +1,78 @@
+"""
+ScoutLens - Pipeline Cache Tests
+A stage reruns exactly when one of its inputs changed: code or rule tables,
+params, secrets being set, or an upstream output.
+Run with: python3 -m pytest tests
+"""
+
+import pytest
+
+from pipeline import Pipeline, Stage
+
+MULTIPLIERS = {'PL': 1.5, 'PD': 1.3}
+calls = []
+
+
+def source(season):
+    calls.append('source')
+    return {'season': season, 'goals': [3, 5]}
+
+
+def total(data, api_key=None):
+    calls.append('total')
+    return {'total': sum(data['goals']) * MULTIPLIERS['PL']}
+
+
+def make_pipeline(cache_dir, season=2024, api_key=None):
+    return Pipeline([
+        Stage('source', source, params={'season': season}),
+        Stage('total', total, deps=['source'], code=[MULTIPLIERS], secrets={'api_key': api_key}),
+    ], cache_dir=cache_dir)
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+def statuses(report):
+    return {name: status for name, (status, _) in report.items()}
+
+
+def test_rerun_with_same_inputs_is_served_from_cache(tmp_path):
+    assert statuses(make_pipeline(tmp_path).run()) == {'source': 'ran', 'total': 'ran'}
+    pipeline = make_pipeline(tmp_path)
+    assert statuses(pipeline.run()) == {'source': 'cached', 'total': 'cached'}
+    assert pipeline.outputs['total'] == {'total': 12.0}
+    assert calls == ['source', 'total']
+
+
+def test_changed_param_reruns_the_stage_and_its_dependents(tmp_path):
+    make_pipeline(tmp_path).run()
+    assert statuses(make_pipeline(tmp_path, season=2023).run()) == {'source': 'ran', 'total': 'ran'}
+
+
+def test_changed_rule_table_reruns_only_that_stage(tmp_path, monkeypatch):
+    make_pipeline(tmp_path).run()
+    monkeypatch.setitem(MULTIPLIERS, 'PL', 2.0)
+    pipeline = make_pipeline(tmp_path)
+    assert statuses(pipeline.run()) == {'source': 'cached', 'total': 'ran'}
+    assert pipeline.outputs['total'] == {'total': 16.0}
+
+
+def test_secret_presence_is_hashed_but_not_its_value(tmp_path):
+    make_pipeline(tmp_path, api_key='first').run()
+    assert statuses(make_pipeline(tmp_path, api_key='second').run())['total'] == 'cached'
+    assert statuses(make_pipeline(tmp_path).run())['total'] == 'ran'
+
+
+def test_failed_stage_is_not_cached_and_skips_dependents(tmp_path):
+    def broken(season):
+        raise RuntimeError('no data')
+
+    pipeline = Pipeline([
+        Stage('source', broken, params={'season': 2024}),
+        Stage('total', total, deps=['source']),
+    ], cache_dir=tmp_path)
+    assert statuses(pipeline.run()) == {'source': 'failed', 'total': 'skipped'}
+    assert not list(tmp_path.iterdir())
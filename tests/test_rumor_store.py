@@ -0,0 +1,80 @@
+"""
+ScoutLens - Rumor Import Tests
+Batch imports dedupe on (player, from, to) regardless of accents, case and
+spacing, update known rumors without renaming them, and skip bad records.
+Run with: python3 -m pytest tests
+"""
+
+import io
+
+import pytest
+
+import rumor_store
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = rumor_store.connect(tmp_path / 'rumors.db', tmp_path / 'rumors.json')
+    yield conn
+    conn.close()
+
+
+def test_same_move_spelled_differently_updates_the_known_rumor(conn):
+    known = rumor_store.add_rumor(conn, 'Kylian Mbappé', 'PSG', 'Real Madrid', '€0', status='warm')
+    counts = rumor_store.import_rumors(conn, [
+        {'player': '  kylian   MBAPPE ', 'from': 'psg', 'to': 'real madrid', 'status': 'hot', 'verified': 'yes'},
+    ])
+
+    assert counts == {'added': 0, 'updated': 1, 'unchanged': 0, 'skipped': 0}
+    [rumor] = rumor_store.all_rumors(conn)
+    assert rumor['id'] == known['id']
+    assert (rumor['player'], rumor['from'], rumor['to']) == ('Kylian Mbappé', 'PSG', 'Real Madrid')
+    assert rumor['status'] == 'hot' and rumor['verified'] is True
+
+
+def test_reimporting_the_same_records_changes_nothing(conn):
+    records = [
+        {'player': 'Jamal Musiala', 'from': 'Bayern', 'to': 'Man City', 'fee': '€130M', 'date': '2026-10-01'},
+        {'player': 'Florian Wirtz', 'from': 'Leverkusen', 'to': 'Bayern', 'date': '2026-10-02'},
+    ]
+    assert rumor_store.import_rumors(conn, records)['added'] == 2
+    before = rumor_store.all_rumors(conn)
+
+    counts = rumor_store.import_rumors(conn, records)
+    assert counts == {'added': 0, 'updated': 0, 'unchanged': 2, 'skipped': 0}
+    assert rumor_store.all_rumors(conn) == before
+
+
+def test_duplicates_within_one_batch_become_one_rumor(conn):
+    counts = rumor_store.import_rumors(conn, [
+        {'player': 'Pedri', 'from': 'Barcelona', 'to': 'Arsenal', 'fee': '€90M'},
+        {'player': 'PEDRI', 'from': 'barcelona', 'to': 'arsenal', 'fee': '€95M'},
+    ])
+    assert counts['added'] == 1 and counts['updated'] == 1
+    [rumor] = rumor_store.all_rumors(conn)
+    assert (rumor['player'], rumor['fee']) == ('Pedri', '€95M')
+
+
+def test_bad_records_are_skipped_and_counted(conn):
+    text = '\n'.join([
+        '{"player": "Gavi", "from": "Barcelona", "to": "Chelsea"}',
+        '{"player": "Gavi", "from": "Barcelona"}',
+        '{not json',
+        '["player", "from", "to"]',
+        '{"player": "Nico Williams", "from": "Athletic", "to": "Barcelona", "date": "soon"}',
+    ])
+    counts = rumor_store.import_rumors(conn, rumor_store.read_records(io.StringIO(text)))
+    assert counts == {'added': 1, 'updated': 0, 'unchanged': 0, 'skipped': 4}
+
+
+def test_csv_import_dedupes_against_existing_rumors(conn):
+    rumor_store.add_rumor(conn, 'Vinícius Júnior', 'Real Madrid', 'Al-Hilal', '€200M')
+    text = ('player,from_team,to_team,fee,verified\n'
+            'Vinicius Junior,Real Madrid,Al-Hilal,€250M,true\n'
+            'Rodrygo,Real Madrid,Liverpool,,false\n')
+    counts = rumor_store.import_rumors(conn, rumor_store.read_records(io.StringIO(text)))
+
+    assert counts == {'added': 1, 'updated': 1, 'unchanged': 0, 'skipped': 0}
+    by_player = {r['player']: r for r in rumor_store.all_rumors(conn)}
+    assert by_player['Vinícius Júnior']['fee'] == '€250M'
+    assert by_player['Rodrygo']['fee'] == 'Undisclosed'